@@ -7,6 +7,8 @@ import dash
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from dash import dcc, html
+from helpers.static_files import register_static_routes
+from helpers.api import register_api_routes
 
 # Create the Dash app
 app = dash.Dash(
@@ -25,5 +27,11 @@ app.layout = html.Div(
 
 server = app.server
 
+# Serve word clouds and media locally with cache-friendly headers
+register_static_routes(server)
+
+# JSON recommendation API for downstream services
+register_api_routes(server)
+
 if __name__ == "__main__":
     app.run_server(debug=True)
@@ -0,0 +1,249 @@
+import json
+import numpy as np
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from helpers.recommender import (
+    SEED_REDUCTIONS,
+    filter_mask,
+    normalize_weights,
+    podcast_ids,
+    podcast_index,
+    podcast_metadata,
+    recommend,
+    recommend_many,
+)
+
+api = Blueprint("api", __name__, url_prefix="/api")
+
+DEFAULT_K = 5
+MAX_K = 100
+# Queries per matrix block when exporting neighbours for every podcast
+EXPORT_BLOCK_SIZE = 64
+
+podcast_names = podcast_metadata["podcast_name"].tolist()
+
+
+class ApiError(Exception):
+    """Error reported to the client as a JSON body with an HTTP status."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+@api.errorhandler(ApiError)
+def handle_api_error(error):
+    return jsonify({"error": error.message}), error.status
+
+
+def _parse_k(value):
+    try:
+        k = int(value)
+    except (TypeError, ValueError):
+        raise ApiError(f"k must be an integer, got {value!r}")
+    if not 1 <= k <= MAX_K:
+        raise ApiError(f"k must be between 1 and {MAX_K}")
+    return k
+
+
+def _parse_ids(value):
+    """Accept a comma-separated string or a list of podcast IDs."""
+    if isinstance(value, str):
+        value = value.split(",")
+    ids = [podcast_id.strip() for podcast_id in value or [] if podcast_id and podcast_id.strip()]
+    if not ids:
+        raise ApiError("at least one podcast id is required")
+    unknown = [podcast_id for podcast_id in ids if podcast_id not in podcast_index]
+    if unknown:
+        raise ApiError(f"unknown podcast ids: {', '.join(unknown)}", status=404)
+    return ids
+
+
+def _parse_reduce(value):
+    if value is not None and value not in SEED_REDUCTIONS:
+        raise ApiError(f"combine must be one of {sorted(SEED_REDUCTIONS)}")
+    return value
+
+
+def _parse_weights(value):
+    """Accept 'w_ntfs,w_jts,w_wtds' or a list of three numbers; None means equal weights."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.split(",")
+    try:
+        return normalize_weights([float(weight) for weight in value])
+    except (TypeError, ValueError) as error:
+        raise ApiError(f"invalid weights: {error}")
+
+
+def _parse_bool(value, name):
+    if value is None or isinstance(value, bool):
+        return value
+    lowered = str(value).strip().lower()
+    if lowered in ("true", "1", "yes"):
+        return True
+    if lowered in ("false", "0", "no"):
+        return False
+    raise ApiError(f"{name} must be true or false, got {value!r}")
+
+
+def _parse_optional_int(value, name):
+    if value is None or value == "":
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ApiError(f"{name} must be an integer, got {value!r}")
+
+
+def _parse_filters(genres, explicit, min_episodes, max_episodes):
+    """Build the cached boolean filter mask (None when nothing is filtered)."""
+    try:
+        return filter_mask(
+            genres=genres or None,
+            explicit=_parse_bool(explicit, "explicit"),
+            min_episodes=_parse_optional_int(min_episodes, "min_episodes"),
+            max_episodes=_parse_optional_int(max_episodes, "max_episodes"),
+        )
+    except ValueError as error:
+        raise ApiError(str(error))
+
+
+def _request_filters():
+    args = request.args
+    return _parse_filters(
+        args.getlist("genre"),
+        args.get("explicit"),
+        args.get("min_episodes"),
+        args.get("max_episodes"),
+    )
+
+
+def _recommendation(index, distance, similarity):
+    return {
+        "podcast_id": podcast_ids[index],
+        "podcast_name": podcast_names[index],
+        "distance": round(float(distance), 6),
+        "ntfs": round(float(similarity[0]), 6),
+        "jts": round(float(similarity[1]), 6),
+        "wtds": round(float(similarity[2]), 6),
+    }
+
+
+def answer_query(ids, k=DEFAULT_K, combine=None, weights=None, mask=None):
+    """
+    Answer one query: each id separately, or all ids as one multi-seed query.
+
+    Args:
+        ids (list): Podcast IDs.
+        k (int): Number of recommendations per result.
+        combine (str, optional): "mean", "min" or "max" to treat ids as one seed set.
+        weights (np.ndarray, optional): Per-metric distance weights (NTFS, JTS, WTDS).
+        mask (np.ndarray, optional): Boolean filter mask over the podcast index.
+
+    Returns:
+        list: One {"seeds": [...], "recommendations": [...]} dict per result.
+    """
+    if combine:
+        indices, similarities, distances = recommend(ids, k=k, reduce=combine, weights=weights, mask=mask)
+        return [{
+            "seeds": list(dict.fromkeys(ids)),
+            "recommendations": [
+                _recommendation(index, distances[index], similarities[index]) for index in indices
+            ],
+        }]
+
+    indices, distances, similarities = recommend_many(ids, k=k, weights=weights, mask=mask)
+    return [
+        {
+            "seeds": [podcast_id],
+            "recommendations": [
+                _recommendation(index, distance, similarities[row, index])
+                for index, distance in zip(indices[row], distances[row])
+                if np.isfinite(distance)  # fewer than k podcasts passed the filters
+            ],
+        }
+        for row, podcast_id in enumerate(ids)
+    ]
+
+
+@api.get("/recommend")
+def recommend_get():
+    """
+    GET /api/recommend?ids=<id>[,<id>...]&k=5[&combine=mean|min|max][&weights=1,1,1]
+        [&genre=<genre>...][&explicit=true|false][&min_episodes=N][&max_episodes=N]
+
+    Without 'combine' every id is answered as its own query (a batch).
+    """
+    ids = _parse_ids(request.args.get("ids"))
+    k = _parse_k(request.args.get("k", DEFAULT_K))
+    combine = _parse_reduce(request.args.get("combine"))
+    weights = _parse_weights(request.args.get("weights"))
+    mask = _request_filters()
+    return jsonify({"k": k, "results": answer_query(ids, k=k, combine=combine, weights=weights, mask=mask)})
+
+
+@api.post("/recommend")
+def recommend_post():
+    """
+    POST /api/recommend with {"queries": [{"ids": [...], "k": 5, "combine": "mean", "weights": [1, 1, 1]}, ...]}
+
+    Queries may also carry "genres", "explicit", "min_episodes" and "max_episodes".
+    Each query is answered like the GET endpoint; results keep the query order.
+    """
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict) or not isinstance(body.get("queries"), list):
+        raise ApiError("body must be a JSON object with a 'queries' list")
+
+    responses = []
+    for query in body["queries"]:
+        if not isinstance(query, dict):
+            raise ApiError("each query must be a JSON object")
+        ids = _parse_ids(query.get("ids"))
+        k = _parse_k(query.get("k", DEFAULT_K))
+        combine = _parse_reduce(query.get("combine"))
+        weights = _parse_weights(query.get("weights"))
+        genres = query.get("genres")
+        mask = _parse_filters(
+            [genres] if isinstance(genres, str) else genres,
+            query.get("explicit"),
+            query.get("min_episodes"),
+            query.get("max_episodes"),
+        )
+        responses.append({"k": k, "results": answer_query(ids, k=k, combine=combine, weights=weights, mask=mask)})
+    return jsonify({"queries": responses})
+
+
+@api.get("/neighbours.ndjson")
+def neighbours_export():
+    """
+    GET /api/neighbours.ndjson?k=10[&weights=1,1,1][&genre=...&explicit=...&min_episodes=...&max_episodes=...]
+
+    Streams one JSON line per podcast with its k nearest neighbours, computed
+    EXPORT_BLOCK_SIZE podcasts at a time.
+    """
+    k = _parse_k(request.args.get("k", DEFAULT_K))
+    weights = _parse_weights(request.args.get("weights"))
+    mask = _request_filters()
+
+    def generate():
+        for start in range(0, len(podcast_ids), EXPORT_BLOCK_SIZE):
+            block = podcast_ids[start:start + EXPORT_BLOCK_SIZE]
+            for result in answer_query(block, k=k, weights=weights, mask=mask):
+                yield json.dumps({
+                    "podcast_id": result["seeds"][0],
+                    "neighbours": result["recommendations"],
+                }) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+
+def register_api_routes(server):
+    """
+    Register the JSON recommendation API on the Flask server behind Dash.
+
+    Args:
+        server (flask.Flask): The app.server object.
+    """
+    server.register_blueprint(api)
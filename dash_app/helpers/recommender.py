@@ -0,0 +1,287 @@
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+import requests
+from io import BytesIO
+
+
+# Helper function to load .npy files from GitHub
+def load_npy_from_github(url):
+    response = requests.get(url)
+    response.raise_for_status()  # Raise an error for failed requests
+    return np.load(BytesIO(response.content))
+
+# URLs for data
+ntfs_url = "https://github.com/Stochastic1017/Spotify-Podcast-Clustering/raw/refs/heads/main/dash_app/helpers/ntfs.npy"
+jts_url = "https://github.com/Stochastic1017/Spotify-Podcast-Clustering/raw/refs/heads/main/dash_app/helpers/jts.npy"
+wtds_url = "https://github.com/Stochastic1017/Spotify-Podcast-Clustering/raw/refs/heads/main/dash_app/helpers/wtds.npy"
+metadata_url = "https://raw.githubusercontent.com/Stochastic1017/Spotify-Podcast-Clustering/refs/heads/main/data/cleaned_podcast_details_english_colors.csv"
+
+# Load data
+ntfs = load_npy_from_github(ntfs_url)
+jts = load_npy_from_github(jts_url)
+wtds = load_npy_from_github(wtds_url)
+podcast_metadata = pd.read_csv(metadata_url)
+podcast_ids = podcast_metadata["podcast_id"].tolist()
+
+# All three metrics as one contiguous (n, n, 3) array: similarity_stack[i, j] = [NTFS, JTS, WTDS]
+similarity_stack = np.ascontiguousarray(np.stack((ntfs, jts, wtds), axis=-1), dtype=np.float64)
+del ntfs, jts, wtds
+
+# Squared per-metric distance to the ideal point (1, 1, 1), so ranking under any
+# weight vector is a single matrix-vector product
+squared_dissimilarity = np.square(1 - similarity_stack)
+
+# Metric order of the last axis and the default (unweighted) distance
+METRICS = ("NTFS", "JTS", "WTDS")
+DEFAULT_WEIGHTS = np.ones(len(METRICS))
+
+# Row/column index of each podcast in the similarity matrices
+podcast_index = {podcast_id: idx for idx, podcast_id in enumerate(podcast_ids)}
+
+# Precomputed boolean masks over the podcast index, used to filter recommendations
+podcast_genres = sorted(podcast_metadata["podcast_genre"].dropna().unique())
+genre_masks = {
+    genre: (podcast_metadata["podcast_genre"] == genre).to_numpy()
+    for genre in podcast_genres
+}
+explicit_masks = {
+    True: podcast_metadata["podcast_explicit"].astype(bool).to_numpy(),
+}
+explicit_masks[False] = ~explicit_masks[True]
+
+# Episode counts in sorted order, so a count range maps to a slice via searchsorted
+episode_counts = podcast_metadata["podcast_total_episodes"].to_numpy()
+episode_order = np.argsort(episode_counts, kind="stable")
+sorted_episode_counts = episode_counts[episode_order]
+
+# Vectorized reductions used to combine the rows of several seed podcasts
+SEED_REDUCTIONS = {
+    "mean": np.mean,
+    "min": np.min,
+    "max": np.max,
+}
+
+
+def seed_indices(seed_ids):
+    """
+    Map one podcast ID or a list of podcast IDs to matrix row indices.
+
+    Args:
+        seed_ids (str or list): Podcast ID(s) to look up.
+
+    Returns:
+        np.ndarray: Unique row indices, in first-seen order.
+
+    Raises:
+        KeyError: If an ID is not part of the similarity matrices.
+    """
+    if isinstance(seed_ids, str):
+        seed_ids = [seed_ids]
+    indices = [podcast_index[podcast_id] for podcast_id in dict.fromkeys(seed_ids)]
+    if not indices:
+        raise KeyError("At least one seed podcast ID is required.")
+    return np.asarray(indices, dtype=np.intp)
+
+
+@lru_cache(maxsize=256)
+def _cached_filter_mask(genres, explicit, min_episodes, max_episodes):
+    mask = np.ones(len(podcast_ids), dtype=bool)
+    if genres:
+        unknown = [genre for genre in genres if genre not in genre_masks]
+        if unknown:
+            raise ValueError(f"Unknown genres: {', '.join(unknown)}")
+        mask &= np.logical_or.reduce([genre_masks[genre] for genre in genres])
+    if explicit is not None:
+        mask &= explicit_masks[explicit]
+    if min_episodes is not None or max_episodes is not None:
+        low = 0 if min_episodes is None else np.searchsorted(sorted_episode_counts, min_episodes, side="left")
+        high = len(podcast_ids) if max_episodes is None else np.searchsorted(sorted_episode_counts, max_episodes, side="right")
+        in_range = np.zeros(len(podcast_ids), dtype=bool)
+        in_range[episode_order[low:high]] = True
+        mask &= in_range
+    mask.setflags(write=False)
+    return mask
+
+
+def filter_mask(genres=None, explicit=None, min_episodes=None, max_episodes=None):
+    """
+    Combine the precomputed masks into one boolean mask over the podcast index.
+
+    Masks are cached per filter combination, so repeating a filtered query costs
+    the same as an unfiltered one.
+
+    Args:
+        genres (str or list, optional): Keep podcasts in any of these genres.
+        explicit (bool, optional): Keep only explicit (True) or clean (False) podcasts.
+        min_episodes (int, optional): Minimum total episodes (inclusive).
+        max_episodes (int, optional): Maximum total episodes (inclusive).
+
+    Returns:
+        np.ndarray or None: Read-only (n,) mask, or None when no filter is set.
+
+    Raises:
+        ValueError: If a genre is unknown.
+    """
+    if isinstance(genres, str):
+        genres = [genres]
+    genres = tuple(sorted(set(genres))) if genres else ()
+    if not genres and explicit is None and min_episodes is None and max_episodes is None:
+        return None
+    return _cached_filter_mask(
+        genres,
+        None if explicit is None else bool(explicit),
+        None if min_episodes is None else int(min_episodes),
+        None if max_episodes is None else int(max_episodes),
+    )
+
+
+def normalize_weights(weights=None):
+    """
+    Validate a metric weight vector.
+
+    Args:
+        weights (sequence, optional): One non-negative weight per metric in
+            METRICS order; None means equal weights.
+
+    Returns:
+        np.ndarray: Weights as a float array of shape (3,).
+
+    Raises:
+        ValueError: If the weights have the wrong length, are negative or all zero.
+    """
+    if weights is None:
+        return DEFAULT_WEIGHTS
+    weights = np.asarray(weights, dtype=np.float64)
+    if weights.shape != (len(METRICS),):
+        raise ValueError(f"Expected {len(METRICS)} weights ({', '.join(METRICS)}), got {weights.size}")
+    if not np.all(np.isfinite(weights)) or np.any(weights < 0) or not weights.any():
+        raise ValueError("Weights must be finite, non-negative and not all zero")
+    return weights
+
+
+def seed_similarities(seed_ids, reduce="mean"):
+    """
+    Aggregate the NTFS/JTS/WTDS rows of the seed podcasts.
+
+    Args:
+        seed_ids (str or list): Seed podcast ID(s).
+        reduce (str): One of SEED_REDUCTIONS ("mean", "min" or "max").
+
+    Returns:
+        np.ndarray: (n, 3) array of aggregated [NTFS, JTS, WTDS] per podcast.
+    """
+    if reduce not in SEED_REDUCTIONS:
+        raise ValueError(f"reduce must be one of {sorted(SEED_REDUCTIONS)}, got {reduce!r}")
+    indices = seed_indices(seed_ids)
+    if len(indices) == 1:
+        return similarity_stack[indices[0]]
+    return SEED_REDUCTIONS[reduce](similarity_stack[indices], axis=0)
+
+
+def distance_to_ideal(similarities, weights=None):
+    """Weighted Euclidean distance of each [NTFS, JTS, WTDS] triple to (1, 1, 1)."""
+    return np.sqrt(np.square(1 - similarities) @ normalize_weights(weights))
+
+
+def top_k(distances, k, exclude=(), mask=None):
+    """
+    Indices of the k smallest distances, closest first.
+
+    Uses argpartition so only the k selected entries are sorted.
+
+    Args:
+        distances (np.ndarray): Distance of every podcast.
+        k (int): Number of podcasts to return.
+        exclude (array-like): Indices that may never be returned (e.g. the seeds).
+        mask (np.ndarray, optional): Boolean (n,) mask of podcasts that may be returned.
+
+    Returns:
+        np.ndarray: Up to k indices ordered by increasing distance.
+    """
+    if mask is None:
+        distances = np.array(distances, dtype=float)
+    else:
+        distances = np.where(mask, distances, np.inf)
+    distances[np.asarray(exclude, dtype=np.intp)] = np.inf
+    k = min(k, int(np.isfinite(distances).sum()))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    candidates = np.argpartition(distances, k - 1)[:k]
+    return candidates[np.argsort(distances[candidates], kind="stable")]
+
+
+def top_k_rows(distances, k):
+    """
+    Row-wise top-k of a (m, n) distance matrix, closest first.
+
+    Returns:
+        tuple: (indices, distances) as (m, k) arrays.
+    """
+    k = min(k, distances.shape[1])
+    if k <= 0:
+        empty = np.empty((distances.shape[0], 0))
+        return empty.astype(np.intp), empty
+    candidates = np.argpartition(distances, k - 1, axis=1)[:, :k]
+    candidate_distances = np.take_along_axis(distances, candidates, axis=1)
+    order = np.argsort(candidate_distances, axis=1, kind="stable")
+    return (
+        np.take_along_axis(candidates, order, axis=1),
+        np.take_along_axis(candidate_distances, order, axis=1),
+    )
+
+
+def recommend(seed_ids, k=5, reduce="mean", weights=None, mask=None):
+    """
+    Recommend the k podcasts closest to one or more seed podcasts.
+
+    Args:
+        seed_ids (str or list): Seed podcast ID(s); seeds are never recommended.
+        k (int): Number of recommendations.
+        reduce (str): How the seed rows are combined ("mean", "min" or "max").
+        weights (sequence, optional): Per-metric distance weights (NTFS, JTS, WTDS).
+        mask (np.ndarray, optional): Boolean (n,) mask from filter_mask.
+
+    Returns:
+        tuple: (indices, similarities, distances) where indices are the top-k
+        row indices, similarities the aggregated (n, 3) array for all podcasts
+        and distances the (n,) distance vector.
+    """
+    weights = normalize_weights(weights)
+    seeds = seed_indices(seed_ids)
+    similarities = seed_similarities(seed_ids, reduce=reduce)
+    if len(seeds) == 1:
+        # Single seed: reuse the precomputed squared distances
+        distances = np.sqrt(squared_dissimilarity[seeds[0]] @ weights)
+    else:
+        distances = distance_to_ideal(similarities, weights)
+    indices = top_k(distances, k, exclude=seeds, mask=mask)
+    return indices, similarities, distances
+
+
+def recommend_many(query_ids, k=5, weights=None, mask=None):
+    """
+    Answer a batch of single-seed queries with one matrix operation.
+
+    Args:
+        query_ids (list): Podcast IDs; each one is an independent query.
+        k (int): Number of recommendations per query.
+        weights (sequence, optional): Per-metric distance weights (NTFS, JTS, WTDS).
+        mask (np.ndarray, optional): Boolean (n,) mask from filter_mask.
+
+    Returns:
+        tuple: (indices, distances, similarities) where indices and distances
+        are (m, k) arrays (filtered-out slots have an infinite distance) and similarities is the (m, n, 3) array of
+        [NTFS, JTS, WTDS] rows of the queried podcasts.
+    """
+    weights = normalize_weights(weights)
+    rows = np.asarray([podcast_index[podcast_id] for podcast_id in query_ids], dtype=np.intp)
+    # Squared distances are monotone in the distance, so rank first and take
+    # the square root of the k selected entries only
+    squared_distances = squared_dissimilarity[rows] @ weights
+    if mask is not None:
+        squared_distances[:, ~mask] = np.inf
+    # A podcast never recommends itself
+    squared_distances[np.arange(len(rows)), rows] = np.inf
+    indices, top_squared = top_k_rows(squared_distances, min(k, len(podcast_ids) - 1))
+    return indices, np.sqrt(top_squared), similarity_stack[rows]
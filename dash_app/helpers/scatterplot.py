@@ -5,68 +5,48 @@ import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import requests
-from io import BytesIO
-
-
-# Helper function to load .npy files from GitHub
-def load_npy_from_github(url):
-    response = requests.get(url)
-    response.raise_for_status()  # Raise an error for failed requests
-    return np.load(BytesIO(response.content))
-
-# URLs for data
-ntfs_url = "https://github.com/Stochastic1017/Spotify-Podcast-Clustering/raw/refs/heads/main/dash_app/helpers/ntfs.npy"
-jts_url = "https://github.com/Stochastic1017/Spotify-Podcast-Clustering/raw/refs/heads/main/dash_app/helpers/jts.npy"
-wtds_url = "https://github.com/Stochastic1017/Spotify-Podcast-Clustering/raw/refs/heads/main/dash_app/helpers/wtds.npy"
-metadata_url = "https://raw.githubusercontent.com/Stochastic1017/Spotify-Podcast-Clustering/refs/heads/main/data/cleaned_podcast_details_english_colors.csv"
-
-# Load data
-ntfs = load_npy_from_github(ntfs_url)
-jts = load_npy_from_github(jts_url)
-wtds = load_npy_from_github(wtds_url)
-podcast_metadata = pd.read_csv(metadata_url)
-podcast_ids = podcast_metadata["podcast_id"].tolist()
-
-def generate_plot(selected_podcast_id):
-    selected_podcast_index = podcast_ids.index(selected_podcast_id)
-    selected_podcast_name = podcast_metadata[podcast_metadata['podcast_id'] == selected_podcast_id]['podcast_name'].iloc[0]
-
-    # Extract similarity metrics for the selected podcast
-    ntfs_row = ntfs[selected_podcast_index]
-    jts_row = jts[selected_podcast_index]
-    wtds_row = wtds[selected_podcast_index]
+from helpers.recommender import podcast_metadata, podcast_ids, seed_indices, recommend
+
+
+def generate_plot(selected_podcast_ids, reduce="mean", weights=None, mask=None):
+    # Accept a single podcast ID or a list of seed podcast IDs
+    if isinstance(selected_podcast_ids, str):
+        selected_podcast_ids = [selected_podcast_ids]
+    seeds = seed_indices(selected_podcast_ids)
+    seed_metadata = podcast_metadata.iloc[seeds]
+    selected_podcast_name = ", ".join(seed_metadata['podcast_name'])
+
+    # Aggregate similarity metrics of the seeds and rank all podcasts in one pass
+    closest_indices, similarities, distances = recommend(selected_podcast_ids, k=5, reduce=reduce, weights=weights, mask=mask)
 
     # Create a DataFrame for plotting
     plot_data = pd.DataFrame({
         'podcast_id': podcast_ids,
-        'NTFS': ntfs_row,
-        'JTS': jts_row,
-        'WTDS': wtds_row
+        'NTFS': similarities[:, 0],
+        'JTS': similarities[:, 1],
+        'WTDS': similarities[:, 2],
+        'distance': distances,
     })
 
-    # Compute Euclidean distances from the selected podcast
-    plot_data['distance'] = np.sqrt(
-        (plot_data['NTFS'] - 1)**2 +
-        (plot_data['JTS'] - 1)**2 +
-        (plot_data['WTDS'] - 1)**2
-    )
+    # Closest podcasts, already ordered by distance
+    closest_podcasts = plot_data.iloc[closest_indices].merge(podcast_metadata, on='podcast_id', how='left')
 
-    # Remove the selected podcast (distance = 0)
-    plot_data = plot_data[plot_data['podcast_id'] != selected_podcast_id]
+    # Remove the selected podcasts (distance = 0 for a single seed) and filtered-out podcasts
+    keep = np.ones(len(plot_data), dtype=bool) if mask is None else mask.copy()
+    keep[seeds] = False
+    plot_data = plot_data[keep]
 
     # Merge with metadata for hover data
     plot_data = plot_data.merge(podcast_metadata, on='podcast_id', how='left')
 
-    # Sort by distance to find closest podcasts
-    closest_podcasts = plot_data.nsmallest(5, 'distance')
-
     # Collect points for the convex hull
     hull_points = np.array([
         [1, 1, 1],  # The selected podcast
         *closest_podcasts[['NTFS', 'JTS', 'WTDS']].values
     ])
-    hull = ConvexHull(hull_points)
+    # A 3D hull needs at least four points; filters may leave fewer recommendations
+    if len(hull_points) >= 4:
+        hull = ConvexHull(hull_points)
 
     # Create the 3D scatter plot
     scatter_fig = go.Figure()
@@ -104,7 +84,7 @@ def generate_plot(selected_podcast_id):
             mode='markers+text',
             marker=dict(
                 size=8,
-                color=podcast_metadata[podcast_metadata['podcast_id'] == selected_podcast_id]['podcast_dominant_color'],
+                color=seed_metadata['podcast_dominant_color'].iloc[0],
                 symbol='square',
             ),
             text=[f"{selected_podcast_name}"],
@@ -0,0 +1,219 @@
+import os
+import re
+import hashlib
+from io import BytesIO
+from flask import abort, request, send_file
+from werkzeug.security import safe_join
+from helpers.wordcloud_cache import wordcloud_cache
+
+# Folders served by the Dash server itself instead of raw.githubusercontent.com
+HELPERS_DIR = os.path.dirname(os.path.abspath(__file__))
+ASSETS_FOLDER = os.path.normpath(os.path.join(HELPERS_DIR, "..", "assets"))
+WORDCLOUD_FOLDER = os.path.normpath(os.path.join(HELPERS_DIR, "..", "..", "wordclouds"))
+
+# URL prefixes for the two served folders
+WORDCLOUD_URL_PREFIX = "/wordclouds"
+MEDIA_URL_PREFIX = "/media"
+
+# Content-hashed URLs never change meaning, so browsers may keep them for a year.
+# Plain URLs are revalidated against the ETag every hour.
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+REVALIDATE_MAX_AGE = 60 * 60
+
+DIGEST_LENGTH = 12
+
+# Only word cloud images are served from wordclouds/, never other files kept there
+WORDCLOUD_EXTENSIONS = (".png", ".webp")
+HASHED_NAME_PATTERN = re.compile(r"^(?P<stem>.+)\.(?P<digest>[0-9a-f]{%d})(?P<ext>\.[A-Za-z0-9]+)$" % DIGEST_LENGTH)
+
+# path -> (mtime_ns, size, digest); avoids re-hashing unchanged files
+_digest_cache = {}
+
+
+def file_digest(path):
+    """
+    Return a short content hash of a file, cached by modification time and size.
+
+    Args:
+        path (str): Path of the file to hash.
+
+    Returns:
+        str: Hex digest truncated to DIGEST_LENGTH characters.
+    """
+    stat = os.stat(path)
+    cached = _digest_cache.get(path)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+
+    hasher = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 16), b""):
+            hasher.update(block)
+    digest = hasher.hexdigest()[:DIGEST_LENGTH]
+
+    _digest_cache[path] = (stat.st_mtime_ns, stat.st_size, digest)
+    return digest
+
+
+def hashed_url(prefix, folder, filename):
+    """
+    Build a content-hashed URL such as /wordclouds/<id>.<digest>.png.
+
+    Falls back to the plain URL when the file does not exist locally.
+    """
+    path = os.path.join(folder, filename)
+    if not os.path.isfile(path):
+        return f"{prefix}/{filename}"
+    stem, ext = os.path.splitext(filename)
+    return f"{prefix}/{stem}.{file_digest(path)}{ext}"
+
+
+def wordcloud_url(podcast_id):
+    """Content-hashed URL of a podcast's word cloud image."""
+    return hashed_url(WORDCLOUD_URL_PREFIX, WORDCLOUD_FOLDER, f"{podcast_id}.png")
+
+
+def asset_url(filename):
+    """Content-hashed URL of a file in dash_app/assets (logo, intro video, ...)."""
+    return hashed_url(MEDIA_URL_PREFIX, ASSETS_FOLDER, filename)
+
+
+def _split_hashed_name(filename):
+    """Split '<stem>.<digest><ext>' into ('<stem><ext>', digest); plain names get digest None."""
+    match = HASHED_NAME_PATTERN.match(filename)
+    if not match:
+        return filename, None
+    return match.group("stem") + match.group("ext"), match.group("digest")
+
+
+def _accepts_webp():
+    return "image/webp" in request.headers.get("Accept", "")
+
+
+def serve_cached_file(folder, filename):
+    """
+    Serve a file with strong ETag/Cache-Control headers.
+
+    A precompressed '<stem>.webp' next to a PNG is served instead when the
+    browser advertises WebP support and the variant is not older than the
+    PNG (a stale variant is ignored until build_webp_variants rewrites it).
+    The ETag is the digest of the file actually sent.
+    """
+    plain_name, requested_digest = _split_hashed_name(filename)
+    path = safe_join(folder, plain_name)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+
+    digest = file_digest(path)
+    served_path, etag = path, digest
+
+    stem, ext = os.path.splitext(path)
+    webp_path = stem + ".webp"
+    has_webp = (
+        ext.lower() == ".png"
+        and os.path.isfile(webp_path)
+        and os.path.getmtime(webp_path) >= os.path.getmtime(path)
+    )
+    if has_webp and _accepts_webp():
+        served_path, etag = webp_path, file_digest(webp_path)
+
+    # Only a URL carrying the current digest may be cached forever
+    immutable = requested_digest == digest
+    response = send_file(
+        served_path,
+        conditional=True,
+        etag=etag,
+        max_age=IMMUTABLE_MAX_AGE if immutable else REVALIDATE_MAX_AGE,
+    )
+    response.cache_control.public = True
+    if immutable:
+        response.cache_control.immutable = True
+    if has_webp:
+        response.vary.add("Accept")
+    return response
+
+
+def serve_wordcloud(filename):
+    """
+    Serve a pre-rendered word cloud, or render it on first request.
+
+    Podcasts without a PNG in wordclouds/ are rendered from their token counts
+    by the in-memory LRU cache; unknown podcasts and files other than images
+    get a 404.
+    """
+    plain_name, _ = _split_hashed_name(filename)
+    podcast_id, ext = os.path.splitext(plain_name)
+    if ext.lower() not in WORDCLOUD_EXTENSIONS:
+        abort(404)
+    if os.path.isfile(os.path.join(WORDCLOUD_FOLDER, plain_name)):
+        return serve_cached_file(WORDCLOUD_FOLDER, filename)
+
+    if ext.lower() != ".png" or os.path.dirname(plain_name):
+        abort(404)
+    cached = wordcloud_cache.get(podcast_id)
+    if cached is None:
+        abort(404)
+
+    image, digest = cached
+    response = send_file(
+        BytesIO(image),
+        mimetype="image/png",
+        conditional=True,
+        etag=digest[:DIGEST_LENGTH],
+        max_age=REVALIDATE_MAX_AGE,
+    )
+    response.cache_control.public = True
+    return response
+
+
+def register_static_routes(server):
+    """
+    Register the word cloud and media routes on the Flask server behind Dash.
+
+    Args:
+        server (flask.Flask): The app.server object.
+    """
+    server.add_url_rule(
+        f"{WORDCLOUD_URL_PREFIX}/<path:filename>",
+        endpoint="wordclouds",
+        view_func=serve_wordcloud,
+    )
+    server.add_url_rule(
+        f"{MEDIA_URL_PREFIX}/<path:filename>",
+        endpoint="media",
+        view_func=lambda filename: serve_cached_file(ASSETS_FOLDER, filename),
+    )
+
+
+def build_webp_variants(folder=WORDCLOUD_FOLDER, quality=80):
+    """
+    Write a precompressed '<stem>.webp' next to every PNG in a folder.
+
+    Variants that are already newer than their PNG are skipped.
+
+    Args:
+        folder (str): Folder containing the PNG images.
+        quality (int): WebP encoder quality (0-100).
+
+    Returns:
+        int: Number of WebP files written.
+    """
+    from PIL import Image  # only needed when building variants
+
+    written = 0
+    for filename in sorted(os.listdir(folder)):
+        stem, ext = os.path.splitext(filename)
+        if ext.lower() != ".png":
+            continue
+        png_path = os.path.join(folder, filename)
+        webp_path = os.path.join(folder, stem + ".webp")
+        if os.path.isfile(webp_path) and os.path.getmtime(webp_path) >= os.path.getmtime(png_path):
+            continue
+        with Image.open(png_path) as image:
+            image.save(webp_path, format="WEBP", quality=quality, method=6)
+        written += 1
+    return written
+
+
+if __name__ == "__main__":
+    print(f"Wrote {build_webp_variants()} WebP variants to {WORDCLOUD_FOLDER}")
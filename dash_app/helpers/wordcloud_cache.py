@@ -0,0 +1,170 @@
+import os
+import sys
+import hashlib
+import threading
+from io import BytesIO
+from collections import OrderedDict
+
+# Reuse the batch renderer from models/word_cloud.py
+HELPERS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.normpath(os.path.join(HELPERS_DIR, "..", "..", "models")))
+
+from word_cloud import IMAGE_FORMATS, MAX_WORDS, build_word_cloud, read_word_counts, word_cloud_image
+from token_store import TokenStore
+
+# Per-podcast token counts written by tokenization/consolidate_words.py
+TOKEN_FOLDER = os.environ.get(
+    "PODCAST_TOKENS_FOLDER",
+    os.path.normpath(os.path.join(HELPERS_DIR, "..", "..", "podcast_tokens")),
+)
+
+# Dictionary-encoded store built by models/token_store.py; preferred when present
+TOKEN_STORE_FOLDER = os.environ.get(
+    "PODCAST_TOKEN_STORE",
+    os.path.normpath(os.path.join(HELPERS_DIR, "..", "..", "podcast_token_store")),
+)
+
+
+class WordCloudCache:
+    """
+    Bounded LRU cache of word cloud images rendered on first request.
+
+    Encoded images (~150 KB each) are kept for the `max_images` most recently
+    used podcasts. The word layouts, which are the expensive part of a render,
+    are kept for `max_layouts` podcasts, so an evicted image is rebuilt by
+    redrawing and re-encoding its layout instead of laying it out again.
+    Concurrent requests for the same podcast trigger a single render.
+    When the token store symlink is repointed at a new build, the store is
+    reopened and both caches are cleared.
+    """
+
+    def __init__(self, token_folder=TOKEN_FOLDER, max_images=64, max_layouts=1024, image_format="png",
+                 store_folder=TOKEN_STORE_FOLDER):
+        self.token_folder = token_folder
+        self.store_folder = store_folder
+        self._store = None              # memory-mapped TokenStore of the current build
+        self._store_version = None      # resolved store folder self._store was opened from
+        self._generation = 0            # bumped whenever the caches are cleared
+        self.max_images = max_images
+        self.max_layouts = max_layouts
+        self.image_format = image_format
+        self._images = OrderedDict()   # podcast_id -> (image bytes, digest)
+        self._layouts = OrderedDict()  # podcast_id -> laid-out WordCloud
+        self._inflight = {}            # podcast_id -> threading.Event set when its render finishes
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "renders": 0, "redraws": 0, "evictions": 0}
+
+    def get(self, podcast_id):
+        """
+        Return the encoded word cloud of a podcast, rendering it if needed.
+
+        Args:
+            podcast_id (str): The podcast ID.
+
+        Returns:
+            tuple or None: (image bytes, content digest), or None if the podcast
+            has no token counts.
+        """
+        self._check_store()
+        while True:
+            with self._lock:
+                cached = self._images.get(podcast_id)
+                if cached is not None:
+                    self._images.move_to_end(podcast_id)
+                    self.stats["hits"] += 1
+                    return cached
+                event = self._inflight.get(podcast_id)
+                owner = event is None
+                if owner:
+                    event = self._inflight[podcast_id] = threading.Event()
+
+            if not owner:
+                # Another request is rendering this podcast; wait and re-check the cache
+                event.wait()
+                continue
+
+            try:
+                generation = self._generation
+                cached = self._render(podcast_id, generation)
+                if cached is not None:
+                    with self._lock:
+                        # Not cached if the store was rebuilt during the render
+                        if generation == self._generation:
+                            self._remember(self._images, podcast_id, cached, self.max_images, count_eviction=True)
+                return cached
+            finally:
+                with self._lock:
+                    del self._inflight[podcast_id]
+                event.set()
+
+    def _check_store(self):
+        """
+        Reopen the token store and clear both caches when the store symlink
+        resolves to another build than the one opened.
+        """
+        version = os.path.realpath(self.store_folder) if os.path.isdir(self.store_folder) else None
+        if version == self._store_version:
+            return
+        with self._lock:
+            if version != self._store_version:
+                self._store = TokenStore(version) if version is not None else None
+                self._store_version = version
+                self._images.clear()
+                self._layouts.clear()
+                self._generation += 1
+
+    def _token_path(self, podcast_id):
+        return os.path.join(self.token_folder, f"{os.path.basename(podcast_id)}.csv")
+
+    def _word_counts(self, podcast_id):
+        """
+        Return (found, {word: count}) for a podcast.
+
+        Reads the podcast's rows from the memory-mapped token store when one
+        exists, and its .csv token file otherwise.
+        """
+        store = self._store
+        if store is not None and podcast_id in store:
+            words, counts = store.podcast_counts(podcast_id, top_n=MAX_WORDS)
+            return True, dict(zip(words.tolist(), counts.tolist())) or None
+
+        token_path = self._token_path(podcast_id)
+        if not os.path.isfile(token_path):
+            return False, None
+        return True, read_word_counts(token_path)
+
+    def _remember(self, store, key, value, max_items, count_eviction=False):
+        """Insert into an LRU OrderedDict and evict the oldest entries (lock held)."""
+        store[key] = value
+        store.move_to_end(key)
+        while len(store) > max_items:
+            store.popitem(last=False)
+            if count_eviction:
+                self.stats["evictions"] += 1
+
+    def _render(self, podcast_id, generation):
+        with self._lock:
+            wordcloud = self._layouts.get(podcast_id)
+            if wordcloud is not None:
+                self._layouts.move_to_end(podcast_id)
+
+        if wordcloud is None:
+            found, word_counts = self._word_counts(podcast_id)
+            if not found:
+                return None
+            wordcloud = build_word_cloud(word_counts)
+            with self._lock:
+                if generation == self._generation:
+                    self._remember(self._layouts, podcast_id, wordcloud, self.max_layouts)
+                self.stats["renders"] += 1
+        else:
+            with self._lock:
+                self.stats["redraws"] += 1
+
+        buffer = BytesIO()
+        word_cloud_image(wordcloud).save(buffer, **IMAGE_FORMATS[self.image_format])
+        image = buffer.getvalue()
+        return image, hashlib.sha256(image).hexdigest()
+
+
+wordcloud_cache = WordCloudCache()
@@ -6,6 +6,7 @@ import sys
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from dash import html, dcc, Input, Output, callback
+from helpers.static_files import asset_url
 import dash
 
 dash.register_page(__name__, path="/")
@@ -31,7 +32,7 @@ layout = html.Div(
         # Video Element
         html.Video(
             id="intro-video",
-            src="https://github.com/Stochastic1017/Spotify-Podcast-Clustering/raw/refs/heads/main/dash_app/assets/SpotifyLogo.mp4",
+            src=asset_url("SpotifyLogo.mp4"),
             autoPlay=True,
             controls=False,
             loop=False,
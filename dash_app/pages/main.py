@@ -1,5 +1,7 @@
 from dash import html, dcc, callback, Output, Input
 from helpers.scatterplot import generate_plot
+from helpers.recommender import filter_mask
+from helpers.static_files import asset_url, wordcloud_url
 import dash
 import pandas as pd
 
@@ -23,6 +25,26 @@ podcast_options = sorted(
     key=lambda x: x["label"]
 )
 
+# Genre options for the recommendation filter
+genre_options = [
+    {"label": genre, "value": genre}
+    for genre in sorted(podcast_data["podcast_genre"].dropna().unique())
+]
+
+# Explicit-content filter values mapped to filter_mask arguments
+explicit_filter_values = {"any": None, "clean": False, "explicit": True}
+
+# Shared style of the episode-count inputs
+episode_input_style = {
+    'width': '130px',
+    'height': '36px',
+    'backgroundColor': '#282828',
+    'color': 'white',
+    'border': '1px solid #3E3E3E',
+    'borderRadius': '10px',
+    'padding': '0 10px',
+}
+
 # CSS for consistent styling
 app_css = {
     'background': 'linear-gradient(135deg, #121212 0%, #1E1E1E 100%)',
@@ -54,29 +76,147 @@ layout = html.Div(
             children=[
                 # Spotify Logo
                 html.Img(
-                    src="https://raw.githubusercontent.com/Stochastic1017/Spotify-Podcast-Clustering/refs/heads/main/dash_app/assets/SpotifyLogo.png",
+                    src=asset_url("SpotifyLogo.png"),
                     alt="Spotify Logo",
                     style={
                         'width': '250px',
                         'height': 'auto',
                     },
                 ),
-                # Dropdown for podcast selection
+                # Podcast selection controls
+                html.Div(
+                    id="selection-controls",
+                    style={
+                        'display': 'flex',
+                        'alignItems': 'center',
+                        'gap': '20px',
+                    },
+                    children=[
+                        # Toggle between a single seed and a set of favourite podcasts
+                        dcc.Checklist(
+                            id="multi-select-toggle",
+                            options=[{"label": " Multi-select", "value": "multi"}],
+                            value=[],
+                            style={'color': '#B3B3B3'},
+                        ),
+                        # How the rows of several seed podcasts are combined
+                        dcc.RadioItems(
+                            id="seed-reduction",
+                            options=[
+                                {"label": " Mean", "value": "mean"},
+                                {"label": " Min", "value": "min"},
+                                {"label": " Max", "value": "max"},
+                            ],
+                            value="mean",
+                            inline=True,
+                            inputStyle={'marginLeft': '10px'},
+                            style={'display': 'none'},
+                        ),
+                        # Per-metric distance weights; re-ranks live while dragging
+                        html.Div(
+                            id="metric-weights",
+                            style={
+                                'display': 'flex',
+                                'flexDirection': 'column',
+                                'width': '220px',
+                                'color': '#B3B3B3',
+                                'fontSize': '0.8rem',
+                            },
+                            children=[
+                                html.Div(
+                                    style={'display': 'flex', 'alignItems': 'center'},
+                                    children=[
+                                        html.Span(metric, style={'width': '45px'}),
+                                        html.Div(
+                                            dcc.Slider(
+                                                id=f"weight-{metric.lower()}",
+                                                min=0,
+                                                max=2,
+                                                step=0.1,
+                                                value=1,
+                                                marks=None,
+                                                updatemode="drag",
+                                                tooltip={"placement": "right"},
+                                            ),
+                                            style={'flex': '1'},
+                                        ),
+                                    ],
+                                )
+                                for metric in ("NTFS", "JTS", "WTDS")
+                            ],
+                        ),
+                        # Dropdown for podcast selection
+                        dcc.Dropdown(
+                            id="podcast-dropdown",
+                            options=podcast_options,
+                            placeholder="Search for a podcast...",
+                            style={
+                                'width': '300px',
+                                'minHeight': '50px',
+                                'backgroundColor': '#282828',
+                                'color': '#1DB954',
+                                'borderRadius': '20px',
+                                'textAlign': 'left',
+                            },
+                            optionHeight=50,
+                            className='custom-dropdown',
+                        ),
+                    ],
+                ),
+            ],
+        ),
+        # Recommendation filters
+        html.Div(
+            id="filter-section",
+            style={
+                'display': 'flex',
+                'alignItems': 'center',
+                'gap': '20px',
+                'marginBottom': '20px',
+                'padding': '0 20px',
+                'color': '#B3B3B3',
+            },
+            children=[
                 dcc.Dropdown(
-                    id="podcast-dropdown",
-                    options=podcast_options,
-                    placeholder="Search for a podcast...",
+                    id="genre-filter",
+                    options=genre_options,
+                    multi=True,
+                    placeholder="Recommend only from genres...",
                     style={
-                        'width': '300px',
-                        'height': '50px',
+                        'width': '400px',
                         'backgroundColor': '#282828',
-                        'color': '#1DB954',
                         'borderRadius': '20px',
                         'textAlign': 'left',
                     },
-                    optionHeight=50,
                     className='custom-dropdown',
                 ),
+                dcc.RadioItems(
+                    id="explicit-filter",
+                    options=[
+                        {"label": " Any", "value": "any"},
+                        {"label": " Clean only", "value": "clean"},
+                        {"label": " Explicit only", "value": "explicit"},
+                    ],
+                    value="any",
+                    inline=True,
+                    inputStyle={'marginLeft': '10px'},
+                ),
+                dcc.Input(
+                    id="min-episodes-filter",
+                    type="number",
+                    min=0,
+                    placeholder="Min episodes",
+                    debounce=True,
+                    style=episode_input_style,
+                ),
+                dcc.Input(
+                    id="max-episodes-filter",
+                    type="number",
+                    min=0,
+                    placeholder="Max episodes",
+                    debounce=True,
+                    style=episode_input_style,
+                ),
             ],
         ),
         # Main Content
@@ -174,6 +314,18 @@ layout = html.Div(
     ],
 )
 
+# Callback to switch the dropdown between single and multi-seed selection
+@callback(
+    Output("podcast-dropdown", "multi"),
+    Output("podcast-dropdown", "value"),
+    Output("seed-reduction", "style"),
+    Input("multi-select-toggle", "value"),
+)
+def toggle_multi_select(toggle_value):
+    multi = "multi" in (toggle_value or [])
+    reduction_style = {'color': '#B3B3B3', 'display': 'block' if multi else 'none'}
+    return multi, [] if multi else None, reduction_style
+
 # Callback to update podcast details
 @callback(
     Output("podcast-details-container", "children"),
@@ -194,6 +346,10 @@ def update_podcast_details(selected_podcast_id):
         'transition': 'all 0.5s ease-in-out',
     }
 
+    # In multi-select mode show the most recently added seed
+    if isinstance(selected_podcast_id, list):
+        selected_podcast_id = selected_podcast_id[-1] if selected_podcast_id else None
+
     if not selected_podcast_id:
         return html.Div(
         ), default_style
@@ -201,7 +357,7 @@ def update_podcast_details(selected_podcast_id):
     # Fetch details for selected podcast
     podcast = podcast_data[podcast_data["podcast_id"] == selected_podcast_id].iloc[0]
     dominant_color = podcast["podcast_dominant_color"]
-    word_cloud_src = f"https://raw.githubusercontent.com/Stochastic1017/Spotify-Podcast-Clustering/refs/heads/main/wordclouds/{podcast['podcast_id']}.png"
+    word_cloud_src = wordcloud_url(podcast['podcast_id'])
 
     details = html.Div(
         children=[
@@ -280,12 +436,34 @@ def update_podcast_details(selected_podcast_id):
 @callback(
     Output("scatter-plot-content", "children"),
     Input("podcast-dropdown", "value"),
+    Input("seed-reduction", "value"),
+    Input("weight-ntfs", "value"),
+    Input("weight-jts", "value"),
+    Input("weight-wtds", "value"),
+    Input("genre-filter", "value"),
+    Input("explicit-filter", "value"),
+    Input("min-episodes-filter", "value"),
+    Input("max-episodes-filter", "value"),
 )
-def update_scatter_plot(selected_podcast_id):
-    if not selected_podcast_id:
+def update_scatter_plot(selected_podcast_ids, reduce, ntfs_weight, jts_weight, wtds_weight,
+                        genres, explicit, min_episodes, max_episodes):
+    if not selected_podcast_ids:
         return html.Div(
             "If plots or tables don't fit properly, press Ctrl - or Ctrl + to adjust the zoom level until the layout looks satisfactory.",
             style={'color': '#B3B3B3'}
         )
 
-    return dcc.Graph(figure=generate_plot(selected_podcast_id))
+    # All-zero weights would make every podcast equally close; fall back to equal weights
+    weights = [ntfs_weight or 0, jts_weight or 0, wtds_weight or 0]
+    if not any(weights):
+        weights = None
+
+    # Precomputed masks, combined with the distances before the top-k selection
+    mask = filter_mask(
+        genres=genres,
+        explicit=explicit_filter_values.get(explicit),
+        min_episodes=min_episodes,
+        max_episodes=max_episodes,
+    )
+
+    return dcc.Graph(figure=generate_plot(selected_podcast_ids, reduce=reduce, weights=weights, mask=mask))
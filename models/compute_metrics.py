@@ -5,36 +5,33 @@ import os
 import time
 from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.preprocessing import normalize
+from token_counts import iter_token_counts
+from token_store import STORE_FOLDER, TokenStore
 
 start = time.time()
 
 # Helper Functions
-def get_global_vocabulary(podcast_ids, folder="podcast_tokens"):
-    global_vocab = set()
+def load_token_counts(podcast_ids, folder="podcast_tokens"):
+    """Parse every podcast's token file once: [(podcast_id, words, counts), ...]."""
+    token_counts = []
     n = len(podcast_ids)
-    for idx, podcast_id in enumerate(podcast_ids):
+    for idx, (podcast_id, words, counts) in enumerate(iter_token_counts(podcast_ids, folder=folder)):
         print(f"processing: {podcast_id}. At {idx} out of {n}")
-        file_path = os.path.join(folder, f"{podcast_id}.csv")
-        if os.path.exists(file_path):
-            word_counts = pd.read_csv(file_path)
-            global_vocab.update(word_counts["Word"])
+        token_counts.append((podcast_id, words, counts))
+    return token_counts
+
+def get_global_vocabulary(token_counts):
+    global_vocab = set()
+    for _, words, _ in token_counts:
+        global_vocab.update(words)
     return list(global_vocab)
 
-def get_token_frequency_vectors(podcast_ids, global_vocab, folder="podcast_tokens"):
-    vocab_index = {word: idx for idx, word in enumerate(global_vocab)}
-    vectors = []
-    n = len(podcast_ids)
-    for idx, podcast_id in enumerate(podcast_ids):
-        print(f"processing: {podcast_id}. At {idx} out of {n}")
-        file_path = os.path.join(folder, f"{podcast_id}.csv")
-        if os.path.exists(file_path):
-            word_counts = pd.read_csv(file_path)
-            freq_vector = np.zeros(len(global_vocab))
-            for _, row in word_counts.iterrows():
-                if row["Word"] in vocab_index:
-                    freq_vector[vocab_index[row["Word"]]] = row["Count"]
-            vectors.append(freq_vector)
-    return np.array(vectors)
+def get_token_frequency_vectors(token_counts, global_vocab):
+    vocab_index = pd.Index(global_vocab)
+    vectors = np.zeros((len(token_counts), len(global_vocab)))
+    for row, (_, words, counts) in enumerate(token_counts):
+        vectors[row, vocab_index.get_indexer(words)] = counts
+    return vectors
 
 def compute_similarity_matrices(freq_vectors):
     print("Computing NTFS ...")
@@ -59,8 +56,13 @@ podcast_metadata = pd.read_csv("https://raw.githubusercontent.com/Stochastic1017
 podcast_ids = podcast_metadata["podcast_id"].tolist()
 
 print("Generating global vocabulary and frequency vectors...")
-global_vocab = get_global_vocabulary(podcast_ids)
-freq_vectors = get_token_frequency_vectors(podcast_ids, global_vocab)
+if os.path.isdir(STORE_FOLDER):
+    # One read of the dictionary-encoded store built by models/token_store.py
+    freq_vectors, _, global_vocab = TokenStore(STORE_FOLDER).frequency_matrix(podcast_ids)
+else:
+    token_counts = load_token_counts(podcast_ids)
+    global_vocab = get_global_vocabulary(token_counts)
+    freq_vectors = get_token_frequency_vectors(token_counts, global_vocab)
 
 print("Computing similarity matrices...")
 ntfs_matrix, jts_matrix, wtds_matrix = compute_similarity_matrices(freq_vectors)
@@ -0,0 +1,115 @@
+import os
+import glob
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+def read_token_counts(file_path, top_n=None):
+    """
+    Read a 'Word,Count' token file with pandas' C parser.
+
+    Quoted fields are handled, and words such as "nan" or "null" are kept as
+    strings instead of being turned into missing values.
+
+    Args:
+        file_path (str): Path to a per-podcast token count .csv file.
+        top_n (int, optional): Keep only the top_n most frequent words. Ties keep
+            file order, the same as a stable sort by descending count.
+
+    Returns:
+        tuple: (words, counts) as an object array of str and an int64 array.
+    """
+    # object dtype keeps plain Python strings (no string-extension conversion);
+    # na_filter=False skips missing-value detection entirely
+    df = pd.read_csv(
+        file_path,
+        dtype={"Word": object, "Count": np.int64},
+        na_filter=False,
+    )
+    words = df["Word"].to_numpy()
+    counts = df["Count"].to_numpy()
+
+    if top_n is not None and len(counts) > top_n:
+        order = np.argsort(-counts, kind="stable")[:top_n]
+        words, counts = words[order], counts[order]
+    return words, counts
+
+def iter_token_counts(podcast_ids=None, folder="podcast_tokens", top_n=None):
+    """
+    Yield the token counts of every podcast, parsing each file once.
+
+    Args:
+        podcast_ids (list, optional): Podcasts to read, in this order. Defaults to
+            every .csv file in the folder. IDs without a file are skipped.
+        folder (str): Folder holding <podcast_id>.csv token files.
+        top_n (int, optional): Keep only the top_n most frequent words per podcast.
+
+    Yields:
+        tuple: (podcast_id, words, counts) as returned by read_token_counts.
+    """
+    if podcast_ids is None:
+        podcast_ids = sorted(
+            os.path.splitext(os.path.basename(path))[0]
+            for path in glob.glob(os.path.join(folder, "*.csv"))
+        )
+    for podcast_id in podcast_ids:
+        file_path = os.path.join(folder, f"{podcast_id}.csv")
+        if os.path.exists(file_path):
+            words, counts = read_token_counts(file_path, top_n=top_n)
+            yield podcast_id, words, counts
+
+def _read_lines_split(file_path):
+    """Previous word_cloud.py reader: readlines() + split(",")."""
+    word_counts = {}
+    with open(file_path, "r") as file:
+        for line in file.readlines()[1:]:
+            word, count = line.strip().split(",")
+            word_counts[word] = int(count)
+    return word_counts
+
+def _read_iterrows(file_path):
+    """Previous compute_metrics.py reader: read_csv + iterrows()."""
+    word_counts = {}
+    for _, row in pd.read_csv(file_path).iterrows():
+        word_counts[row["Word"]] = row["Count"]
+    return word_counts
+
+def benchmark_readers(folder="podcast_tokens"):
+    """
+    Time the previous readers against read_token_counts over a whole token folder.
+
+    Args:
+        folder (str): Folder holding <podcast_id>.csv token files.
+
+    Returns:
+        dict: Seconds taken per reader.
+    """
+    paths = sorted(glob.glob(os.path.join(folder, "*.csv")))
+    if not paths:
+        raise FileNotFoundError(f"No .csv files found in folder {folder}.")
+
+    readers = {
+        "readlines + split (word_cloud.py)": _read_lines_split,
+        "read_csv + iterrows (compute_metrics.py)": _read_iterrows,
+        "read_token_counts": read_token_counts,
+    }
+    timings = {}
+    for name, reader in readers.items():
+        start = time.perf_counter()
+        failures = 0
+        for path in paths:
+            try:
+                reader(path)
+            except Exception:
+                failures += 1
+        timings[name] = time.perf_counter() - start
+        note = f" ({failures} files failed to parse)" if failures else ""
+        print(f"{name:>42}: {timings[name]:.2f} s for {len(paths)} files{note}")
+    return timings
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark token count readers over a token folder.")
+    parser.add_argument("--folder", default="podcast_tokens", help="Folder with <podcast_id>.csv token counts.")
+    args = parser.parse_args()
+    benchmark_readers(args.folder)
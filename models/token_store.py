@@ -0,0 +1,232 @@
+import os
+import glob
+import time
+import shutil
+import argparse
+import numpy as np
+import pandas as pd
+from token_counts import iter_token_counts
+
+# Dictionary-encoded token counts of every podcast, written by build_token_store
+STORE_FOLDER = "podcast_token_store"
+
+# One .npy file per column:
+#   vocab        <U..  distinct words, indexed by token_idx
+#   podcast_ids  <U..  podcast IDs, indexed by podcast_idx
+#   indptr       int64 rows of podcast i are indptr[i]:indptr[i + 1]
+#   podcast_idx  int32 podcast of each row
+#   token_idx    int32 word of each row
+#   count        int32 count of each row
+# Rows are grouped by podcast, most frequent word first, in the order of the
+# podcast's token file. Plain .npy files can be memory-mapped with np.load.
+STORE_COLUMNS = ("vocab", "podcast_ids", "indptr", "podcast_idx", "token_idx", "count")
+
+def build_token_store(token_folder="podcast_tokens", store_folder=STORE_FOLDER, podcast_ids=None):
+    """
+    Convert per-podcast 'Word,Count' files into one dictionary-encoded store.
+
+    The columns are written to a new versioned folder next to the store
+    ("<store_folder>.<ns timestamp>") and store_folder, a symlink, is then
+    repointed at it with one atomic rename. Readers see either the old or
+    the new store, never a half-written or missing one. Only the version the
+    symlink pointed to before is then deleted; stores that are already open
+    keep reading its columns, whose files stay valid until they are closed.
+
+    Args:
+        token_folder (str): Folder holding <podcast_id>.csv token files.
+        store_folder (str): Output folder of the .npy columns.
+        podcast_ids (list, optional): Podcasts to include, in this order.
+            Defaults to every .csv file in token_folder.
+
+    Returns:
+        TokenStore: The new store, memory-mapped.
+    """
+    ids, word_arrays, count_arrays = [], [], []
+    for podcast_id, words, counts in iter_token_counts(podcast_ids, folder=token_folder):
+        # Most frequent first, keeping file order for ties, so top_n is a prefix
+        order = np.argsort(-counts, kind="stable")
+        ids.append(podcast_id)
+        word_arrays.append(words[order])
+        count_arrays.append(counts[order])
+    if not ids:
+        raise FileNotFoundError(f"No .csv files found in folder {token_folder}.")
+
+    lengths = np.array([len(words) for words in word_arrays], dtype=np.int64)
+    indptr = np.zeros(len(ids) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=indptr[1:])
+
+    # Dictionary-encode the words in order of first appearance
+    token_idx, vocab = pd.factorize(np.concatenate(word_arrays))
+    counts = np.concatenate(count_arrays)
+    if len(vocab) > np.iinfo(np.int32).max or (len(counts) and counts.max() > np.iinfo(np.int32).max):
+        raise OverflowError("Token store columns do not fit in int32.")
+
+    columns = {
+        "vocab": np.array(vocab, dtype=str) if len(vocab) else np.array([], dtype="<U1"),
+        "podcast_ids": np.array(ids, dtype=str),
+        "indptr": indptr,
+        "podcast_idx": np.repeat(np.arange(len(ids), dtype=np.int32), lengths),
+        "token_idx": token_idx.astype(np.int32),
+        "count": counts.astype(np.int32),
+    }
+
+    store_folder = store_folder.rstrip(os.sep)
+    version_folder = f"{store_folder}.{time.time_ns()}"
+    os.makedirs(version_folder)
+    for name, values in columns.items():
+        np.save(os.path.join(version_folder, f"{name}.npy"), values)
+
+    link_path = f"{version_folder}.link"
+    os.symlink(os.path.basename(version_folder), link_path)
+    previous_folder = None
+    if os.path.islink(store_folder):
+        previous_folder = os.path.realpath(store_folder)
+    elif os.path.isdir(store_folder):
+        # A store written as a plain folder: move it aside once, as a symlink
+        # cannot be renamed over a directory
+        previous_folder = f"{store_folder}.{time.time_ns()}"
+        os.replace(store_folder, previous_folder)
+    os.replace(link_path, store_folder)
+
+    # Remove only the version this build replaced; other "<store_folder>.*"
+    # folders may belong to a build that is still writing
+    if previous_folder is not None and previous_folder != os.path.realpath(version_folder) and os.path.isdir(previous_folder):
+        shutil.rmtree(previous_folder, ignore_errors=True)
+    return TokenStore(store_folder)
+
+class TokenStore:
+    """
+    Read access to a token store written by build_token_store.
+
+    With mmap=True (the default) the columns are memory-mapped, so opening the
+    store is instant and random access by podcast only touches that podcast's
+    rows. Use mmap=False to read the whole corpus into memory at once.
+    """
+
+    def __init__(self, folder=STORE_FOLDER, mmap=True):
+        self.folder = folder
+        mmap_mode = "r" if mmap else None
+        # Resolve the symlink once, so every column comes from the same build
+        version_folder = os.path.realpath(folder)
+        for name in STORE_COLUMNS:
+            setattr(self, name, np.load(os.path.join(version_folder, f"{name}.npy"), mmap_mode=mmap_mode))
+        self.podcast_index = {podcast_id: i for i, podcast_id in enumerate(self.podcast_ids.tolist())}
+
+    def __len__(self):
+        return len(self.podcast_ids)
+
+    def __contains__(self, podcast_id):
+        return podcast_id in self.podcast_index
+
+    def rows(self, podcast_id):
+        """Slice of the rows of one podcast."""
+        i = self.podcast_index[podcast_id]
+        return slice(int(self.indptr[i]), int(self.indptr[i + 1]))
+
+    def podcast_counts(self, podcast_id, top_n=None):
+        """
+        Token counts of one podcast, like token_counts.read_token_counts.
+
+        Args:
+            podcast_id (str): The podcast ID.
+            top_n (int, optional): Keep only the top_n most frequent words.
+
+        Returns:
+            tuple: (words, counts) as a str array and an int64 array,
+            most frequent first.
+        """
+        rows = self.rows(podcast_id)
+        if top_n is not None:
+            rows = slice(rows.start, min(rows.stop, rows.start + top_n))
+        return self.vocab[self.token_idx[rows]], np.array(self.count[rows], dtype=np.int64)
+
+    def iter_token_counts(self, podcast_ids=None, top_n=None):
+        """
+        Yield (podcast_id, words, counts) like token_counts.iter_token_counts.
+
+        Args:
+            podcast_ids (list, optional): Podcasts to read, in this order. Defaults to
+                every podcast in the store. IDs not in the store are skipped.
+            top_n (int, optional): Keep only the top_n most frequent words per podcast.
+        """
+        if podcast_ids is None:
+            podcast_ids = self.podcast_ids.tolist()
+        for podcast_id in podcast_ids:
+            if podcast_id in self.podcast_index:
+                words, counts = self.podcast_counts(podcast_id, top_n=top_n)
+                yield podcast_id, words, counts
+
+    def frequency_matrix(self, podcast_ids=None):
+        """
+        Dense podcast x word count matrix over the words used by the given podcasts.
+
+        Args:
+            podcast_ids (list, optional): Row order. Defaults to every podcast in
+                the store. IDs not in the store are skipped.
+
+        Returns:
+            tuple: (float64 matrix, list of row podcast IDs, array of column words)
+        """
+        if podcast_ids is None:
+            podcast_ids = self.podcast_ids.tolist()
+        kept = [podcast_id for podcast_id in podcast_ids if podcast_id in self.podcast_index]
+        if not kept:
+            return np.zeros((0, 0)), kept, self.vocab[:0]
+
+        rows = [self.rows(podcast_id) for podcast_id in kept]
+        token_idx = np.concatenate([self.token_idx[row] for row in rows])
+        counts = np.concatenate([self.count[row] for row in rows])
+        row_idx = np.repeat(np.arange(len(kept)), [row.stop - row.start for row in rows])
+
+        # Keep only the columns of words these podcasts use
+        used_tokens, column_idx = np.unique(token_idx, return_inverse=True)
+        vectors = np.zeros((len(kept), len(used_tokens)))
+        vectors[row_idx, column_idx] = counts
+        return vectors, kept, self.vocab[used_tokens]
+
+def benchmark_store(token_folder="podcast_tokens", store_folder=STORE_FOLDER, samples=100, seed=0):
+    """
+    Compare per-podcast .csv files with the token store for full and random reads.
+
+    Args:
+        token_folder (str): Folder holding <podcast_id>.csv token files.
+        store_folder (str): Token store built from token_folder.
+        samples (int): Number of podcasts read in the random-access test.
+        seed (int): Random seed of the sampled podcasts.
+
+    Returns:
+        dict: Seconds taken per test.
+    """
+    paths = sorted(glob.glob(os.path.join(token_folder, "*.csv")))
+    if not paths:
+        raise FileNotFoundError(f"No .csv files found in folder {token_folder}.")
+    podcast_ids = [os.path.splitext(os.path.basename(path))[0] for path in paths]
+    sample = np.random.default_rng(seed).choice(podcast_ids, size=min(samples, len(podcast_ids)), replace=False).tolist()
+
+    tests = {
+        "whole corpus, .csv files": lambda: sum(len(words) for _, words, _ in iter_token_counts(podcast_ids, folder=token_folder)),
+        "whole corpus, store": lambda: len(TokenStore(store_folder, mmap=False).count),
+        f"{len(sample)} random podcasts, .csv files": lambda: sum(len(words) for _, words, _ in iter_token_counts(sample, folder=token_folder)),
+        f"{len(sample)} random podcasts, mmap store": lambda: sum(len(words) for _, words, _ in TokenStore(store_folder).iter_token_counts(sample)),
+    }
+    timings = {}
+    for name, test in tests.items():
+        start = time.perf_counter()
+        test()
+        timings[name] = time.perf_counter() - start
+        print(f"{name:>36}: {timings[name] * 1000:.1f} ms")
+    return timings
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the dictionary-encoded token store from per-podcast token files.")
+    parser.add_argument("--token-folder", default="podcast_tokens", help="Folder with <podcast_id>.csv token counts.")
+    parser.add_argument("--store-folder", default=STORE_FOLDER, help="Output folder of the token store.")
+    parser.add_argument("--benchmark", action="store_true", help="Compare read times of the .csv files and the store after building.")
+    args = parser.parse_args()
+
+    start = time.time()
+    store = build_token_store(args.token_folder, args.store_folder)
+    print(f"Stored {len(store.count)} rows for {len(store)} podcasts and {len(store.vocab)} words "
+          f"in {args.store_folder} ({time.time() - start:.2f} seconds)")
+    if args.benchmark:
+        benchmark_store(args.token_folder, args.store_folder)
@@ -1,13 +1,124 @@
-import matplotlib.pyplot as plt
 from wordcloud import WordCloud
+from PIL import Image
 import os
 import glob
+import json
+import time
+import hashlib
+import argparse
+import tempfile
 from io import BytesIO
-import matplotlib
+from functools import partial
+from multiprocessing import Pool, cpu_count, get_context
+from token_counts import read_token_counts
+from token_store import STORE_FOLDER, TokenStore
 
-matplotlib.use('Agg')  # Use a non-GUI backend
+# Token-count hash of every rendered word cloud, stored next to the images
+MANIFEST_FILENAME = "manifest.json"
 
-def generate_word_cloud_local(podcast_id, input_folder="podcast_tokens", output_folder="wordclouds"):
+# Word cloud appearance (matches the dark details panel of the web-app)
+WORD_CLOUD_SIZE = 400
+BACKGROUND_COLOR = "#282828"
+COLORMAP = "RdYlGn"
+# WordCloud only draws its max_words most frequent words (200 by default)
+MAX_WORDS = 200
+
+# Encoder settings of the PIL rendering path, keyed by output format. PNG's
+# optimize=True triples encode time for ~1.5% smaller files, so zlib level 6 is
+# used instead; WebP method 4 is the speed/size sweet spot for 400x400 images.
+IMAGE_FORMATS = {
+    "png": {"format": "PNG", "compress_level": 6},
+    "webp": {"format": "WEBP", "quality": 85, "method": 4},
+}
+RENDERERS = ("pil", "matplotlib")
+
+def read_word_counts(file_path, top_n=MAX_WORDS):
+    """
+    Read a token count .csv file into a {word: count} dictionary.
+
+    Args:
+        file_path (str): Path to a 'Word,Count' .csv file.
+        top_n (int, optional): Keep only the most frequent words; defaults to
+            the number of words a word cloud can show.
+
+    Returns:
+        dict or None: Word counts, or None if the file has no data rows.
+    """
+    words, counts = read_token_counts(file_path, top_n=top_n)
+    if len(words) == 0:  # No data apart from the header
+        return None
+    return dict(zip(words, counts.tolist()))
+
+def build_word_cloud(word_counts):
+    """
+    Lay out a word cloud for the given word counts.
+
+    Args:
+        word_counts (dict or None): {word: count}; None or empty gives an empty cloud.
+
+    Returns:
+        WordCloud: The word cloud, with its layout computed when there are words.
+    """
+    wordcloud = WordCloud(
+        width=WORD_CLOUD_SIZE,
+        height=WORD_CLOUD_SIZE,
+        background_color=BACKGROUND_COLOR,
+        colormap=COLORMAP,
+        max_words=MAX_WORDS
+    )
+
+    if word_counts:
+        wordcloud = wordcloud.generate_from_frequencies(word_counts)
+    return wordcloud
+
+def word_cloud_image(wordcloud):
+    """
+    Draw a word cloud's layout into a PIL image.
+
+    Args:
+        wordcloud (WordCloud): A word cloud from build_word_cloud.
+
+    Returns:
+        PIL.Image.Image: The bitmap, or a blank background if the cloud has no words.
+    """
+    if hasattr(wordcloud, "layout_"):
+        return wordcloud.to_image()
+    return Image.new("RGB", (wordcloud.width, wordcloud.height), wordcloud.background_color)
+
+def save_word_cloud_pil(wordcloud, output_path, image_format="png"):
+    """
+    Write the word cloud bitmap straight to disk through PIL, without matplotlib.
+
+    Args:
+        wordcloud (WordCloud): The word cloud to save.
+        output_path (str): Destination image path.
+        image_format (str): One of IMAGE_FORMATS ("png" or "webp").
+    """
+    image = word_cloud_image(wordcloud)
+    with _atomic_output(output_path) as temp_path:
+        image.save(temp_path, **IMAGE_FORMATS[image_format])
+
+def save_word_cloud_matplotlib(wordcloud, output_path):
+    """
+    Save the word cloud through a matplotlib figure (the original rendering path).
+
+    Args:
+        wordcloud (WordCloud): The word cloud to save.
+        output_path (str): Destination .png path.
+    """
+    import matplotlib
+    matplotlib.use('Agg')  # Use a non-GUI backend
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(4, 4))
+    plt.imshow(wordcloud, interpolation="bilinear")
+    plt.axis("off")
+    plt.tight_layout(pad=0)
+    with _atomic_output(output_path) as temp_path:
+        plt.savefig(temp_path, format="png")
+    plt.close()
+
+def generate_word_cloud_local(podcast_id, input_folder="podcast_tokens", output_folder="wordclouds", renderer="pil", image_format="png"):
     """
     Generate a word cloud for a specific podcast ID from a .csv file stored locally.
 
@@ -15,6 +126,8 @@ def generate_word_cloud_local(podcast_id, input_folder="podcast_tokens", output_
         podcast_id (str): The podcast ID to generate the word cloud for.
         input_folder (str): The local folder where the .csv files are located.
         output_folder (str): The folder where the word cloud images will be saved.
+        renderer (str): "pil" writes the bitmap directly; "matplotlib" uses the original figure-based path.
+        image_format (str): "png" or "webp" (webp requires the "pil" renderer).
 
     Returns:
         str: The path to the saved word cloud image file.
@@ -27,68 +140,356 @@ def generate_word_cloud_local(podcast_id, input_folder="podcast_tokens", output_
         raise FileNotFoundError(f"The file {file_path} does not exist in folder {input_folder}.")
 
     # Read the tokens and their counts
-    word_counts = {}
-    with open(file_path, "r") as file:
-        lines = file.readlines()
-        if len(lines) <= 1:  # No data apart from the header
-            word_counts = None
-        else:
-            for line in lines[1:]:  # Skip the header line
-                word, count = line.strip().split(",")
-                word_counts[word] = int(count)
+    word_counts = read_word_counts(file_path)
 
-    # Generate the word cloud
-    wordcloud = WordCloud(
-        width=400,
-        height=400,
-        background_color="#282828",
-        colormap="RdYlGn"
-    )
+    return render_word_cloud(word_counts, podcast_id, output_folder, renderer=renderer, image_format=image_format)
 
-    if word_counts:
-        wordcloud = wordcloud.generate_from_frequencies(word_counts)
+def render_word_cloud(word_counts, podcast_id, output_folder="wordclouds", renderer="pil", image_format="png"):
+    """
+    Lay out and save the word cloud of one podcast's word counts.
+
+    Args:
+        word_counts (dict or None): {word: count}, e.g. from read_word_counts.
+        podcast_id (str): The podcast ID, used as the image file name.
+        output_folder (str): The folder where the word cloud images will be saved.
+        renderer (str): "pil" or "matplotlib", see generate_word_cloud_local.
+        image_format (str): "png" or "webp".
+
+    Returns:
+        str: The path to the saved word cloud image file.
+    """
+    if renderer not in RENDERERS:
+        raise ValueError(f"renderer must be one of {RENDERERS}, got {renderer!r}")
+    if image_format not in IMAGE_FORMATS or (renderer == "matplotlib" and image_format != "png"):
+        raise ValueError(f"Unsupported image format {image_format!r} for renderer {renderer!r}")
+
+    # Generate the word cloud
+    wordcloud = build_word_cloud(word_counts)
 
     # Ensure the output folder exists
     os.makedirs(output_folder, exist_ok=True)
 
-    # Save the word cloud as an image file
-    output_path = os.path.join(output_folder, f"{podcast_id}.png")
-    plt.figure(figsize=(4, 4))
-    plt.imshow(wordcloud, interpolation="bilinear")
-    plt.axis("off")
-    plt.tight_layout(pad=0)
-    plt.savefig(output_path, format="png")
-    plt.close()
+    # Save the word cloud as an image file; both paths render to a temporary
+    # file first so readers never see a half-written image
+    output_path = os.path.join(output_folder, f"{podcast_id}.{image_format}")
+    if renderer == "pil":
+        save_word_cloud_pil(wordcloud, output_path, image_format=image_format)
+    else:
+        save_word_cloud_matplotlib(wordcloud, output_path)
 
     # Return the path to the saved image file
     return output_path
 
-def generate_word_clouds_for_all(input_folder="podcast_tokens", output_folder="wordclouds"):
+class _atomic_output:
+    """
+    Context manager yielding a temporary path in the target folder that is
+    renamed over the target path on success and removed on failure.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.temp_path = None
+
+    def __enter__(self):
+        folder = os.path.dirname(self.path) or "."
+        handle, self.temp_path = tempfile.mkstemp(dir=folder, prefix=".tmp-", suffix=os.path.splitext(self.path)[1])
+        os.close(handle)
+        return self.temp_path
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            os.replace(self.temp_path, self.path)
+        elif os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+        return False
+
+
+def file_sha256(path):
+    """
+    Compute the SHA-256 hex digest of a file.
+
+    Args:
+        path (str): Path of the file to hash.
+
+    Returns:
+        str: Hex digest of the file contents.
+    """
+    hasher = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 16), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def store_counts_sha256(store, podcast_id):
+    """
+    Compute the SHA-256 hex digest of the words a podcast's word cloud shows.
+
+    Args:
+        store (TokenStore): The token store.
+        podcast_id (str): A podcast ID in the store.
+
+    Returns:
+        str: Hex digest of the podcast's MAX_WORDS most frequent words and counts.
+    """
+    words, counts = store.podcast_counts(podcast_id, top_n=MAX_WORDS)
+    hasher = hashlib.sha256()
+    hasher.update("\n".join(words.tolist()).encode("utf-8"))
+    hasher.update(counts.astype("<i8").tobytes())
+    return hasher.hexdigest()
+
+
+# Memory-mapped TokenStore of a render worker, opened on its first task
+_worker_store = None
+
+
+def store_word_counts(store_folder, podcast_id):
+    """
+    Read a podcast's word cloud words from the token store, like read_word_counts.
+
+    Args:
+        store_folder (str): Folder of the token store.
+        podcast_id (str): The podcast ID.
+
+    Returns:
+        dict or None: Word counts, or None if the podcast has no words.
+    """
+    global _worker_store
+    if _worker_store is None or _worker_store.folder != store_folder:
+        _worker_store = TokenStore(store_folder)
+    words, counts = _worker_store.podcast_counts(podcast_id, top_n=MAX_WORDS)
+    return dict(zip(words.tolist(), counts.tolist())) or None
+
+
+def manifest_path(output_folder="wordclouds"):
+    """
+    Path of the manifest of the word clouds in output_folder.
+
+    The manifest sits next to the folder ("wordclouds.manifest.json"), not
+    inside it, as the folder itself is served by the web app.
+
+    Args:
+        output_folder (str): The folder where the word cloud images are saved.
+
+    Returns:
+        str: The manifest path.
+    """
+    return f"{os.path.normpath(output_folder)}.{MANIFEST_FILENAME}"
+
+
+def load_manifest(output_folder="wordclouds"):
+    """
+    Load the {image file name: token-count hash} manifest of rendered word clouds.
+
+    Entries are keyed by image file name ("<podcast_id>.<format>"), so the
+    PNG and WebP renderings of a podcast are tracked separately.
+
+    Args:
+        output_folder (str): The folder where the word cloud images are saved.
+
+    Returns:
+        dict: The manifest, empty if none has been written yet.
+    """
+    path = manifest_path(output_folder)
+    if not os.path.exists(path):
+        # Written inside the folder by earlier versions; moved out by save_manifest
+        path = os.path.join(output_folder, MANIFEST_FILENAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as file:
+        return json.load(file)
+
+
+def save_manifest(manifest, output_folder="wordclouds"):
     """
-    Generate word clouds for all podcast IDs in the specified input folder and save them in the output folder.
+    Atomically write the manifest of rendered word clouds.
+
+    Args:
+        manifest (dict): Mapping of image file name to token-count hash.
+        output_folder (str): The folder where the word cloud images are saved.
+    """
+    os.makedirs(output_folder, exist_ok=True)
+    with _atomic_output(manifest_path(output_folder)) as temp_path:
+        with open(temp_path, "w") as file:
+            json.dump(manifest, file, indent=2, sort_keys=True)
+    # Earlier versions wrote the manifest inside the served folder
+    served_manifest = os.path.join(output_folder, MANIFEST_FILENAME)
+    if os.path.exists(served_manifest):
+        os.remove(served_manifest)
+
+
+def _render_task(podcast_id, input_folder, output_folder, renderer="pil", image_format="png", store_folder=None):
+    """Pool worker: render one word cloud and report (podcast_id, output_path, error)."""
+    try:
+        if store_folder is not None:
+            output_path = render_word_cloud(
+                store_word_counts(store_folder, podcast_id),
+                podcast_id,
+                output_folder=output_folder,
+                renderer=renderer,
+                image_format=image_format,
+            )
+        else:
+            output_path = generate_word_cloud_local(
+                podcast_id,
+                input_folder=input_folder,
+                output_folder=output_folder,
+                renderer=renderer,
+                image_format=image_format,
+            )
+        return podcast_id, output_path, None
+    except Exception as e:
+        return podcast_id, None, str(e)
+
+
+def generate_word_clouds_for_all(input_folder="podcast_tokens", output_folder="wordclouds", num_processes=None, force=False,
+                                 renderer="pil", image_format="png", store_folder=STORE_FOLDER):
+    """
+    Generate word clouds for all podcasts and save them in the output folder.
+
+    Token counts are read from the memory-mapped token store built by
+    models/token_store.py when it exists, and from the per-podcast .csv
+    files in input_folder otherwise. Podcasts whose token counts hash to the
+    manifest entry and whose image exists are skipped, so a refresh only
+    renders what changed. Rendering runs in a process pool.
 
     Args:
         input_folder (str): The local folder where the .csv files are located.
         output_folder (str): The folder where the word cloud images will be saved.
-    """
-    # Find all .csv files in the folder
-    csv_files = glob.glob(os.path.join(input_folder, "*.csv"))
-    
-    if not csv_files:
-        print(f"No .csv files found in folder {input_folder}.")
-        return
+        num_processes (int, optional): Number of worker processes. Defaults to CPU count.
+        force (bool): Re-render every podcast regardless of the manifest.
+        renderer (str): "pil" or "matplotlib", see generate_word_cloud_local.
+        image_format (str): "png" or "webp".
+        store_folder (str, optional): Token store to read; None to always read the .csv files.
 
-    # Process each .csv file
-    for csv_file in csv_files:
+    Returns:
+        dict: Counts of 'rendered', 'skipped' and 'failed' podcasts.
+    """
+    if store_folder is not None and os.path.isdir(store_folder):
+        # The podcast's most frequent words, straight from the store's columns
+        store = TokenStore(store_folder)
+        digests = {podcast_id: store_counts_sha256(store, podcast_id) for podcast_id in store.podcast_ids.tolist()}
+        source = store_folder
+    else:
+        store_folder = None
+        csv_files = glob.glob(os.path.join(input_folder, "*.csv"))
         # Extract podcast_id from the file name
-        podcast_id = os.path.splitext(os.path.basename(csv_file))[0]
-        
+        digests = {os.path.splitext(os.path.basename(csv_file))[0]: file_sha256(csv_file) for csv_file in csv_files}
+        source = input_folder
+
+    if not digests:
+        print(f"No token counts found in {source}.")
+        return {"rendered": 0, "skipped": 0, "failed": 0}
+
+    os.makedirs(output_folder, exist_ok=True)
+    manifest = load_manifest(output_folder)
+
+    # Decide which podcasts actually need rendering
+    pending = {}
+    for podcast_id, digest in digests.items():
+        image_name = f"{podcast_id}.{image_format}"
+        if not force and manifest.get(image_name) == digest and os.path.exists(os.path.join(output_folder, image_name)):
+            continue
+        pending[podcast_id] = digest
+
+    skipped = len(digests) - len(pending)
+    print(f"{len(pending)} word clouds to render, {skipped} unchanged (token counts from {source}).")
+
+    rendered = failed = 0
+    if pending:
+        if num_processes is None:
+            num_processes = cpu_count()
+        render = partial(
+            _render_task,
+            input_folder=input_folder,
+            output_folder=output_folder,
+            renderer=renderer,
+            image_format=image_format,
+            store_folder=store_folder,
+        )
         try:
-            # Generate the word cloud
-            output_path = generate_word_cloud_local(podcast_id, input_folder=input_folder, output_folder=output_folder)
-            print(f"Word cloud saved as {output_path}")
-        except Exception as e:
-            print(f"Error generating word cloud for {podcast_id}: {e}")
-
-# Example usage
-generate_word_clouds_for_all(input_folder="podcast_tokens", output_folder="wordclouds")
+            with Pool(processes=min(num_processes, len(pending))) as pool:
+                for podcast_id, output_path, error in pool.imap_unordered(render, sorted(pending)):
+                    if error:
+                        failed += 1
+                        print(f"Error generating word cloud for {podcast_id}: {error}")
+                        continue
+                    rendered += 1
+                    manifest[f"{podcast_id}.{image_format}"] = pending[podcast_id]
+                    print(f"Word cloud saved as {output_path}")
+        finally:
+            # Keep progress even if the run is interrupted
+            save_manifest(manifest, output_folder)
+
+    return {"rendered": rendered, "skipped": skipped, "failed": failed}
+
+
+def _benchmark_renderer(renderer, podcast_ids, input_folder):
+    """Render podcasts in a fresh process and report (seconds, peak RSS growth in MiB)."""
+    # Unix only, and only needed here; importing it at the top would break
+    # every importer of this module (such as the web app) on Windows
+    import resource
+
+    baseline_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    with tempfile.TemporaryDirectory() as output_folder:
+        start = time.perf_counter()
+        for podcast_id in podcast_ids:
+            generate_word_cloud_local(podcast_id, input_folder=input_folder, output_folder=output_folder, renderer=renderer)
+        elapsed = time.perf_counter() - start
+    peak_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return elapsed, (peak_kib - baseline_kib) / 1024
+
+def benchmark_renderers(input_folder="podcast_tokens", limit=50):
+    """
+    Compare wall time and peak memory of the PIL and matplotlib rendering paths.
+
+    Each renderer runs in its own freshly spawned process so peak RSS is not
+    shared between them.
+
+    Args:
+        input_folder (str): The local folder where the .csv files are located.
+        limit (int): Number of podcasts to render per renderer.
+
+    Returns:
+        dict: {renderer: (seconds per image, peak RSS growth in MiB)}.
+    """
+    csv_files = sorted(glob.glob(os.path.join(input_folder, "*.csv")))[:limit]
+    podcast_ids = [os.path.splitext(os.path.basename(csv_file))[0] for csv_file in csv_files]
+    if not podcast_ids:
+        raise FileNotFoundError(f"No .csv files found in folder {input_folder}.")
+
+    results = {}
+    for renderer in RENDERERS:
+        with get_context("spawn").Pool(processes=1) as pool:
+            elapsed, peak_mib = pool.apply(_benchmark_renderer, (renderer, podcast_ids, input_folder))
+        results[renderer] = (elapsed / len(podcast_ids), peak_mib)
+        print(f"{renderer:>10}: {elapsed / len(podcast_ids) * 1000:.1f} ms/image, peak RSS +{peak_mib:.1f} MiB over {len(podcast_ids)} images")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate word clouds for all podcasts with changed token files.")
+    parser.add_argument("--input-folder", default="podcast_tokens", help="Folder with <podcast_id>.csv token counts.")
+    parser.add_argument("--store-folder", default=STORE_FOLDER,
+                        help="Token store to read when it exists (default: %(default)s); the .csv files are read otherwise.")
+    parser.add_argument("--output-folder", default="wordclouds", help="Folder for the word cloud images.")
+    parser.add_argument("--processes", type=int, default=None, help="Number of worker processes (default: CPU count).")
+    parser.add_argument("--force", action="store_true", help="Re-render every podcast, ignoring the manifest.")
+    parser.add_argument("--renderer", choices=RENDERERS, default="pil", help="Rendering path (default: pil).")
+    parser.add_argument("--format", choices=sorted(IMAGE_FORMATS), default="png", help="Output image format (default: png).")
+    parser.add_argument("--benchmark", type=int, metavar="N", help="Compare renderers on the first N podcasts and exit.")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark_renderers(input_folder=args.input_folder, limit=args.benchmark)
+        raise SystemExit(0)
+
+    summary = generate_word_clouds_for_all(
+        input_folder=args.input_folder,
+        output_folder=args.output_folder,
+        num_processes=args.processes,
+        force=args.force,
+        renderer=args.renderer,
+        image_format=args.format,
+        store_folder=args.store_folder,
+    )
+    print(f"Rendered {summary['rendered']}, skipped {summary['skipped']}, failed {summary['failed']}.")
@@ -0,0 +1,172 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import contextlib
+import io
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from mock_spotify_server import MockSpotifyServer
+from rate_limit import TokenBucket
+from spotify_client import SpotifyClient
+from fetch_podcast_details import SpotifyPodcastFetcher
+import fetch_episode_details
+
+def mock_client(mock, rate=20.0, burst=5):
+    """
+    SpotifyClient pointed at a running MockSpotifyServer.
+
+    :param mock: Started MockSpotifyServer
+    :param rate: Requests per second of the client's bucket
+    :param burst: Burst size of the client's bucket
+    :return: SpotifyClient
+    """
+    return SpotifyClient("mock-id", "mock-secret", api_url=f"{mock.url}/v1", token_url=f"{mock.url}/api/token",
+                         bucket=TokenBucket(rate=rate, capacity=burst))
+
+def check_retry_after(retry_after=1, tolerance=0.25):
+    """
+    Crawl several shows concurrently against a server that allows fewer
+    requests per second than the client sends, and check that after every
+    429 the next successful request waits out Retry-After, but not much
+    longer, and that every show's file is complete.
+
+    :param retry_after: Retry-After seconds sent by the server
+    :param tolerance: Seconds a retry may come after Retry-After has elapsed
+    :return: True if the check passed
+    """
+    shows = {f"show{index}": 40 + 37 * index for index in range(6)}
+    podcasts = [
+        {'podcast_id': show_id, 'podcast_name': f"Name {show_id}", 'podcast_genre': "Check",
+         'podcast_dominant_color': "rgb(1, 2, 3)"}
+        for show_id in shows
+    ]
+    with MockSpotifyServer(shows, rate_limit=8, retry_after=retry_after) as mock:
+        client = mock_client(mock, rate=20.0)
+        start = time.time()
+        with contextlib.redirect_stdout(io.StringIO()):
+            fetch_episode_details.crawl_podcasts(podcasts, concurrency=4, client=client)
+        elapsed = time.time() - start
+
+    api_requests = [(sent, status) for sent, path, status in mock.requests if path.startswith("/v1")]
+    gaps = []
+    for sent, status in api_requests:
+        if status == 429:
+            following = [later for later, code in api_requests if later > sent and code == 200]
+            if following:
+                gaps.append(following[0] - sent)
+    complete = all(
+        len(pd.read_csv(fetch_episode_details.episode_output_path(f"Name {show_id}", "Check"))) == episodes
+        for show_id, episodes in shows.items()
+    )
+    passed = bool(gaps) and complete and all(retry_after <= gap <= retry_after + tolerance for gap in gaps)
+    print(f"429 retry timing: {len(api_requests)} requests in {elapsed:.1f} s, {len(gaps)} 429s, "
+          f"next success {min(gaps, default=0):.3f}-{max(gaps, default=0):.3f} s later "
+          f"(Retry-After {retry_after} s), files complete: {complete}")
+    return passed
+
+def check_token_refresh(concurrency=4):
+    """
+    Revoke the client's token and send concurrent requests: each gets a 401,
+    and exactly one new token must be fetched for all of them.
+
+    :param concurrency: Number of concurrent requests
+    :return: True if the check passed
+    """
+    with MockSpotifyServer({"show0": 10}) as mock:
+        client = mock_client(mock, rate=100.0, burst=concurrency)
+        client.get_json("shows/show0")
+        issued = mock.issued
+        mock.tokens.clear()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            shows = list(executor.map(lambda _: client.get_json("shows/show0"), range(concurrency)))
+        refreshes = mock.issued - issued
+        rejected = mock.count("/v1", status=401)
+
+    passed = refreshes == 1 and rejected >= 1 and all(show['id'] == "show0" for show in shows)
+    print(f"Token refresh: {rejected} concurrent 401s, {refreshes} token refresh(es)")
+    return passed
+
+def check_batched_matches_sequential(show_count=160):
+    """
+    Fetch the same podcast list (including an unknown and a duplicate ID)
+    with the batched and the one-request-per-show fetchers and compare the CSVs.
+
+    :param show_count: Number of shows in the list
+    :return: True if the check passed
+    """
+    shows = {f"show{index:04d}": 10 + index % 7 for index in range(show_count)}
+    ids = list(shows) + ["missing0", "show0003"]
+    pd.DataFrame({"podcast_id": ids, "podcast_genre": [f"genre{index % 5}" for index in range(len(ids))]}).to_csv(
+        "check_top_podcasts.csv", index=False)
+
+    requests = {}
+    for mode in ("batched", "sequential"):
+        with MockSpotifyServer(shows) as mock:
+            fetcher = SpotifyPodcastFetcher(None, None, client=mock_client(mock, rate=200.0, burst=10))
+            with contextlib.redirect_stdout(io.StringIO()):
+                if mode == "batched":
+                    fetcher.fetch_podcasts_batched("check_top_podcasts.csv", f"check_{mode}.csv")
+                else:
+                    fetcher.fetch_podcasts_from_csv("check_top_podcasts.csv", f"check_{mode}.csv")
+            requests[mode] = mock.count("/v1")
+
+    batched, sequential = pd.read_csv("check_batched.csv"), pd.read_csv("check_sequential.csv")
+    passed = batched.equals(sequential) and len(batched) > 0
+    print(f"Batched vs sequential: {requests['batched']} vs {requests['sequential']} requests, "
+          f"{len(batched)} rows, identical: {batched.equals(sequential)}")
+    return passed
+
+def check_missing_show():
+    """
+    A show the API answers with 404 yields None details and no episode pages,
+    without retries.
+
+    :return: True if the check passed
+    """
+    with MockSpotifyServer({"show0": 10}) as mock:
+        client = mock_client(mock)
+        with contextlib.redirect_stdout(io.StringIO()):
+            details = SpotifyPodcastFetcher(None, None, client=client).fetch_podcast_details("missing0")
+            page = fetch_episode_details.fetch_episode_page("missing0", 0, client=client)
+        not_found = mock.count("/v1", status=404)
+
+    passed = details is None and page is None and not_found == 2
+    print(f"Missing show: details {details}, episode page {page}, {not_found} requests answered 404")
+    return passed
+
+CHECKS = {
+    "retry-after": check_retry_after,
+    "token-refresh": check_token_refresh,
+    "batched": check_batched_matches_sequential,
+    "missing-show": check_missing_show,
+}
+
+def main():
+    """
+    Run the crawler checks against MockSpotifyServer in a temporary folder.
+    """
+    parser = argparse.ArgumentParser(description="Check the Spotify crawlers against a local mock of the Web API.")
+    parser.add_argument("--check", choices=sorted(CHECKS), action="append",
+                        help="Check to run (repeatable). Defaults to all.")
+    args = parser.parse_args()
+
+    failed = []
+    with tempfile.TemporaryDirectory() as folder:
+        cwd = os.getcwd()
+        os.chdir(folder)
+        try:
+            for name in args.check or list(CHECKS):
+                if not CHECKS[name]():
+                    failed.append(name)
+        finally:
+            os.chdir(cwd)
+
+    if failed:
+        print(f"FAILED: {', '.join(failed)}")
+        sys.exit(1)
+    print("All checks passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import time
+import sqlite3
+import threading
+
+class CrawlState:
+    """
+    SQLite checkpoint of the episode crawl, one row per show.
+
+    A row records the offset of the next page to fetch, the show's total
+    episode count, the newest release_date and episode_id seen, the last
+    episode_id written, the size of the show's output file after the last
+    checkpointed page and whether the show is complete. Each checkpoint is
+    committed at once, after its page is on disk, so a crash loses at most
+    the page in flight. The connection is shared by the crawl's worker
+    threads behind a lock.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS crawl_state ("
+            " show_id TEXT PRIMARY KEY,"
+            " next_offset INTEGER NOT NULL,"
+            " total INTEGER,"
+            " newest_release_date TEXT,"
+            " newest_episode_id TEXT,"
+            " last_episode_id TEXT,"
+            " output_bytes INTEGER NOT NULL,"
+            " completed INTEGER NOT NULL,"
+            " updated_at REAL NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self.connection.commit()
+
+    def get(self, show_id):
+        """
+        Return the checkpoint of a show.
+
+        :param show_id: Spotify show ID
+        :return: Dictionary of the row's columns, or None if the show was never crawled
+        """
+        with self._lock:
+            cursor = self.connection.execute("SELECT * FROM crawl_state WHERE show_id = ?", (show_id,))
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            record = dict(zip((column for column, *_ in cursor.description), row))
+        record['completed'] = bool(record['completed'])
+        return record
+
+    def checkpoint(self, show_id, next_offset, total, newest_release_date, newest_episode_id,
+                   output_bytes, completed, last_episode_id=None):
+        """
+        Record (and commit) the progress of a show.
+
+        :param show_id: Spotify show ID
+        :param next_offset: Offset of the next page to fetch
+        :param total: Total episodes reported by the API
+        :param newest_release_date: Release date of the newest episode seen
+        :param newest_episode_id: ID of the newest episode seen
+        :param output_bytes: Size of the show's output file after this page
+        :param completed: Whether every page has been fetched
+        :param last_episode_id: ID of the oldest episode written so far
+        """
+        with self._lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO crawl_state (show_id, next_offset, total, newest_release_date,"
+                " newest_episode_id, output_bytes, completed, updated_at, last_episode_id)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (show_id, next_offset, total, newest_release_date, newest_episode_id,
+                 output_bytes, int(completed), time.time(), last_episode_id),
+            )
+            self.connection.commit()
+
+    def forget(self, show_id):
+        """Drop a show's checkpoint, so the next run crawls it from scratch."""
+        with self._lock:
+            self.connection.execute("DELETE FROM crawl_state WHERE show_id = ?", (show_id,))
+            self.connection.commit()
+
+    def close(self):
+        self.connection.close()
@@ -1,166 +1,215 @@
-import base64
 import os
-import sys
-import time
 import csv
 import re
+import json
+import math
+import itertools
+import argparse
+import threading
 import pandas as pd
-from dotenv import load_dotenv
-from requests import post, get
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from tqdm import tqdm
+from rate_limit import TokenBucket
+from spotify_client import SpotifyClient, SpotifyAPIError, DEFAULT_RATE, DEFAULT_BURST
+from crawl_state import CrawlState
+
+INPUT_CSV = "podcast_details_english_colors.csv"
+PAGE_LIMIT = 50
+DEFAULT_CONCURRENCY = 4
+
+# Per-show progress, so an interrupted crawl resumes where it stopped
+DEFAULT_STATE_PATH = "crawl_state.sqlite"
+
+LOG_FILENAME = "problematic_episodes.log"
+EPISODE_COLUMNS = [
+    'episode_id', 'episode_name', 'episode_description', 'episode_duration_ms',
+    'episode_explicit', 'episode_release_date', 'episode_language', 'podcast_id',
+    'podcast_name', 'podcast_genre', 'podcast_dominant_color'
+]
+
+# Client used when none is passed, built from the environment on first use
+_client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    """Return the module-wide SpotifyClient (credentials and endpoints from the environment)."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = SpotifyClient.from_env()
+        return _client
+
+def fetch_episode_page(show_id, offset, limit=PAGE_LIMIT, client=None, fresh=False):
+    """
+    Fetch one page of a show's episodes.
 
-# Load environment variables
-load_dotenv(override=True)
-CLIENT_ID = os.getenv("CLIENT_ID")
-CLIENT_SECRET = os.getenv("CLIENT_SECRET")
-
-token_info = {
-    "access_token": None,
-    "expires_at": 0
-}
-
-# Load input CSV
-podcast_details = pd.read_csv("podcast_details_english_colors.csv")
-
-def get_token():
-    """Obtain Spotify API access token."""
-    global token_info
-    auth_string = f"{CLIENT_ID}:{CLIENT_SECRET}"
-    auth_bytes = auth_string.encode('utf-8')
-    auth_base64 = str(base64.b64encode(auth_bytes), 'utf-8')
-
-    url = 'https://accounts.spotify.com/api/token'
-    headers = {
-        "Authorization": f"Basic {auth_base64}",
-        "Content-Type": "application/x-www-form-urlencoded"
-    }
-    data = {"grant_type": "client_credentials"}
+    Retries, token refresh and rate limiting are handled by the client.
 
+    :param show_id: Spotify show ID
+    :param offset: Index of the first episode of the page
+    :param limit: Page size (at most 50)
+    :param client: SpotifyClient shared by all requests of the crawl
+    :param fresh: Bypass the client's recorded responses (pages change as episodes are published)
+    :return: Page JSON, or None if the request failed
+    """
+    client = client or get_client()
     try:
-        result = post(url, headers=headers, data=data)
-        result.raise_for_status()
-        json_result = result.json()
-
-        token_info['access_token'] = json_result['access_token']
-        token_info['expires_at'] = time.time() + json_result['expires_in']
-        return token_info['access_token']
+        return client.get_json(f"shows/{show_id}/episodes", {'limit': limit, 'offset': offset}, fresh=fresh)
     except Exception as e:
-        print(f"Error obtaining token: {e}")
+        print(f"Error fetching episodes for show ID {show_id} at offset {offset}: {e}")
         return None
 
-def get_auth_header():
-    """Create authorization header with dynamic token refreshing."""
-    global token_info
-    if not token_info['access_token'] or time.time() > token_info['expires_at'] - 300:
-        token_info['access_token'] = get_token()
-    return {"Authorization": f"Bearer {token_info['access_token']}"}
-
-def get_all_episodes_from_show(show_id):
+def iter_episode_pages(show_id, client=None, offset=0, fresh=False):
     """
-    Fetch all episodes from a Spotify show with detailed monitoring of batch sizes.
-    """
-    all_episodes = []
-    offset = 0
-    limit = 50
-    max_attempts = 5
+    Yield a show's episode pages one at a time, newest episodes first.
 
-    while True:
-        url = f'https://api.spotify.com/v1/shows/{show_id}/episodes'
-        headers = get_auth_header()
-        params = {'limit': limit, 'offset': offset}
-
-        attempts = 0
-        while attempts < max_attempts:
-            try:
-                response = get(url, headers=headers, params=params)
+    Nothing is accumulated, so callers can write each page as it arrives.
 
-                if response.status_code == 401:  # Unauthorized (token expired)
-                    print("Token expired. Refreshing token...")
-                    token_info['access_token'] = get_token()
-                    headers = get_auth_header()
-                    continue
-
-                if response.status_code == 429:  # Rate limit
-                    retry_after = max(int(response.headers.get("Retry-After", 5)), 600)
-                    print(f"Rate limit exceeded. Retrying after {retry_after} seconds...")
-                    time.sleep(retry_after)
-                    continue
+    :param show_id: Spotify show ID
+    :param client: SpotifyClient shared by all requests of the crawl
+    :param offset: Offset of the first page (to resume a crawl)
+    :param fresh: Bypass the client's recorded responses
+    :return: Generator of (offset, page JSON)
+    :raises SpotifyAPIError: If a page cannot be fetched
+    """
+    while True:
+        page = fetch_episode_page(show_id, offset, PAGE_LIMIT, client, fresh)
+        if page is None:
+            raise SpotifyAPIError(f"Failed to fetch episodes for show ID {show_id} at offset {offset}")
+        yield offset, page
+        offset += PAGE_LIMIT
+        if not page.get('items') or offset >= page.get('total', 0):
+            return
 
-                response.raise_for_status()
-                response_json = response.json()
-                episodes_batch = response_json.get('items', [])
+def get_all_episodes_from_show(show_id, client=None):
+    """
+    Fetch all episodes from a Spotify show with detailed monitoring of batch sizes.
 
-                batch_size = len(episodes_batch)
-                print(f"Fetched batch of {batch_size} episodes. Offset: {offset}")
+    Pages are paced by the client's shared token bucket instead of fixed sleeps.
+    """
+    all_episodes = []
+    try:
+        for offset, page in iter_episode_pages(show_id, client):
+            episodes_batch = page.get('items', [])
+            print(f"Fetched batch of {len(episodes_batch)} episodes. Offset: {offset}")
+            all_episodes.extend(episodes_batch)
+    except SpotifyAPIError as e:
+        print(f"{e}.")
+        return all_episodes
+
+    print(f"Finished fetching episodes. Total episodes fetched: {len(all_episodes)}")
+    return all_episodes
 
-                all_episodes.extend(episodes_batch)
-                offset += limit
+class ProblemLog:
+    """
+    Buffered, thread-safe writer for problematic_episodes.log.
 
-                if not episodes_batch or offset >= response_json.get('total', 0):
-                    print(f"Finished fetching episodes. Total episodes fetched: {len(all_episodes)}")
-                    return all_episodes
+    Lines are kept in memory and appended to the file in one write when the
+    buffer fills, at the end of each show and on close, instead of reopening
+    the file for every malformed episode.
+    """
 
-                time.sleep(3)
-                break
+    def __init__(self, path=LOG_FILENAME, buffer_lines=256):
+        self.path = path
+        self.buffer_lines = buffer_lines
+        self._lines = []
+        self._lock = threading.Lock()
+
+    def write(self, line):
+        with self._lock:
+            self._lines.append(line)
+            if len(self._lines) < self.buffer_lines:
+                return
+            lines, self._lines = self._lines, []
+        self._append(lines)
+
+    def flush(self):
+        with self._lock:
+            lines, self._lines = self._lines, []
+        self._append(lines)
+
+    def _append(self, lines):
+        if lines:
+            with open(self.path, "a") as log_file:
+                log_file.write("".join(f"{line}\n" for line in lines))
+
+    close = flush
+
+problem_log = ProblemLog()
+
+class JsonLinesWriter:
+    """csv.DictWriter look-alike that writes one JSON object per line."""
+
+    def __init__(self, file, fieldnames):
+        self.file = file
+        self.fieldnames = fieldnames
+
+    def writeheader(self):
+        pass
+
+    def writerow(self, row):
+        # Missing values (NaN from pandas) become null, as bare NaN is not valid JSON
+        record = {
+            field: None if isinstance(row[field], float) and math.isnan(row[field]) else row[field]
+            for field in self.fieldnames
+        }
+        self.file.write(json.dumps(record, ensure_ascii=False, allow_nan=False) + "\n")
+
+# Episode output formats: file extension -> writer
+OUTPUT_FORMATS = {"csv": csv.DictWriter, "jsonl": JsonLinesWriter}
+
+def episode_output_path(podcast_name, genre, output_format="csv"):
+    """Return podcasts/<genre>/<podcast name>.<format>, creating the genre folder."""
+    os.makedirs('podcasts/', exist_ok=True)
+    genre_folder = os.path.join('podcasts', sanitize_filename(genre) or 'Unknown_Genre')
+    os.makedirs(genre_folder, exist_ok=True)
+    return os.path.join(genre_folder, f"{sanitize_filename(podcast_name)}.{output_format}")
 
-            except Exception as e:
-                print(f"Error fetching episodes for show ID {show_id} (Attempt {attempts+1}): {e}")
-                attempts += 1
-                time.sleep(3)
+def write_episode_rows(writer, episodes, podcast_id, podcast_name, genre, dominant_color):
+    """
+    Write episodes as rows, logging malformed ones to problematic_episodes.log.
 
-        if attempts == max_attempts:
-            print(f"Failed to fetch episodes for show ID {show_id} after {max_attempts} attempts.")
-            break
+    :return: Number of rows written
+    """
+    written = 0
+    for episode in episodes:
+        if not episode or not isinstance(episode, dict):
+            problem_log.write(f"Malformed episode data: {episode}")
+            continue
 
-    return all_episodes
+        try:
+            writer.writerow({
+                'episode_id': episode.get('id', 'N/A'),
+                'episode_name': episode.get('name', 'Unnamed Episode'),
+                'episode_description': episode.get('description', 'No description available'),
+                'episode_duration_ms': episode.get('duration_ms', 0),
+                'episode_explicit': episode.get('explicit', False),
+                'episode_release_date': episode.get('release_date', 'Unknown Date'),
+                'episode_language': episode.get('language', 'Unknown'),
+                'podcast_id': podcast_id,
+                'podcast_name': podcast_name,
+                'podcast_genre': genre,
+                'podcast_dominant_color': dominant_color
+            })
+            written += 1
+
+        except Exception as row_error:
+            print(f"Error writing episode row: {row_error}")
+            problem_log.write(f"Error writing row: {row_error}, Episode: {episode}")
+    return written
 
 def save_episodes_to_csv(episodes, podcast_id, podcast_name, genre, dominant_color):
     """
     Save the list of episodes to a CSV file with show ID as filename.
     """
-    os.makedirs('podcasts/', exist_ok=True)
-    genre_folder = os.path.join('podcasts', sanitize_filename(genre) or 'Unknown_Genre')
-    os.makedirs(genre_folder, exist_ok=True)
-
-    filename = os.path.join(genre_folder, f"{sanitize_filename(podcast_name)}.csv")
-    log_filename = "problematic_episodes.log"
-
-    headers = [
-        'episode_id', 'episode_name', 'episode_description', 'episode_duration_ms',
-        'episode_explicit', 'episode_release_date', 'episode_language', 'podcast_id',
-        'podcast_name', 'podcast_genre', 'podcast_dominant_color'
-    ]
+    filename = episode_output_path(podcast_name, genre)
 
     try:
         with open(filename, mode='w', newline='', encoding='utf-8') as file:
-            writer = csv.DictWriter(file, fieldnames=headers)
+            writer = csv.DictWriter(file, fieldnames=EPISODE_COLUMNS)
             writer.writeheader()
-
-            for episode in episodes:
-                if not episode or not isinstance(episode, dict):
-                    with open(log_filename, "a") as log_file:
-                        log_file.write(f"Malformed episode data: {episode}\n")
-                    continue
-
-                try:
-                    writer.writerow({
-                        'episode_id': episode.get('id', 'N/A'),
-                        'episode_name': episode.get('name', 'Unnamed Episode'),
-                        'episode_description': episode.get('description', 'No description available'),
-                        'episode_duration_ms': episode.get('duration_ms', 0),
-                        'episode_explicit': episode.get('explicit', False),
-                        'episode_release_date': episode.get('release_date', 'Unknown Date'),
-                        'episode_language': episode.get('language', 'Unknown'),
-                        'podcast_id': podcast_id,
-                        'podcast_name': podcast_name,
-                        'podcast_genre': genre,
-                        'podcast_dominant_color': dominant_color
-                    })
-
-                except Exception as row_error:
-                    print(f"Error writing episode row: {row_error}")
-                    with open(log_filename, "a") as log_file:
-                        log_file.write(f"Error writing row: {row_error}, Episode: {episode}\n")
+            write_episode_rows(writer, episodes, podcast_id, podcast_name, genre, dominant_color)
+        problem_log.flush()
 
         print(f"Saved {len(episodes)} episodes for {podcast_name} to {filename}")
 
@@ -171,45 +220,262 @@ def sanitize_filename(name):
     """Sanitize a string to make it a valid filename."""
     return re.sub(r'[^\w\s-]', '', str(name)).replace(" ", "_")
 
-def process_podcast(podcast):
+def _newest(episodes):
+    """(release_date, id) of the first well-formed episode; pages list the newest first."""
+    for episode in episodes:
+        if episode and isinstance(episode, dict):
+            return episode.get('release_date'), episode.get('id')
+    return None, None
+
+def _last_id(episodes):
+    """id of the last well-formed episode, i.e. the oldest one of a page."""
+    for episode in reversed(episodes):
+        if episode and isinstance(episode, dict):
+            return episode.get('id')
+    return None
+
+def _resume_pages(podcast_id, record, client):
+    """
+    Yield a show's pages from its checkpoint, like iter_episode_pages.
+
+    Pages list the newest episodes first, so every episode published since
+    the checkpoint moves the remaining ones down by one. The first page
+    fetched tells how much the total grew; if it changed, the crawl restarts
+    one episode before the shifted offset, so that its first item is the
+    last episode written. Leading items up to that episode are dropped.
+    """
+    offset = record['next_offset']
+    pages = iter_episode_pages(podcast_id, client, offset, fresh=True)
+    page_offset, page = next(pages)
+    shift = page.get('total', record['total']) - record['total']
+    if shift:
+        print(f"{shift:+d} episodes since the checkpoint; resuming at offset {max(0, offset + shift - 1)}")
+        pages.close()
+        pages = iter_episode_pages(podcast_id, client, max(0, offset + shift - 1), fresh=True)
+        page_offset, page = next(pages)
+
+    items = page.get('items', [])
+    ids = [episode.get('id') if episode and isinstance(episode, dict) else None for episode in items]
+    if record['last_episode_id'] is not None and record['last_episode_id'] in ids:
+        page = dict(page, items=items[ids.index(record['last_episode_id']) + 1:])
+    yield page_offset, page
+    yield from pages
+
+def _is_known(episode, record):
+    """Whether an episode was published no later than the newest one of the last crawl."""
+    if not episode or not isinstance(episode, dict):
+        return False
+    if episode.get('id') == record['newest_episode_id']:
+        return True
+    release_date, newest_date = episode.get('release_date'), record['newest_release_date']
+    return bool(release_date and newest_date and release_date < newest_date)
+
+def crawl_show(podcast, client=None, state=None, refresh=False, output_format="csv"):
     """
-    Process a single podcast, fetching its episodes and saving them.
+    Stream a show's episodes into podcasts/<genre>/<name>.<format>, page by page.
+
+    Each page is appended to the show's file as it arrives, so memory holds
+    one page and a crash keeps everything written before it. Without a
+    CrawlState the file is rewritten from the first page, and not created at
+    all when the show has no episodes or its first page cannot be fetched.
+
+    With a state, every page is synced and then checkpointed: the next
+    offset, the total, the newest and last episodes written and the file
+    size. After a crash the file is cut back to the checkpointed size and the
+    crawl continues from the recorded offset, shifted by the episodes
+    published meanwhile, so no page is fetched or written twice. Completed
+    shows are skipped, unless `refresh` is set: then pages are read from the
+    newest episode on, only until an episode of the previous crawl appears,
+    and the new episodes are appended.
+
+    :param podcast: Podcast record (podcast_id, podcast_name, podcast_genre, podcast_dominant_color)
+    :param client: SpotifyClient shared by all requests of the crawl
+    :param state: CrawlState, or None to crawl without checkpoints
+    :param refresh: Fetch episodes published since a completed show's last crawl
+    :param output_format: "csv" or "jsonl"
+    :return: True if the show is complete, False if it has to be resumed later
     """
     podcast_id = podcast['podcast_id']
     podcast_name = podcast['podcast_name']
-    genre = podcast['podcast_genre']
-    dominant_color = podcast['podcast_dominant_color']
+    row_fields = (podcast_id, podcast_name, podcast['podcast_genre'], podcast['podcast_dominant_color'])
+    filename = episode_output_path(podcast_name, podcast['podcast_genre'], output_format)
+
+    record = state.get(podcast_id) if state is not None else None
+    if record is not None and not os.path.exists(filename):
+        print(f"{filename} is missing; crawling {podcast_name} from scratch")
+        record = None
+    if record is not None and record['completed'] and not refresh:
+        print(f"Skipping {podcast_name}: already crawled")
+        return True
+    if record is not None:
+        # Drop anything written after the last checkpoint
+        os.truncate(filename, record['output_bytes'])
+
+    pages = None
+    if state is None:
+        # Without checkpoints, only create the file once there are episodes to write
+        pages = iter_episode_pages(podcast_id, client)
+        try:
+            first_page = next(pages)
+        except SpotifyAPIError as e:
+            print(f"{e}; skipping {podcast_name}")
+            return False
+        if not first_page[1].get('items'):
+            print(f"No episodes found for {podcast_name}")
+            return True
+        pages = itertools.chain([first_page], pages)
+
+    with open(filename, mode='a' if record is not None else 'w', newline='', encoding='utf-8') as file:
+        writer = OUTPUT_FORMATS[output_format](file, fieldnames=EPISODE_COLUMNS)
+
+        def sync():
+            file.flush()
+            os.fsync(file.fileno())
+            return os.fstat(file.fileno()).st_size
+
+        try:
+            if record is not None and record['completed']:
+                return _refresh_show(podcast, record, writer, row_fields, sync, client, state)
+
+            if record is None:
+                writer.writeheader()
+                newest_date, newest_id, last_id = None, None, None
+                pages = pages or iter_episode_pages(podcast_id, client)
+            else:
+                newest_date, newest_id, last_id = record['newest_release_date'], record['newest_episode_id'], record['last_episode_id']
+                print(f"Resuming {podcast_name} at offset {record['next_offset']} of {record['total']}")
+                pages = _resume_pages(podcast_id, record, client)
 
+            try:
+                for page_offset, page in pages:
+                    items = page.get('items', [])
+                    if newest_id is None:
+                        newest_date, newest_id = _newest(items)
+                    last_id = _last_id(items) or last_id
+
+                    write_episode_rows(writer, items, *row_fields)
+                    print(f"Fetched batch of {len(items)} episodes. Offset: {page_offset}")
+                    offset, total = page_offset + PAGE_LIMIT, page.get('total', 0)
+                    if state is not None:
+                        completed = not page.get('items') or offset >= total
+                        state.checkpoint(podcast_id, offset, total, newest_date, newest_id, sync(), completed, last_id)
+            except SpotifyAPIError as e:
+                print(f"{e}; resume later")
+                return False
+
+            print(f"Finished fetching episodes for {podcast_name}. Total: {total}")
+            return True
+        finally:
+            problem_log.flush()
+
+def _refresh_show(podcast, record, writer, row_fields, sync, client, state):
+    """Append the episodes published since a completed show's last crawl (see crawl_show)."""
+    podcast_id = podcast['podcast_id']
+    new_episodes, total = [], record['total']
     try:
-        episodes = get_all_episodes_from_show(podcast_id)
-        if not episodes:
-            print(f"No episodes found for {podcast_name}")
-            return
+        for _, page in iter_episode_pages(podcast_id, client, fresh=True):
+            items = page.get('items', [])
+            total = page.get('total', total)
+            known = next((index for index, episode in enumerate(items) if _is_known(episode, record)), None)
+            new_episodes.extend(items if known is None else items[:known])
+            if known is not None:
+                break
+    except SpotifyAPIError as e:
+        print(f"{e}; keeping the previous crawl of {podcast['podcast_name']}")
+        return True
+
+    # Written in one go, so an interrupted refresh leaves the file as it was checkpointed
+    write_episode_rows(writer, new_episodes, *row_fields)
+    newest_date, newest_id = _newest(new_episodes)
+    state.checkpoint(
+        podcast_id, record['next_offset'], total,
+        newest_date or record['newest_release_date'], newest_id or record['newest_episode_id'],
+        sync(), completed=True, last_episode_id=record['last_episode_id'],
+    )
+    print(f"Refreshed {podcast['podcast_name']}: {len(new_episodes)} new episodes")
+    return True
+
+def process_podcast(podcast, client=None, state=None, refresh=False, output_format="csv"):
+    """
+    Process a single podcast, streaming its episodes to disk page by page.
 
-        save_episodes_to_csv(episodes, podcast_id, podcast_name, genre, dominant_color)
+    With a CrawlState the show is checkpointed and can be resumed or
+    refreshed (see crawl_show).
+    """
+    try:
+        crawl_show(podcast, client, state, refresh, output_format)
     except Exception as e:
-        print(f"Error processing {podcast_name}: {e}")
+        print(f"Error processing {podcast['podcast_name']}: {e}")
+
+def crawl_podcasts(podcasts, concurrency=DEFAULT_CONCURRENCY, client=None, desc="Processing Podcasts",
+                   state=None, refresh=False, output_format="csv"):
+    """
+    Process podcasts in a bounded thread pool, at most `concurrency` shows at a time.
+
+    Each show is fetched and saved by process_podcast in a worker thread
+    with blocking requests; all of them share one client and its token
+    bucket, so the request rate stays bounded however many shows are in
+    flight, and a 429 pauses every show.
+
+    :param podcasts: List of podcast records (podcast_id, podcast_name, podcast_genre, podcast_dominant_color)
+    :param concurrency: Number of worker threads (shows fetched at the same time)
+    :param client: Shared SpotifyClient; defaults to the module-wide one
+    :param desc: Progress bar label
+    :param state: CrawlState to checkpoint and resume shows with
+    :param refresh: Only fetch episodes newer than each show's last crawl
+    :param output_format: "csv" or "jsonl"
+    """
+    client = client or get_client()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [
+            executor.submit(process_podcast, podcast, client, state, refresh, output_format)
+            for podcast in podcasts
+        ]
+        for future in tqdm(as_completed(futures), total=len(futures), desc=desc):
+            future.result()
 
 def main():
     """
     Main function to process podcasts by genre.
     """
-    if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} - choose one from {podcast_details['podcast_genre'].unique()} ...")
+    parser = argparse.ArgumentParser(description="Fetch all episodes of the podcasts in the given genres.")
+    parser.add_argument("genres", nargs="*", help="Genres to crawl.")
+    parser.add_argument("--input-csv", default=INPUT_CSV, help="Podcast details CSV with genres and dominant colors.")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Shows fetched at the same time.")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE, help="Maximum requests per second over all shows.")
+    parser.add_argument("--burst", type=int, default=DEFAULT_BURST, help="Requests that may be sent back to back.")
+    parser.add_argument("--state", default=DEFAULT_STATE_PATH,
+                        help="SQLite crawl checkpoint; interrupted shows resume from it (delete it to start over).")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Only fetch episodes published since each show's last completed crawl.")
+    parser.add_argument("--format", choices=sorted(OUTPUT_FORMATS), default="csv",
+                        help="Per-show episode file format under podcasts/<genre>/.")
+    args = parser.parse_args()
+
+    # Load input CSV
+    podcast_details = pd.read_csv(args.input_csv)
+
+    if not args.genres:
+        print(f"Usage: {parser.prog} - choose one from {podcast_details['podcast_genre'].unique()} ...")
         return
 
-    genres = sys.argv[1:]
-
-    for genre in genres:
+    client = SpotifyClient.from_env(
+        bucket=TokenBucket(rate=args.rate, capacity=args.burst),
+        pool_size=max(args.concurrency, 4),
+    )
+    state = CrawlState(args.state)
+    for genre in args.genres:
         podcasts = podcast_details[podcast_details['podcast_genre'] == genre].to_dict(orient='records')
 
         if not podcasts:
             print(f"No podcasts found for genre: {genre}")
             continue
 
-        for podcast in tqdm(podcasts, desc=f"Processing Podcasts in {genre}"):
-            process_podcast(podcast)
-            time.sleep(3)
+        crawl_podcasts(podcasts, args.concurrency, client, desc=f"Processing Podcasts in {genre}",
+                       state=state, refresh=args.refresh, output_format=args.format)
+    problem_log.close()
+    state.close()
+    client.close()
 
 if __name__ == "__main__":
     main()
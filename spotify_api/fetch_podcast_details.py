@@ -1,24 +1,51 @@
 import os
-import time
-import spotipy
+import csv
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-from spotipy.oauth2 import SpotifyClientCredentials
 import pandas as pd
+from rate_limit import TokenBucket
+from spotify_client import SpotifyClient, DEFAULT_RATE, DEFAULT_BURST
+
+# The multi-show endpoint accepts at most 50 IDs per call
+SHOWS_PER_REQUEST = 50
+DEFAULT_CONCURRENCY = 4
+
+OUTPUT_COLUMNS = [
+    'podcast_id', 'podcast_name', 'podcast_description', 'podcast_publisher', 'podcast_languages',
+    'podcast_total_episodes', 'podcast_explicit', 'podcast_image_url', 'podcast_url', 'genre'
+]
+
+def podcast_info_from_show(show):
+    """
+    Extract the podcast details kept in podcast_details.csv from a show object.
+
+    :param show: Show object returned by the API
+    :return: Dictionary of podcast details
+    """
+    return {
+        'podcast_id': show['id'],
+        'podcast_name': show['name'],
+        'podcast_description': show.get('description', ''),
+        'podcast_publisher': show.get('publisher', ''),
+        'podcast_languages': show.get('languages', []),
+        'podcast_total_episodes': show.get('total_episodes', 0),
+        'podcast_explicit': show.get('explicit', False),
+        'podcast_image_url': show['images'][0]['url'] if show['images'] else '',
+        'podcast_url': show['external_urls']['spotify'],
+    }
 
 class SpotifyPodcastFetcher:
 
-    def __init__(self, client_id, client_secret):
+    def __init__(self, client_id, client_secret, client=None):
         """
         Initialize Spotify client with credentials.
         
         :param client_id: Spotify Developer App Client ID
         :param client_secret: Spotify Developer App Client Secret
+        :param client: SpotifyClient to use instead of building one
         """
-        self.client_credentials_manager = SpotifyClientCredentials(
-            client_id=client_id, 
-            client_secret=client_secret
-        )
-        self.sp = spotipy.Spotify(client_credentials_manager=self.client_credentials_manager)
+        self.client = client or SpotifyClient.from_env(client_id=client_id, client_secret=client_secret)
     
     def fetch_podcast_details(self, podcast_id):
         """
@@ -29,21 +56,76 @@ class SpotifyPodcastFetcher:
         """
         try:
             # Fetch podcast details using ID
-            show = self.sp.show(podcast_id)
-            return {
-                'podcast_id': show['id'],
-                'podcast_name': show['name'],
-                'podcast_description': show.get('description', ''),
-                'podcast_publisher': show.get('publisher', ''),
-                'podcast_languages': show.get('languages', []),
-                'podcast_total_episodes': show.get('total_episodes', 0),
-                'podcast_explicit': show.get('explicit', False),
-                'podcast_image_url': show['images'][0]['url'] if show['images'] else '',
-                'podcast_url': show['external_urls']['spotify'],  
-            }
+            show = self.client.get_json(f"shows/{podcast_id}")
+            return podcast_info_from_show(show)
         except Exception as e:
             print(f"Error fetching details for podcast ID {podcast_id}: {e}")
             return None
+
+    def fetch_podcast_batch(self, podcast_ids):
+        """
+        Fetch up to 50 podcasts with a single call to the multi-show endpoint.
+
+        :param podcast_ids: Spotify podcast IDs
+        :return: Dictionary of podcast ID -> podcast details; IDs the API
+            returned no show for are left out
+        """
+        try:
+            shows = self.client.get_json("shows", {'ids': ",".join(podcast_ids)})['shows']
+        except Exception as e:
+            print(f"Error fetching details for {len(podcast_ids)} podcasts starting at {podcast_ids[0]}: {e}")
+            return {}
+        return {show['id']: podcast_info_from_show(show) for show in shows if show}
+
+    def fetch_podcasts_batched(self, input_csv, output_csv, batch_size=SHOWS_PER_REQUEST,
+                               concurrency=DEFAULT_CONCURRENCY):
+        """
+        Fetch podcast details in batches of up to 50 IDs, several batches at a time.
+
+        Batches run in a bounded thread pool of blocking requests that share
+        the client's rate limiter.
+        Each finished batch is appended to output_csv right away, in input
+        order, so an interrupted run keeps everything written so far. The
+        output has the same rows and columns as fetch_podcasts_from_csv.
+
+        :param input_csv: Path to input CSV with podcast_id and podcast_genre columns
+        :param output_csv: Path to output CSV with podcast details
+        :param batch_size: IDs per request (at most 50)
+        :param concurrency: Number of worker threads (batches in flight at the same time)
+        :return: Number of podcasts written
+        """
+        if not 1 <= batch_size <= SHOWS_PER_REQUEST:
+            raise ValueError(f"batch_size must be between 1 and {SHOWS_PER_REQUEST}")
+        df = pd.read_csv(input_csv)
+        if 'podcast_id' not in df.columns:
+            raise ValueError("Input CSV must contain the column 'podcast_id'")
+
+        rows = list(zip(df['podcast_id'], df['podcast_genre']))
+        batches = [rows[start:start + batch_size] for start in range(0, len(rows), batch_size)]
+
+        written = 0
+        with open(output_csv, mode='w', newline='', encoding='utf-8') as file, \
+                ThreadPoolExecutor(max_workers=concurrency) as executor:
+            writer = csv.DictWriter(file, fieldnames=OUTPUT_COLUMNS)
+            writer.writeheader()
+            futures = [
+                executor.submit(self.fetch_podcast_batch, list(dict.fromkeys(podcast_id for podcast_id, _ in batch)))
+                for batch in batches
+            ]
+            # Waiting in order writes each batch as soon as it and all earlier ones are done
+            for index, (batch, future) in enumerate(zip(batches, futures)):
+                details = future.result()
+                for podcast_id, genre in batch:
+                    if podcast_id in details:
+                        writer.writerow({**details[podcast_id], 'genre': genre})
+                        written += 1
+                    else:
+                        print(f"No details returned for podcast ID {podcast_id}")
+                file.flush()
+                print(f"Fetched batch {index + 1} of {len(batches)}; {written} podcasts written")
+
+        print(f"Saved {written} podcast details to {output_csv}")
+        return written
     
     def fetch_podcasts_from_csv(self, input_csv, output_csv):
         """
@@ -64,7 +146,7 @@ class SpotifyPodcastFetcher:
         # List to store podcast details
         podcast_details = []
         
-        # Iterate through podcasts with rate limiting and error handling
+        # Iterate through podcasts; the client rate-limits the requests
         for index, row in df.iterrows():
             try:
                 print(f"Fetching details for podcast ID: {row['podcast_id']}. {index + 1} out of {length_df}")
@@ -74,9 +156,6 @@ class SpotifyPodcastFetcher:
                     # Merge original row data with fetched podcast info
                     podcast_info['genre'] = row['podcast_genre']
                     podcast_details.append(podcast_info)
-                
-                # Rate limiting to avoid hitting API limits
-                time.sleep(0.2)  # 5 requests per second
             
             except Exception as e:
                 print(f"Error processing podcast ID {row['podcast_id']}: {e}")
@@ -88,20 +167,33 @@ class SpotifyPodcastFetcher:
         print(f"Saved {len(results_df)} podcast details to {output_csv}")
 
 def main():
+    parser = argparse.ArgumentParser(description="Fetch podcast details for the top podcasts of every genre.")
+    parser.add_argument("--input-csv", default="top_podcasts_all_genre.csv", help="CSV with podcast_id and podcast_genre.")
+    parser.add_argument("--output-csv", default="podcast_details.csv", help="Path of the podcast details CSV.")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Batches of 50 fetched at the same time.")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE, help="Maximum requests per second.")
+    parser.add_argument("--sequential", action="store_true", help="Fetch one podcast per request, in order.")
+    args = parser.parse_args()
+
     # Load environment variables
     load_dotenv(override=True)
     CLIENT_ID = os.getenv("CLIENT_ID")
     CLIENT_SECRET = os.getenv("CLIENT_SECRET")
     
-    # Paths for input and output CSVs
-    INPUT_CSV = 'top_podcasts_all_genre.csv'
-    OUTPUT_CSV = 'podcast_details.csv'
-    
     # Create fetcher instance
-    fetcher = SpotifyPodcastFetcher(CLIENT_ID, CLIENT_SECRET)
+    client = SpotifyClient.from_env(
+        client_id=CLIENT_ID,
+        client_secret=CLIENT_SECRET,
+        bucket=TokenBucket(rate=args.rate, capacity=DEFAULT_BURST),
+    )
+    fetcher = SpotifyPodcastFetcher(CLIENT_ID, CLIENT_SECRET, client=client)
     
     # Fetch and save podcast details
-    fetcher.fetch_podcasts_from_csv(INPUT_CSV, OUTPUT_CSV)
+    if args.sequential:
+        fetcher.fetch_podcasts_from_csv(args.input_csv, args.output_csv)
+    else:
+        fetcher.fetch_podcasts_batched(args.input_csv, args.output_csv, concurrency=args.concurrency)
+    client.close()
 
 if __name__ == "__main__":
     main()
@@ -1,11 +1,11 @@
 
 import pandas as pd
-import requests
 from io import BytesIO
 from PIL import Image
 from tqdm import tqdm
 import numpy as np
 import colorsys
+from spotify_client import SpotifyClient, SpotifyAPIError
 
 def is_white_dominated(image):
     """
@@ -72,21 +72,27 @@ def is_muted_color(rgb_color, threshold=50):
     # Check if colors are too similar (grey-like)
     return color_variance < threshold
 
-def get_comprehensive_dominant_color(image_url):
+def get_comprehensive_dominant_color(image_url, client=None):
     """
     Get the most representative color from the image with comprehensive analysis.
     
     Args:
     image_url (str): URL of the image.
+    client (SpotifyClient): Client to download the image with (pooled, cached, with timeouts).
     
     Returns:
     str: RGB color string or None if no suitable color found.
     """
     try:
-        response = requests.get(image_url, timeout=600)
-        if response.status_code == 200:
+        client = client or SpotifyClient.from_env()
+        try:
+            content = client.get_bytes(image_url)
+        except SpotifyAPIError as error:
+            content = None
+            print(f"Failed to fetch image: {image_url} (HTTP {error.status})")
+        if content is not None:
             # Open image and convert to RGB
-            image = Image.open(BytesIO(response.content)).convert('RGB')
+            image = Image.open(BytesIO(content)).convert('RGB')
             
             # Handle white-dominated images
             if is_white_dominated(image):
@@ -132,9 +138,6 @@ def get_comprehensive_dominant_color(image_url):
                 best_color = max(dominant_colors, key=lambda c: color_freq[c])
             
             return f"rgb({best_color[0]}, {best_color[1]}, {best_color[2]})"
-        
-        else:
-            print(f"Failed to fetch image: {image_url} (HTTP {response.status_code})")
     except Exception as e:
         print(f"Error processing image {image_url}: {e}")
     return None
@@ -148,6 +151,7 @@ def append_dominant_colors_to_csv(input_csv, output_csv):
     output_csv (str): Path to save the updated CSV file.
     """
     df = pd.read_csv(input_csv)
+    client = SpotifyClient.from_env()
     dominant_colors = []
     print("Extracting dominant colors for podcast images...")
     
@@ -155,7 +159,7 @@ def append_dominant_colors_to_csv(input_csv, output_csv):
         if pd.isna(image_url):
             dominant_colors.append(None)
         else:
-            dominant_colors.append(get_comprehensive_dominant_color(image_url))
+            dominant_colors.append(get_comprehensive_dominant_color(image_url, client))
     
     df["podcast_dominant_color"] = dominant_colors
     df.to_csv(output_csv, index=False)
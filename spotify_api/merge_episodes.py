@@ -3,7 +3,7 @@ import pandas as pd
 
 def merge_csv_files_in_directory(directory, output_file):
     """
-    Recursively traverse a directory and merge all CSV files into one large file.
+    Recursively traverse a directory and merge all CSV and JSONL episode files into one large file.
 
     Parameters:
     - directory (str): The root directory to search for CSV files.
@@ -18,12 +18,15 @@ def merge_csv_files_in_directory(directory, output_file):
     # Walk through directory and its subdirectories
     for root, _, files in os.walk(directory):
         for file in files:
-            if file.endswith(".csv"):  # Check if the file is a CSV
+            if file.endswith((".csv", ".jsonl")):  # Check if the file is a CSV or JSONL
                 file_path = os.path.join(root, file)
                 print(f"Processing file: {file_path}")
                 try:
-                    # Read CSV into a dataframe
-                    df = pd.read_csv(file_path)
+                    # Read CSV or JSONL into a dataframe
+                    if file.endswith(".jsonl"):
+                        df = pd.read_json(file_path, lines=True, dtype=False, convert_dates=False)
+                    else:
+                        df = pd.read_csv(file_path)
                     # Check if the DataFrame is empty or all columns are NaN
                     if not df.empty and not df.isna().all(axis=None):
                         csv_data.append(df)
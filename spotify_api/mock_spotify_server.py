@@ -0,0 +1,212 @@
+import json
+import time
+import argparse
+import threading
+from collections import deque
+from datetime import date, timedelta
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+class MockSpotifyServer:
+    """
+    Local stand-in for the parts of the Spotify Web API the crawlers use.
+
+    Serves POST /api/token (client credentials), GET /v1/shows?ids=
+    (up to 50 IDs, null for unknown ones), GET /v1/shows/{id} and
+    GET /v1/shows/{id}/episodes with Spotify's paging fields, on a local
+    port. Episodes are generated deterministically, newest first. A request
+    rate limit can be set to exercise 429 handling; every request is logged
+    in `requests` as (monotonic time, path, status).
+
+    Point the crawlers at it with SPOTIFY_API_URL=<url>/v1 and
+    SPOTIFY_TOKEN_URL=<url>/api/token.
+    """
+
+    def __init__(self, shows, rate_limit=None, retry_after=1, token_ttl=3600, host="127.0.0.1", port=0):
+        """
+        :param shows: Dictionary of show ID -> number of episodes
+        :param rate_limit: Requests allowed per rolling second, None for no limit
+        :param retry_after: Retry-After value (seconds) sent with a 429
+        :param token_ttl: expires_in of issued tokens, in seconds
+        :param host: Interface to bind
+        :param port: Port to bind, 0 for any free port
+        """
+        self.shows = dict(shows)
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.token_ttl = token_ttl
+        self.tokens = {}  # access token -> expiry time
+        self.issued = 0
+        self.requests = []
+        self._recent = deque()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve in a background thread and return the base URL."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.url
+
+    def serve_forever(self):
+        """Serve in the calling thread until interrupted."""
+        self._server.serve_forever()
+
+    def stop(self):
+        """Shut the server down."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def count(self, path_prefix="", status=None):
+        """Number of logged requests whose path starts with path_prefix (and with the given status)."""
+        return sum(
+            1 for _, path, code in self.requests
+            if path.startswith(path_prefix) and (status is None or code == status)
+        )
+
+    @staticmethod
+    def episode(show_id, index, total):
+        """Episode `index` of a show, 0 being the newest, in the API's episode format."""
+        number = total - index
+        return {
+            "id": f"{show_id}e{number:05d}",
+            "name": f"Episode {number}",
+            "description": f"Episode {number} of show {show_id}. Welcome back to the show.",
+            "duration_ms": 60000 + number,
+            "explicit": number % 2 == 0,
+            "release_date": (date(2024, 1, 1) + timedelta(days=number)).isoformat(),
+            "language": "en",
+        }
+
+    def show(self, show_id):
+        """Show object in the API's format."""
+        return {
+            "id": show_id,
+            "name": f"Show {show_id}",
+            "description": f"A podcast about {show_id}.",
+            "publisher": "Mock Publisher",
+            "languages": ["en"],
+            "total_episodes": self.shows[show_id],
+            "explicit": False,
+            "images": [{"url": f"https://i.scdn.co/image/{show_id}", "height": 640, "width": 640}],
+            "external_urls": {"spotify": f"https://open.spotify.com/show/{show_id}"},
+        }
+
+    def _rate_limited(self, now):
+        if self.rate_limit is None:
+            return False
+        while self._recent and now - self._recent[0] >= 1.0:
+            self._recent.popleft()
+        if len(self._recent) >= self.rate_limit:
+            return True
+        self._recent.append(now)
+        return False
+
+    def _respond(self, path, now, headers, body):
+        """Return (status, extra headers, JSON payload) for one request."""
+        if path == "/api/token":
+            if b"grant_type=client_credentials" not in body:
+                return 400, {}, {"error": "unsupported_grant_type"}
+            self.issued += 1
+            token = f"mock-token-{self.issued}"
+            self.tokens[token] = now + self.token_ttl
+            return 200, {}, {"access_token": token, "token_type": "Bearer", "expires_in": self.token_ttl}
+
+        token = headers.get("Authorization", "").removeprefix("Bearer ")
+        if self.tokens.get(token, 0) <= now:
+            return 401, {}, {"error": {"status": 401, "message": "The access token expired"}}
+        if self._rate_limited(now):
+            return 429, {"Retry-After": str(self.retry_after)}, {"error": {"status": 429, "message": "API rate limit exceeded"}}
+        return self._route(urlparse(path))
+
+    def _route(self, parsed):
+        parts = parsed.path.strip("/").split("/")
+        query = parse_qs(parsed.query)
+        if parts == ["v1", "shows"]:
+            ids = [show_id for show_id in query.get("ids", [""])[0].split(",") if show_id]
+            if not ids or len(ids) > 50:
+                return 400, {}, {"error": {"status": 400, "message": "Invalid limit"}}
+            return 200, {}, {"shows": [self.show(show_id) if show_id in self.shows else None for show_id in ids]}
+        if len(parts) == 3 and parts[:2] == ["v1", "shows"]:
+            if parts[2] not in self.shows:
+                return 404, {}, {"error": {"status": 404, "message": "Non existing id"}}
+            return 200, {}, self.show(parts[2])
+        if len(parts) == 4 and parts[:2] == ["v1", "shows"] and parts[3] == "episodes":
+            show_id = parts[2]
+            if show_id not in self.shows:
+                return 404, {}, {"error": {"status": 404, "message": "Non existing id"}}
+            limit = min(int(query.get("limit", ["20"])[0]), 50)
+            offset = int(query.get("offset", ["0"])[0])
+            total = self.shows[show_id]
+            items = [self.episode(show_id, index, total) for index in range(offset, min(offset + limit, total))]
+            following = offset + limit
+            return 200, {}, {
+                "items": items,
+                "limit": limit,
+                "offset": offset,
+                "total": total,
+                "next": f"/v1/shows/{show_id}/episodes?offset={following}&limit={limit}" if following < total else None,
+            }
+        return 404, {}, {"error": {"status": 404, "message": "Service not found"}}
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _handle(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0) or 0))
+                with server._lock:
+                    now = time.monotonic()
+                    status, extra_headers, payload = server._respond(self.path, now, self.headers, body)
+                    server.requests.append((now, urlparse(self.path).path, status))
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in extra_headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = _handle
+            do_POST = _handle
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local stand-in for the Spotify Web API.")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on.")
+    parser.add_argument("--shows", type=int, default=10, help="Number of shows (IDs show0000, show0001, ...).")
+    parser.add_argument("--episodes", type=int, default=120, help="Episodes per show.")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Requests per second before answering 429.")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with a 429.")
+    args = parser.parse_args()
+
+    mock = MockSpotifyServer(
+        {f"show{index:04d}": args.episodes for index in range(args.shows)},
+        rate_limit=args.rate_limit,
+        retry_after=args.retry_after,
+        port=args.port,
+    )
+    print(f"Mock Spotify API on {mock.url} (SPOTIFY_API_URL={mock.url}/v1 SPOTIFY_TOKEN_URL={mock.url}/api/token)")
+    try:
+        mock.serve_forever()
+    except KeyboardInterrupt:
+        mock.stop()
@@ -0,0 +1,114 @@
+import time
+import random
+import threading
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by every request of a crawl.
+
+    Tokens refill at `rate` per second up to `capacity`; each request takes
+    one. The limiter is adaptive: a 429 pauses the whole bucket for exactly
+    the server's Retry-After and halves the rate, and each success raises it
+    again by a small step, up to the configured rate.
+    """
+
+    def __init__(self, rate=2.0, capacity=5, min_rate=0.1, recovery=0.05):
+        """
+        :param rate: Maximum requests per second
+        :param capacity: Burst size
+        :param min_rate: Lowest rate the bucket backs off to
+        :param recovery: Requests per second regained after each success
+        """
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be positive and capacity at least 1")
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.min_rate = min(min_rate, rate)
+        self.recovery = recovery
+        self.tokens = float(capacity)
+        # Time the tokens were last refilled; set in the future while paused
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def reserve(self):
+        """
+        Take a token, going into debt if none is left.
+
+        :return: Seconds the caller must wait before sending its request
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+            wait = max(0.0, self.updated - now)
+            if self.tokens < 0:
+                wait += -self.tokens / self.rate
+            return wait
+
+    def pause_remaining(self):
+        """Seconds left of a pause set by penalize (0 when not paused)."""
+        with self._lock:
+            return max(0.0, self.updated - time.monotonic())
+
+    def acquire(self):
+        """Block the calling thread until a request may be sent."""
+        wait = self.reserve()
+        # A 429 seen by another caller may have paused the bucket meanwhile
+        while wait > 0:
+            time.sleep(wait)
+            wait = self.pause_remaining()
+
+    def penalize(self, retry_after=None):
+        """
+        Back off after a 429: pause every caller for `retry_after` seconds
+        and halve the rate.
+
+        :param retry_after: Seconds from the Retry-After header, if any
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate / 2)
+            if retry_after is not None:
+                # Refill only from the end of the pause, with a single token,
+                # so the first retry goes out exactly after Retry-After and
+                # the next ones follow at the reduced rate
+                self.updated = max(self.updated, now + retry_after)
+                self.tokens = min(self.tokens, 1.0)
+
+    def reward(self):
+        """Raise the rate a step after a successful request."""
+        with self._lock:
+            if self.rate < self.max_rate:
+                now = time.monotonic()
+                self._refill(now)
+                self.rate = min(self.max_rate, self.rate + self.recovery)
+
+def parse_retry_after(value):
+    """
+    Parse a Retry-After header given in seconds.
+
+    :param value: Header value or None
+    :return: Seconds to wait, or None if the header is missing or not a number
+    """
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+def backoff_delay(attempt, base=1.0, cap=60.0):
+    """
+    Exponential backoff with full jitter, for failures without a Retry-After.
+
+    :param attempt: Number of failed attempts so far (0 for the first retry)
+    :param base: Delay scale in seconds
+    :param cap: Maximum delay in seconds
+    :return: Seconds to wait
+    """
+    return random.uniform(0, min(cap, base * 2 ** attempt))
@@ -0,0 +1,303 @@
+import os
+import json
+import time
+import base64
+import hashlib
+import threading
+import requests
+from urllib.parse import urlencode
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from rate_limit import TokenBucket, parse_retry_after, backoff_delay
+
+# Overridable to run against mock_spotify_server.py
+API_URL = "https://api.spotify.com/v1"
+TOKEN_URL = "https://accounts.spotify.com/api/token"
+
+# Requests per second and burst shared by all API calls of a client
+DEFAULT_RATE = 2.0
+DEFAULT_BURST = 5
+
+# (connect, read) timeouts in seconds
+DEFAULT_TIMEOUT = (5, 30)
+MAX_ATTEMPTS = 5
+# 429 responses tolerated per request before giving up
+MAX_RATE_LIMITS = 10
+
+# Refresh the access token this many seconds before it expires
+TOKEN_MARGIN = 300
+
+CACHE_MODES = ("record", "replay")
+
+class SpotifyAPIError(Exception):
+    """A request failed for good: a client error, or every attempt used up."""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+class CacheMiss(SpotifyAPIError):
+    """Replay mode and the response was never recorded."""
+
+class ResponseCache:
+    """
+    On-disk cache of successful GET responses, for record/replay.
+
+    Each response body is stored in its own file, named after a hash of the
+    URL and query parameters (never the auth header), and written atomically.
+    In "record" mode cached responses are replayed and missing ones fetched
+    and stored; in "replay" mode a missing response raises CacheMiss instead
+    of touching the network.
+    """
+
+    def __init__(self, folder, mode="record"):
+        """
+        :param folder: Directory holding the responses
+        :param mode: "record" or "replay"
+        """
+        if mode not in CACHE_MODES:
+            raise ValueError(f"mode must be one of {CACHE_MODES}, got {mode!r}")
+        self.folder = folder
+        self.mode = mode
+        self.hits = self.misses = 0
+        os.makedirs(folder, exist_ok=True)
+
+    @staticmethod
+    def key(url, params=None):
+        """Cache key of a GET request."""
+        if params:
+            url = f"{url}?{urlencode(sorted(params.items()))}"
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.folder, key[:2], key)
+
+    def get(self, key):
+        """Return the recorded body, or None."""
+        try:
+            with open(self._path(key), "rb") as file:
+                body = file.read()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return body
+
+    def put(self, key, body):
+        """Record a response body."""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(body)
+        os.replace(temp_path, path)
+
+class SpotifyClient:
+    """
+    Shared HTTP client for the Spotify crawlers.
+
+    One keep-alive requests.Session with a connection pool sized for the
+    crawl's concurrency; client-credentials tokens fetched and refreshed in
+    one place; one retry policy (401 refreshes the token, 429 pauses the
+    shared TokenBucket for exactly Retry-After, connection errors and 5xx
+    back off exponentially, other 4xx fail at once; every retry is capped
+    and a request that runs out raises SpotifyAPIError); and explicit timeouts.
+    The client is thread-safe, so worker threads share one instance.
+    """
+
+    def __init__(self, client_id, client_secret, api_url=API_URL, token_url=TOKEN_URL,
+                 bucket=None, cache=None, timeout=DEFAULT_TIMEOUT, max_attempts=MAX_ATTEMPTS,
+                 max_rate_limits=MAX_RATE_LIMITS, pool_size=16):
+        """
+        :param client_id: Spotify Developer App Client ID
+        :param client_secret: Spotify Developer App Client Secret
+        :param api_url: Base URL of the Web API
+        :param token_url: Client-credentials token endpoint
+        :param bucket: TokenBucket for API calls; defaults to DEFAULT_RATE/DEFAULT_BURST
+        :param cache: ResponseCache, or None to always use the network
+        :param timeout: (connect, read) timeout in seconds
+        :param max_attempts: Attempts per request before giving up
+        :param max_rate_limits: 429 responses per request before giving up
+        :param pool_size: Connections kept alive per host
+        """
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.api_url = api_url.rstrip("/")
+        self.token_url = token_url
+        self.bucket = bucket or TokenBucket(rate=DEFAULT_RATE, capacity=DEFAULT_BURST)
+        self.cache = cache
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.max_rate_limits = max_rate_limits
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._token = None
+        self._expires_at = 0.0
+        self._token_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, **kwargs):
+        """
+        Build a client from the environment (and .env).
+
+        Reads CLIENT_ID and CLIENT_SECRET, the endpoint overrides
+        SPOTIFY_API_URL and SPOTIFY_TOKEN_URL, and SPOTIFY_CACHE_DIR /
+        SPOTIFY_CACHE_MODE to record or replay responses. Keyword arguments
+        are passed to the constructor and take precedence.
+        """
+        load_dotenv(override=True)
+        kwargs.setdefault("client_id", os.getenv("CLIENT_ID"))
+        kwargs.setdefault("client_secret", os.getenv("CLIENT_SECRET"))
+        cache_dir = os.getenv("SPOTIFY_CACHE_DIR")
+        if cache_dir and "cache" not in kwargs:
+            kwargs["cache"] = ResponseCache(cache_dir, os.getenv("SPOTIFY_CACHE_MODE", "record"))
+        kwargs.setdefault("api_url", os.getenv("SPOTIFY_API_URL", API_URL))
+        kwargs.setdefault("token_url", os.getenv("SPOTIFY_TOKEN_URL", TOKEN_URL))
+        return cls(**kwargs)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _fetch_token(self):
+        """
+        Fetch a client-credentials token, retrying connection errors, 429
+        and 5xx with backoff like _send.
+
+        :raises SpotifyAPIError: The token endpoint refused the credentials,
+            kept failing, or returned no token
+        """
+        auth = base64.b64encode(f"{self.client_id}:{self.client_secret}".encode("utf-8")).decode("utf-8")
+        attempts = 0
+        while True:
+            try:
+                response = self.session.post(
+                    self.token_url,
+                    headers={"Authorization": f"Basic {auth}"},
+                    data={"grant_type": "client_credentials"},
+                    timeout=self.timeout,
+                )
+                status = response.status_code
+                error = f"HTTP {status}"
+            except requests.RequestException as exception:
+                response, status, error = None, None, exception
+            if response is not None and status < 400:
+                break
+            if status is not None and status < 500 and status != 429:
+                raise SpotifyAPIError(f"POST {self.token_url}: HTTP {status}", status)
+            attempts += 1
+            if attempts >= self.max_attempts:
+                raise SpotifyAPIError(f"POST {self.token_url} failed after {attempts} attempts: {error}", status)
+            retry_after = parse_retry_after(response.headers.get("Retry-After")) if status == 429 else None
+            time.sleep(retry_after if retry_after is not None else backoff_delay(attempts - 1))
+
+        try:
+            token = response.json()
+            self._token = token["access_token"]
+            self._expires_at = time.time() + token["expires_in"]
+        except (ValueError, KeyError, TypeError) as exception:
+            raise SpotifyAPIError(f"POST {self.token_url}: no access token in the response ({exception!r})",
+                                  status) from exception
+
+    def auth_header(self, rejected=None):
+        """
+        Return the Authorization header, fetching a token when there is none,
+        it is about to expire, or it is the one the API just rejected.
+
+        :param rejected: Token of a request that got a 401
+        """
+        with self._token_lock:
+            if self._token is None or self._token == rejected or time.time() > self._expires_at - TOKEN_MARGIN:
+                self._fetch_token()
+            return {"Authorization": f"Bearer {self._token}"}
+
+    def _send(self, url, params, authenticated, rate_limited):
+        """GET with the retry policy; returns the successful response."""
+        rejected = None
+        attempts = rate_limits = 0
+        while True:
+            if rate_limited:
+                self.bucket.acquire()
+            headers = self.auth_header(rejected) if authenticated else {}
+            try:
+                response = self.session.get(url, headers=headers, params=params, timeout=self.timeout)
+            except requests.RequestException as error:
+                attempts += 1
+                if attempts >= self.max_attempts:
+                    raise SpotifyAPIError(f"GET {url} failed after {attempts} attempts: {error}") from error
+                time.sleep(backoff_delay(attempts - 1))
+                continue
+
+            status = response.status_code
+            if status == 401 and authenticated and rejected is None:
+                # Refresh once; a second 401 is a real error
+                rejected = headers["Authorization"].removeprefix("Bearer ")
+                continue
+            if status == 429:
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                self.bucket.penalize(retry_after)
+                rate_limits += 1
+                if rate_limits >= self.max_rate_limits:
+                    raise SpotifyAPIError(f"GET {url} still rate limited after {rate_limits} attempts", 429)
+                if retry_after is None:
+                    time.sleep(backoff_delay(rate_limits - 1))
+                continue
+            if status >= 500:
+                attempts += 1
+                if attempts >= self.max_attempts:
+                    raise SpotifyAPIError(f"GET {url} failed after {attempts} attempts: HTTP {status}", status)
+                time.sleep(backoff_delay(attempts - 1))
+                continue
+            if status >= 400:
+                raise SpotifyAPIError(f"GET {url}: HTTP {status}", status)
+
+            if rate_limited:
+                self.bucket.reward()
+            return response
+
+    def get_bytes(self, url, params=None, authenticated=False, rate_limited=False, fresh=False):
+        """
+        GET a URL and return the body, through the response cache.
+
+        :param url: Absolute URL (e.g. a cover image)
+        :param params: Query parameters
+        :param authenticated: Send the bearer token
+        :param rate_limited: Take a token from the shared bucket per attempt
+        :param fresh: In record mode, skip the recorded response and record the new one
+            (for data that changes, such as the newest episodes of a show)
+        :return: Response body
+        """
+        key = None
+        if self.cache is not None:
+            key = ResponseCache.key(url, params)
+            body = None if fresh and self.cache.mode == "record" else self.cache.get(key)
+            if body is not None:
+                return body
+            if self.cache.mode == "replay":
+                raise CacheMiss(f"GET {url} was not recorded")
+        body = self._send(url, params, authenticated, rate_limited).content
+        if key is not None:
+            self.cache.put(key, body)
+        return body
+
+    def get_json(self, path, params=None, fresh=False):
+        """
+        GET a Web API endpoint, e.g. get_json("shows/<id>/episodes", {"limit": 50}).
+
+        :param path: Path relative to the API base URL
+        :param params: Query parameters
+        :param fresh: Bypass the recorded response (see get_bytes)
+        :return: Decoded JSON response
+        """
+        body = self.get_bytes(f"{self.api_url}/{path.lstrip('/')}", params, authenticated=True,
+                              rate_limited=True, fresh=fresh)
+        return json.loads(body)
@@ -0,0 +1,243 @@
+import re
+import time
+import hashlib
+import argparse
+import pandas as pd
+from collections import defaultdict, Counter
+from text_normalization import normalize_text
+
+# Boilerplate handling modes: drop repeated sentences, or count them once per podcast
+BOILERPLATE_MODES = ("drop", "once")
+
+# Cheap sentence split for fingerprinting: after ., ! or ? followed by
+# whitespace, and at line breaks. It only has to be consistent between the
+# fingerprinting pass and strip_boilerplate, not match punkt exactly.
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+|\s*\n\s*')
+
+def split_sentences(text):
+    """
+    Split a raw description into sentences for fingerprinting.
+
+    Args:
+        text (str): Raw description.
+
+    Returns:
+        list: Non-empty sentences.
+    """
+    return [sentence for sentence in SENTENCE_BOUNDARY.split(text) if sentence.strip()]
+
+def sentence_key(sentence):
+    """
+    Fingerprint of a sentence: 64-bit hash of its normalized text.
+
+    Args:
+        sentence (str): Raw sentence.
+
+    Returns:
+        int: Fingerprint.
+    """
+    digest = hashlib.blake2b(normalize_text(sentence).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+class BoilerplateFingerprints:
+    """
+    Per-podcast counts of how many episodes contain each sentence.
+
+    Intro, outro and sponsor sentences that a show repeats in at least
+    `threshold` episodes are its boilerplate.
+    """
+
+    def __init__(self, threshold):
+        if threshold < 2:
+            raise ValueError(f"threshold must be at least 2, got {threshold}")
+        self.threshold = threshold
+        self.counts = defaultdict(Counter)  # podcast_id -> sentence key -> episodes
+        self._boilerplate = {}
+
+    def add(self, podcast_id, description):
+        """Count the distinct sentences of one episode description."""
+        self.counts[podcast_id].update({sentence_key(sentence) for sentence in split_sentences(description)})
+        self._boilerplate.pop(podcast_id, None)
+
+    def boilerplate(self, podcast_id):
+        """
+        Return the sentence keys a podcast repeats in at least `threshold` episodes.
+
+        Args:
+            podcast_id (str): The podcast ID.
+
+        Returns:
+            frozenset: Boilerplate sentence keys.
+        """
+        keys = self._boilerplate.get(podcast_id)
+        if keys is None:
+            keys = frozenset(
+                key for key, episodes in self.counts.get(podcast_id, {}).items()
+                if episodes >= self.threshold
+            )
+            self._boilerplate[podcast_id] = keys
+        return keys
+
+    def summary(self):
+        """
+        Return (podcasts with boilerplate, boilerplate sentences in total).
+        """
+        podcasts = [self.boilerplate(podcast_id) for podcast_id in self.counts]
+        return sum(1 for keys in podcasts if keys), sum(len(keys) for keys in podcasts)
+
+def strip_boilerplate(description, boilerplate_keys):
+    """
+    Remove boilerplate sentences from a description.
+
+    Args:
+        description (str): Raw description.
+        boilerplate_keys (frozenset): Sentence keys to remove.
+
+    Returns:
+        tuple: (description without boilerplate, list of (key, sentence) removed)
+    """
+    if not boilerplate_keys:
+        return description, []
+    kept, removed = [], []
+    for sentence in split_sentences(description):
+        key = sentence_key(sentence)
+        if key in boilerplate_keys:
+            removed.append((key, sentence))
+        else:
+            kept.append(sentence)
+    if not removed:
+        return description, removed
+    return " ".join(kept), removed
+
+def boilerplate_once_texts(removed_sentences):
+    """
+    Join each podcast's removed boilerplate sentences into one text, to be
+    cleaned and counted once per podcast in "once" mode.
+
+    Args:
+        removed_sentences (dict): podcast_id -> {key: sentence}
+
+    Returns:
+        dict: podcast_id -> text
+    """
+    return {
+        podcast_id: " ".join(sentences.values())
+        for podcast_id, sentences in removed_sentences.items()
+        if sentences
+    }
+
+def _distribution_change(before, after):
+    """Mean per-podcast L1 distance between normalized token distributions (0 = same, 2 = disjoint)."""
+    distances = []
+    for podcast_id, counts_before in before.items():
+        counts_after = after.get(podcast_id, Counter())
+        total_before, total_after = sum(counts_before.values()), sum(counts_after.values())
+        if not total_before or not total_after:
+            continue
+        words = set(counts_before) | set(counts_after)
+        distances.append(sum(
+            abs(counts_before[word] / total_before - counts_after[word] / total_after)
+            for word in words
+        ))
+    return sum(distances) / len(distances) if distances else 0.0
+
+def benchmark_boilerplate(rows, threshold=5, mode="drop"):
+    """
+    Clean sample episodes with and without the boilerplate pre-pass.
+
+    Reports the cleaning time saved and how the per-podcast token counts change.
+
+    Args:
+        rows (list): (podcast_id, description) tuples.
+        threshold (int): Minimum number of episodes repeating a sentence.
+        mode (str): "drop" or "once".
+
+    Returns:
+        dict: Timings and token statistics.
+    """
+    from clean_description import PodcastDescriptionCleaner, get_resources
+
+    if mode not in BOILERPLATE_MODES:
+        raise ValueError(f"mode must be one of {BOILERPLATE_MODES}, got {mode!r}")
+    cleaner = PodcastDescriptionCleaner()
+    classify_token = get_resources().classify_token
+
+    # Baseline: every description cleaned as is
+    classify_token.cache_clear()
+    start = time.perf_counter()
+    before = defaultdict(Counter)
+    for podcast_id, desc in rows:
+        before[podcast_id].update(cleaner.clean_description(desc))
+    baseline_time = time.perf_counter() - start
+
+    # Pre-pass, then clean descriptions without boilerplate
+    classify_token.cache_clear()
+    start = time.perf_counter()
+    fingerprints = BoilerplateFingerprints(threshold)
+    for podcast_id, desc in rows:
+        fingerprints.add(podcast_id, desc)
+    prepass_time = time.perf_counter() - start
+
+    after = defaultdict(Counter)
+    removed_sentences = defaultdict(dict)
+    characters = removed_characters = 0
+    for podcast_id, desc in rows:
+        stripped, removed = strip_boilerplate(desc, fingerprints.boilerplate(podcast_id))
+        characters += len(desc)
+        removed_characters += sum(len(sentence) for _, sentence in removed)
+        for key, sentence in removed:
+            removed_sentences[podcast_id].setdefault(key, sentence)
+        after[podcast_id].update(cleaner.clean_description(stripped))
+    if mode == "once":
+        for podcast_id, text in boilerplate_once_texts(removed_sentences).items():
+            after[podcast_id].update(cleaner.clean_description(text))
+    filtered_time = time.perf_counter() - start
+
+    tokens_before = sum(sum(counts.values()) for counts in before.values())
+    tokens_after = sum(sum(counts.values()) for counts in after.values())
+    total_before = sum(before.values(), Counter())
+    total_after = sum(after.values(), Counter())
+    largest_drops = sorted(total_before, key=lambda word: total_after[word] - total_before[word])[:10]
+    podcasts, sentences = fingerprints.summary()
+
+    result = {
+        "baseline_seconds": baseline_time,
+        "filtered_seconds": filtered_time,
+        "prepass_seconds": prepass_time,
+        "removed_characters": removed_characters / characters if characters else 0.0,
+        "tokens_before": tokens_before,
+        "tokens_after": tokens_after,
+        "distinct_before": len(total_before),
+        "distinct_after": len(+total_after),
+        "distribution_change": _distribution_change(before, after),
+    }
+    print(f"{len(rows)} episodes, {podcasts} podcasts with {sentences} boilerplate sentences "
+          f"(threshold {threshold}, mode {mode}), {result['removed_characters']:.1%} of characters removed")
+    print(f"  cleaning time: {baseline_time:.2f} s -> {filtered_time:.2f} s "
+          f"(pre-pass {prepass_time:.2f} s), saved {baseline_time - filtered_time:.2f} s")
+    print(f"  tokens: {tokens_before} -> {tokens_after}, distinct words: "
+          f"{result['distinct_before']} -> {result['distinct_after']}")
+    print(f"  mean per-podcast L1 change of the token distribution: {result['distribution_change']:.3f}")
+    print("  largest count drops: " + ", ".join(
+        f"{word} {total_before[word]}->{total_after[word]}" for word in largest_drops
+        if total_after[word] < total_before[word]
+    ))
+    return result
+
+if __name__ == "__main__":
+    from clean_description import ensure_nltk_data
+
+    parser = argparse.ArgumentParser(description="Measure the effect of removing repeated per-podcast sentences.")
+    parser.add_argument("--input-csv", default="benchmark_episodes.csv",
+                        help="Episode CSV with podcast_id and episode_description (see sample_corpus.py).")
+    parser.add_argument("--threshold", type=int, default=5, help="Episodes a sentence must appear in to be boilerplate.")
+    parser.add_argument("--mode", choices=BOILERPLATE_MODES, default="drop", help="Drop boilerplate or count it once per podcast.")
+    args = parser.parse_args()
+
+    ensure_nltk_data()
+    episodes = pd.read_csv(args.input_csv, usecols=["podcast_id", "episode_description"], dtype=object).dropna()
+    benchmark_boilerplate(
+        list(zip(episodes["podcast_id"], episodes["episode_description"])),
+        threshold=args.threshold,
+        mode=args.mode,
+    )
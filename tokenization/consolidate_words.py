@@ -1,122 +1,456 @@
 import os
 import time
+import argparse
 import pandas as pd
-from collections import defaultdict, Counter
+from collections import defaultdict, deque, Counter
 from tqdm import tqdm
-from multiprocessing import Pool, cpu_count, Manager
-from functools import partial
-from clean_description import PodcastDescriptionCleaner
+from multiprocessing import Pool, cpu_count
+from clean_description import CLEANER_VERSION, PodcastDescriptionCleaner, ensure_nltk_data
+from token_cache import TokenCountCache, description_key
+from episode_state import EpisodeState
+from stage_profiler import StageProfiler
+from boilerplate import BOILERPLATE_MODES, BoilerplateFingerprints, boilerplate_once_texts, strip_boilerplate
 
-def process_single_row(row, error_counter, desc_column='episode_description', podcast_id_column='podcast_id'):
+# Token counts of already cleaned descriptions, reused across runs
+DEFAULT_CACHE_PATH = "token_cache.sqlite"
+
+# Episodes that already contributed to podcast_tokens/, for incremental runs
+DEFAULT_STATE_PATH = "episode_state.sqlite"
+
+# One cleaner per worker process, built by init_worker
+_cleaner = None
+
+def init_worker(profile=False):
+    """
+    Pool initializer: load the NLTK resources once per worker process.
+
+    NLTK data must already be installed (ensure_nltk_data runs in the parent),
+    so workers never touch the network.
+
+    Args:
+        profile (bool): Record per-stage cleaning times in this worker
     """
-    Process a single row and return tokenized word counts.
-    
+    global _cleaner
+    _cleaner = PodcastDescriptionCleaner(profiler=StageProfiler() if profile else None)
+
+def read_description_batches(input_csv, batch_size=256, chunksize=20000,
+                             desc_column='episode_description', podcast_id_column='podcast_id',
+                             episode_id_column='episode_id'):
+    """
+    Stream (podcast_id, episode_id, description) batches from the episode CSV.
+
+    Only the three needed columns are parsed, chunksize rows at a time, so the
+    whole CSV is never held in memory. Rows with a missing ID or description
+    are skipped.
+
     Args:
-        row (pd.Series): DataFrame row to process
-        error_counter (multiprocessing.Value): Shared counter for errors
+        input_csv (str): Path to input CSV file
+        batch_size (int): Number of descriptions per batch
+        chunksize (int): Number of CSV rows parsed at a time
         desc_column (str): Column name for description
         podcast_id_column (str): Column name for podcast ID
-    
+        episode_id_column (str): Column name for episode ID
+
+    Yields:
+        list: Batch of (podcast_id, episode_id, description) tuples
+    """
+    reader = pd.read_csv(
+        input_csv,
+        usecols=[podcast_id_column, episode_id_column, desc_column],
+        dtype=object,
+        chunksize=chunksize,
+    )
+    for chunk in reader:
+        rows = [
+            (podcast_id, episode_id, desc)
+            for podcast_id, episode_id, desc in zip(
+                chunk[podcast_id_column], chunk[episode_id_column], chunk[desc_column]
+            )
+            if isinstance(desc, str) and isinstance(podcast_id, str) and isinstance(episode_id, str)
+        ]
+        for start in range(0, len(rows), batch_size):
+            yield rows[start:start + batch_size]
+
+def fingerprint_boilerplate(input_csv, threshold, chunksize=20000):
+    """
+    Pre-pass: count in how many episodes of its podcast each sentence appears.
+
+    Args:
+        input_csv (str): Path to input CSV file
+        threshold (int): Episodes a sentence must appear in to be boilerplate
+        chunksize (int): Number of CSV rows parsed at a time
+
+    Returns:
+        BoilerplateFingerprints: Per-podcast sentence counts
+    """
+    fingerprints = BoilerplateFingerprints(threshold)
+    episode_ids = set()
+    for batch in tqdm(read_description_batches(input_csv, batch_size=chunksize, chunksize=chunksize),
+                      desc="Fingerprinting Sentences", unit="batch"):
+        for podcast_id, episode_id, desc in batch:
+            if episode_id not in episode_ids:
+                episode_ids.add(episode_id)
+                fingerprints.add(podcast_id, desc)
+    return fingerprints
+
+def process_texts(items):
+    """
+    Tokenize a batch of distinct descriptions.
+
+    Args:
+        items (list): (description key, description) tuples
+
+    Returns:
+        tuple: (list of (key, dict of token counts), list of keys that failed,
+            stage profile of this batch or None when profiling is off)
+    """
+    if _cleaner is None:
+        init_worker()
+
+    results, failed = [], []
+    for key, desc in items:
+        try:
+            results.append((key, dict(Counter(_cleaner.clean_description(desc)))))
+        except Exception as error:
+            failed.append(key)
+            print(f"Error processing description {key}: {error}")
+    profile = _cleaner.profiler.snapshot(reset=True) if _cleaner.profiler else None
+    return results, failed, profile
+
+def load_word_counts(file_path):
+    """
+    Read a Word,Count CSV written by save_word_counts.
+
+    Args:
+        file_path (str): Path to a per-podcast token count file
+
+    Returns:
+        Counter: Word counts (empty if the file does not exist)
+    """
+    if not os.path.exists(file_path):
+        return Counter()
+    # Keep words such as "nan" or "null" as strings
+    df = pd.read_csv(file_path, dtype={"Word": object}, na_filter=False)
+    return Counter(dict(zip(df["Word"], df["Count"].astype(int))))
+
+def save_word_counts(podcast_word_counts, output_folder, merge_existing=False, state=None):
+    """
+    Write one Word,Count CSV per podcast, sorted by count in descending order.
+
+    Each file is written to a temporary name and then renamed, so an
+    interrupted run never leaves a truncated file behind. With a state store,
+    the rename goes through EpisodeState.commit_podcast, which marks the
+    podcast's pending episodes as counted together with it.
+
+    Args:
+        podcast_word_counts (dict): podcast_id -> Counter of words
+        output_folder (str): Folder to save token count files
+        merge_existing (bool): Add the counts to the podcast's existing file
+            instead of replacing it
+        state (EpisodeState, optional): Episode state of this run
+
+    Returns:
+        list: podcast_ids whose file could not be written
+    """
+    failed = []
+    for podcast_id, word_count in tqdm(podcast_word_counts.items(),
+                                       desc="Saving Podcast Word Counts",
+                                       unit="podcast"):
+        try:
+            file_path = os.path.join(output_folder, f"{podcast_id}.csv")
+            if merge_existing:
+                word_count = load_word_counts(file_path) + word_count
+
+            # Convert to DataFrame, most frequent words first
+            word_count_df = pd.DataFrame(word_count.most_common(), columns=["Word", "Count"])
+
+            # Save to CSV
+            temp_path = file_path + ".tmp"
+            word_count_df.to_csv(temp_path, index=False)
+            if state is not None:
+                state.commit_podcast(podcast_id, temp_path, file_path)
+            else:
+                os.replace(temp_path, file_path)
+
+        except Exception as e:
+            print(f"Error saving for podcast_id {podcast_id}: {e}")
+            failed.append(podcast_id)
+    return failed
+
+def dedup_report(occurrences):
+    """
+    Count episodes and distinct descriptions per podcast.
+
+    Args:
+        occurrences (dict): description key -> Counter of podcast_id -> episodes
+
     Returns:
-        tuple: (podcast_id, word_counts) or None if processing fails
-    """
-    try:
-        desc = row.get(desc_column)
-        podcast_id = row.get(podcast_id_column)
-        
-        # Skip rows with missing values
-        if not isinstance(desc, str) or not isinstance(podcast_id, str):
-            return None
-        
-        # Clean description and tokenize
-        tokens = PodcastDescriptionCleaner(desc).clean_description()
-        
-        return (podcast_id, Counter(tokens))
-    
-    except Exception as error:
-        with error_counter.get_lock():
-            error_counter.value += 1
-        print(f"Error processing row: {error}")
-        return None
-
-def parallel_process_podcast_descriptions(input_csv, output_folder, num_processes=None):
-    """
-    Parallelize podcast description processing.
-    
+        pd.DataFrame: podcast_id, episodes, distinct_descriptions and
+            dedup_ratio (episodes per distinct description), most duplicated first
+    """
+    episodes, distinct = Counter(), Counter()
+    for podcast_counts in occurrences.values():
+        for podcast_id, count in podcast_counts.items():
+            episodes[podcast_id] += count
+            distinct[podcast_id] += 1
+
+    report = pd.DataFrame({
+        "podcast_id": list(episodes),
+        "episodes": list(episodes.values()),
+        "distinct_descriptions": [distinct[podcast_id] for podcast_id in episodes],
+    })
+    report["dedup_ratio"] = report["episodes"] / report["distinct_descriptions"]
+    return report.sort_values(by="dedup_ratio", ascending=False, kind="stable")
+
+def parallel_process_podcast_descriptions(input_csv, output_folder, num_processes=None,
+                                          batch_size=256, chunksize=20000,
+                                          cache_path=DEFAULT_CACHE_PATH, report_path=None,
+                                          incremental=False, state_path=DEFAULT_STATE_PATH, profile=False,
+                                          boilerplate_threshold=None, boilerplate_mode="drop"):
+    """
+    Parallelize podcast description processing as a streaming map-reduce.
+
+    The CSV is read in chunks of the needed columns. Each description is keyed
+    by a hash of its whitespace-normalized text, and only distinct texts that
+    are not in the on-disk token cache are sent to workers, in batches. At
+    most a few batches per worker are in flight, so memory stays bounded
+    regardless of the CSV size. Per-podcast totals are then built from the
+    cached counts of each distinct text times its number of episodes.
+
+    Every episode_id that contributes counts is recorded in the episode state
+    store. A full run resets the store and rewrites podcast_tokens/; an
+    incremental run skips recorded episodes and adds the counts of the new
+    ones to the existing per-podcast files, so it costs O(new episodes).
+    Either way an episode_id is counted once, even if the CSV repeats it.
+    A podcast's episodes are recorded in the same step that moves its file
+    into place, so a failed write or a crash never loses or double counts
+    them; an incremental run refuses to start after an unfinished full run.
+
+    With a boilerplate threshold, a pre-pass over the CSV fingerprints the
+    sentences of each podcast's episodes. Sentences repeated in at least that
+    many episodes (intros, outros, sponsor reads) are removed before cleaning;
+    in "once" mode they are cleaned and counted once per podcast instead of
+    once per episode.
+
     Args:
         input_csv (str): Path to input CSV file
         output_folder (str): Folder to save token count files
         num_processes (int, optional): Number of processes to use. Defaults to CPU count.
+        batch_size (int): Number of distinct descriptions sent to a worker at a time
+        chunksize (int): Number of CSV rows parsed at a time
+        cache_path (str): SQLite token cache; ":memory:" keeps it for this run only
+        report_path (str, optional): CSV to write the per-podcast dedup report to
+        incremental (bool): Only process episodes missing from the state store
+        state_path (str): SQLite store of the episodes already counted
+        profile (bool): Time each cleaning stage in the workers and print the
+            aggregated report at the end
+        boilerplate_threshold (int, optional): Episodes a sentence must appear
+            in to be treated as boilerplate. Defaults to no boilerplate pass.
+        boilerplate_mode (str): "drop" removes boilerplate sentences, "once"
+            counts them once per podcast
     """
+    if boilerplate_mode not in BOILERPLATE_MODES:
+        raise ValueError(f"boilerplate_mode must be one of {BOILERPLATE_MODES}, got {boilerplate_mode!r}")
+    if boilerplate_threshold is not None and boilerplate_mode == "once" and incremental:
+        # Each incremental run would add the podcast's boilerplate once more
+        raise ValueError("boilerplate_mode='once' requires a full run, not an incremental one")
+
     # Set default to number of CPU cores if not specified
     if num_processes is None:
         num_processes = cpu_count()
-    
+
+    # Fetch any missing NLTK data once, before the workers start
+    ensure_nltk_data()
+
     # Ensure the podcast_tokens folder exists
     os.makedirs(output_folder, exist_ok=True)
-    
-    # Load your data
-    df = pd.read_csv(input_csv, low_memory=False)
-    
+
     # Start timing
     start_time = time.time()
-    
-    # Use multiprocessing Manager for shared error counter
-    with Manager() as manager:
-        error_counter = manager.Value('i', 0)  # Shared error counter
-
-        # Use multiprocessing to process rows
-        print(f"Processing with {num_processes} processes...")
-        with Pool(processes=num_processes) as pool:
-            # Partial function to include error_counter
-            partial_process_row = partial(process_single_row, error_counter=error_counter)
-            
-            # Use tqdm to show progress
-            results = list(tqdm(
-                pool.imap(partial_process_row, [row for _, row in df.iterrows()]), 
-                total=len(df), 
-                desc="Processing Podcast Descriptions", 
-                unit="row", 
-                bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}]"
-            ))
-
-        # Remove None values (failed rows)
-        results = [r for r in results if r is not None]
-        
-        # Combine results
-        podcast_word_counts = defaultdict(Counter)
-        for podcast_id, word_count in results:
-            podcast_word_counts[podcast_id].update(word_count)
-        
-        # Save the word counts for each podcast to a CSV file
-        print("\nSaving word count files...")
-        for podcast_id, word_count in tqdm(podcast_word_counts.items(), 
-                                            desc="Saving Podcast Word Counts", 
-                                            unit="podcast"):
-            try:
-                # Convert to DataFrame and sort by count in descending order
-                word_count_df = pd.DataFrame(list(word_count.items()), columns=["Word", "Count"])
-                word_count_df = word_count_df.sort_values(by="Count", ascending=False)
-                
-                # Save to CSV
-                file_path = os.path.join(output_folder, f"{podcast_id}.csv")
-                word_count_df.to_csv(file_path, index=False)
-            
-            except Exception as e:
-                print(f"Error saving for podcast_id {podcast_id}: {e}")
-        
-        # Print total processing time and error count
-        total_time = time.time() - start_time
-        print(f"\nTotal processing time: {total_time:.2f} seconds")
-        print(f"Processed {len(results)} podcast descriptions")
-        print(f"Total errors encountered: {error_counter.value}")
+
+    fingerprints = None
+    if boilerplate_threshold is not None:
+        prepass_start = time.time()
+        fingerprints = fingerprint_boilerplate(input_csv, boilerplate_threshold, chunksize=chunksize)
+        prepass_time = time.time() - prepass_start
+    removed_sentences = defaultdict(dict)  # podcast_id -> boilerplate key -> sentence
+    characters = removed_characters = 0
+
+    cache = TokenCountCache(cache_path, CLEANER_VERSION)
+    state = EpisodeState(state_path)
+    if incremental and state.rebuild_incomplete():
+        state.close()
+        raise ValueError(f"The last full run did not write every podcast file; run without incremental to rebuild {state_path}")
+    if incremental:
+        print(f"Incremental run: skipping {sum(state.podcast_episode_counts().values())} episodes already counted")
+    else:
+        state.reset()
+    occurrences = defaultdict(Counter)  # description key -> podcast_id -> episodes
+    failed = set()
+    rows = skipped = cleaned = 0
+    max_pending = 4 * num_processes
+    profiler = StageProfiler() if profile else None
+
+    print(f"Processing with {num_processes} processes...")
+    progress = tqdm(desc="Processing Podcast Descriptions", unit="row")
+
+    def store(result):
+        nonlocal cleaned
+        results, failed_keys, worker_profile = result
+        if profiler is not None and worker_profile:
+            profiler.merge(worker_profile)
+        cache.put_many(results)
+        failed.update(failed_keys)
+        cleaned += len(results) + len(failed_keys)
+
+    with Pool(processes=num_processes, initializer=init_worker, initargs=(profile,)) as pool:
+        # Pool.imap would read the whole CSV ahead into its task queue;
+        # bound the number of batches in flight instead
+        pending = deque()
+        to_clean = []
+
+        def submit(items):
+            pending.append(pool.apply_async(process_texts, (items,)))
+            if len(pending) >= max_pending:
+                store(pending.popleft().get())
+
+        for batch in read_description_batches(input_csv, batch_size=batch_size, chunksize=chunksize):
+            # Drop episodes counted earlier in this run or, when incremental, in a previous one
+            seen = state.seen(episode_id for _, episode_id, _ in batch)
+            new_texts, new_episodes = {}, []
+            for podcast_id, episode_id, desc in batch:
+                if episode_id in seen:
+                    skipped += 1
+                    continue
+                seen.add(episode_id)
+                if fingerprints is not None:
+                    characters += len(desc)
+                    desc, removed = strip_boilerplate(desc, fingerprints.boilerplate(podcast_id))
+                    for removed_key, sentence in removed:
+                        removed_characters += len(sentence)
+                        removed_sentences[podcast_id].setdefault(removed_key, sentence)
+                key = description_key(desc)
+                if key not in occurrences:
+                    new_texts[key] = desc
+                occurrences[key][podcast_id] += 1
+                new_episodes.append((episode_id, podcast_id, key))
+            state.add(new_episodes)
+            rows += len(new_episodes)
+            progress.update(len(batch))
+
+            # Skip texts cleaned in this run or a previous one
+            cached = cache.contains(new_texts)
+            to_clean.extend((key, desc) for key, desc in new_texts.items() if key not in cached)
+            while len(to_clean) >= batch_size:
+                submit(to_clean[:batch_size])
+                to_clean = to_clean[batch_size:]
+
+        # "once" mode: one extra text per podcast holding its boilerplate sentences
+        boilerplate_occurrences = defaultdict(Counter)
+        if fingerprints is not None and boilerplate_mode == "once":
+            once_texts = {}
+            for podcast_id, text in boilerplate_once_texts(removed_sentences).items():
+                key = description_key(text)
+                boilerplate_occurrences[key][podcast_id] += 1
+                if key not in occurrences:
+                    once_texts[key] = text
+            cached = cache.contains(once_texts)
+            to_clean.extend((key, text) for key, text in once_texts.items() if key not in cached)
+            for start in range(0, len(to_clean), batch_size):
+                submit(to_clean[start:start + batch_size])
+            to_clean = []
+        if to_clean:
+            submit(to_clean)
+        while pending:
+            store(pending.popleft().get())
+    progress.close()
+
+    # Multiply the counts of each distinct text by its episodes per podcast
+    podcast_word_counts = defaultdict(Counter)
+    keys = (set(occurrences) | set(boilerplate_occurrences)) - failed
+    for key, word_count in cache.get_many(keys):
+        for episodes_per_podcast in (occurrences.get(key, {}), boilerplate_occurrences.get(key, {})):
+            for podcast_id, episodes in episodes_per_podcast.items():
+                podcast_counts = podcast_word_counts[podcast_id]
+                for word, count in word_count.items():
+                    podcast_counts[word] += count * episodes
+    cache.close()
+    errors = sum(sum(occurrences[key].values()) for key in failed)
+
+    # Save the word counts for each podcast to a CSV file
+    print("\nSaving word count files...")
+    # Episodes whose description failed are retried next time
+    state.forget_descriptions(failed)
+    # Each podcast's episodes are checkpointed together with its file
+    save_failed = save_word_counts(podcast_word_counts, output_folder, merge_existing=incremental, state=state)
+    for podcast_id in state.pending_podcasts() - set(podcast_word_counts):
+        # Podcasts whose new episodes had no words: nothing to write
+        state.commit_podcast(podcast_id)
+    # Episodes of podcasts whose file failed are counted again next time
+    state.discard_pending()
+    if save_failed:
+        print(f"Could not save {len(save_failed)} podcasts; their episodes will be counted again: {', '.join(save_failed)}")
+    elif not incremental:
+        state.finish_rebuild()
+    state.close()
+
+    # Report how much cleaning the dedup saved
+    report = dedup_report(occurrences)
+    if report_path:
+        report.to_csv(report_path, index=False)
+        print(f"Saved per-podcast dedup report to {report_path}")
+    print("\nMost duplicated podcasts (episodes per distinct description):")
+    print(report.head(10).to_string(index=False))
+
+    # Print total processing time and error count
+    total_time = time.time() - start_time
+    print(f"\nTotal processing time: {total_time:.2f} seconds")
+    print(f"Skipped {skipped} episodes already counted")
+    print(f"Processed {rows} podcast descriptions, {len(occurrences)} distinct "
+          f"(dedup ratio {rows / max(len(occurrences), 1):.2f}), {cleaned} cleaned, "
+          f"{len(occurrences) - cleaned} from cache")
+    print(f"Total errors encountered: {errors}")
+    if fingerprints is not None:
+        podcasts, sentences = fingerprints.summary()
+        print(f"Boilerplate ({boilerplate_mode}, threshold {boilerplate_threshold}): {sentences} sentences "
+              f"in {podcasts} podcasts, {removed_characters / max(characters, 1):.1%} of description "
+              f"characters removed before cleaning; pre-pass took {prepass_time:.2f} seconds")
+    if profiler is not None:
+        print()
+        print(profiler.report(f"Cleaning stages summed over {num_processes} workers ({cleaned} descriptions)"))
 
 # Main execution
 if __name__ == "__main__":
-    input_csv = "combined_episodes.csv"
-    output_folder = "podcast_tokens"
-    
-    # You can specify the number of processes if desired
-    # parallel_process_podcast_descriptions(input_csv, output_folder, num_processes=8)
-    parallel_process_podcast_descriptions(input_csv, output_folder)
+    parser = argparse.ArgumentParser(description="Tokenize episode descriptions into per-podcast word counts.")
+    parser.add_argument("--input-csv", default="combined_episodes.csv", help="CSV with podcast_id and episode_description columns.")
+    parser.add_argument("--output-folder", default="podcast_tokens", help="Folder for the <podcast_id>.csv word counts.")
+    parser.add_argument("--processes", type=int, default=None, help="Number of worker processes (default: CPU count).")
+    parser.add_argument("--batch-size", type=int, default=256, help="Distinct descriptions sent to a worker at a time.")
+    parser.add_argument("--chunksize", type=int, default=20000, help="CSV rows parsed at a time.")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH, help="SQLite token cache (':memory:' to disable persistence).")
+    parser.add_argument("--dedup-report", default=None, help="CSV path for the per-podcast dedup report.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only tokenize episodes not yet counted and merge them into the existing files.")
+    parser.add_argument("--state", default=DEFAULT_STATE_PATH, help="SQLite store of the episode IDs already counted.")
+    parser.add_argument("--profile", action="store_true", help="Report time and calls per cleaning stage at the end.")
+    parser.add_argument("--boilerplate-threshold", type=int, default=None,
+                        help="Treat sentences repeated in at least this many episodes of a podcast as boilerplate.")
+    parser.add_argument("--boilerplate-mode", choices=BOILERPLATE_MODES, default="drop",
+                        help="Drop boilerplate sentences or count them once per podcast.")
+    args = parser.parse_args()
+
+    parallel_process_podcast_descriptions(
+        args.input_csv,
+        args.output_folder,
+        num_processes=args.processes,
+        batch_size=args.batch_size,
+        chunksize=args.chunksize,
+        cache_path=args.cache,
+        report_path=args.dedup_report,
+        incremental=args.incremental,
+        state_path=args.state,
+        profile=args.profile,
+        boilerplate_threshold=args.boilerplate_threshold,
+        boilerplate_mode=args.boilerplate_mode,
+    )
     print("Completed token aggregation and sorting for all podcasts.")
@@ -0,0 +1,175 @@
+import os
+import sqlite3
+
+class EpisodeState:
+    """
+    SQLite checkpoint of the episodes that already contributed word counts.
+
+    Episodes found during a run are staged in pending_episodes. Once a
+    podcast's word count file is written, commit_podcast moves that
+    podcast's pending episodes to seen_episodes in the same transaction that
+    journals the file's rename, and only then renames the file into place.
+    If the process dies between the commit and the rename, the next
+    EpisodeState finishes the journaled rename, so a podcast's file and its
+    counted episodes never disagree: an incremental re-run can neither lose
+    episodes nor merge them into a file twice. Pending episodes left over
+    from an interrupted run are discarded, so they are counted again.
+    """
+
+    def __init__(self, path, batch_size=500):
+        self.path = path
+        self.batch_size = batch_size
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(
+            "CREATE TABLE IF NOT EXISTS seen_episodes ("
+            " episode_id TEXT PRIMARY KEY,"
+            " podcast_id TEXT NOT NULL,"
+            " description_key TEXT NOT NULL"
+            ") WITHOUT ROWID;"
+            "CREATE TABLE IF NOT EXISTS pending_episodes ("
+            " episode_id TEXT PRIMARY KEY,"
+            " podcast_id TEXT NOT NULL,"
+            " description_key TEXT NOT NULL"
+            ") WITHOUT ROWID;"
+            "CREATE INDEX IF NOT EXISTS pending_by_description ON pending_episodes (description_key);"
+            "CREATE INDEX IF NOT EXISTS pending_by_podcast ON pending_episodes (podcast_id);"
+            "CREATE TABLE IF NOT EXISTS pending_renames ("
+            " temp_path TEXT PRIMARY KEY,"
+            " file_path TEXT NOT NULL"
+            ");"
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);"
+        )
+        self._recover()
+
+    def _recover(self):
+        """Finish renames journaled by an interrupted run and drop its pending episodes."""
+        for temp_path, file_path in self.connection.execute("SELECT temp_path, file_path FROM pending_renames").fetchall():
+            if os.path.exists(temp_path):
+                os.replace(temp_path, file_path)
+        self.connection.execute("DELETE FROM pending_renames")
+        self.connection.execute("DELETE FROM pending_episodes")
+        self.connection.commit()
+
+    def reset(self):
+        """
+        Forget every episode (for a full rebuild) and mark the rebuild as
+        unfinished until finish_rebuild(); committed at once.
+        """
+        self.connection.execute("DELETE FROM seen_episodes")
+        self.connection.execute("INSERT OR REPLACE INTO meta VALUES ('rebuild_incomplete', '1')")
+        self.connection.commit()
+
+    def finish_rebuild(self):
+        """Record that every podcast file of the full rebuild was written."""
+        self.connection.execute("DELETE FROM meta WHERE key = 'rebuild_incomplete'")
+        self.connection.commit()
+
+    def rebuild_incomplete(self):
+        """Whether the last full rebuild stopped before writing every file."""
+        return self.connection.execute("SELECT 1 FROM meta WHERE key = 'rebuild_incomplete'").fetchone() is not None
+
+    def seen(self, episode_ids):
+        """
+        Return the subset of episode IDs already counted or pending in this run.
+
+        Args:
+            episode_ids (iterable): Episode IDs.
+
+        Returns:
+            set: Recorded episode IDs.
+        """
+        episode_ids = list(episode_ids)
+        found = set()
+        for start in range(0, len(episode_ids), self.batch_size):
+            chunk = episode_ids[start:start + self.batch_size]
+            placeholders = ",".join("?" * len(chunk))
+            for table in ("seen_episodes", "pending_episodes"):
+                found.update(
+                    episode_id for (episode_id,) in self.connection.execute(
+                        f"SELECT episode_id FROM {table} WHERE episode_id IN ({placeholders})",
+                        chunk,
+                    )
+                )
+        return found
+
+    def add(self, episodes):
+        """
+        Stage episodes of this run (counted once their podcast is committed).
+
+        Args:
+            episodes (iterable): (episode_id, podcast_id, description key) tuples.
+        """
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO pending_episodes (episode_id, podcast_id, description_key) VALUES (?, ?, ?)",
+            episodes,
+        )
+
+    def forget_descriptions(self, keys):
+        """
+        Drop this run's pending episodes whose description failed to clean,
+        so a later run retries them. Episodes counted by earlier runs are kept.
+
+        Args:
+            keys (iterable): Description keys.
+        """
+        self.connection.executemany(
+            "DELETE FROM pending_episodes WHERE description_key = ?",
+            [(key,) for key in keys],
+        )
+
+    def pending_podcasts(self):
+        """
+        Return the podcasts with pending episodes.
+
+        Returns:
+            set: Podcast IDs.
+        """
+        return {podcast_id for (podcast_id,) in self.connection.execute(
+            "SELECT DISTINCT podcast_id FROM pending_episodes"
+        )}
+
+    def commit_podcast(self, podcast_id, temp_path=None, file_path=None):
+        """
+        Mark a podcast's pending episodes as counted and move its new word
+        count file into place.
+
+        The episodes and the rename are committed in one transaction before
+        the rename happens; an interrupted rename is finished on the next
+        start (see _recover).
+
+        Args:
+            podcast_id (str): The podcast ID.
+            temp_path (str, optional): Fully written word count file.
+            file_path (str, optional): Final path of that file.
+        """
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO seen_episodes SELECT * FROM pending_episodes WHERE podcast_id = ?",
+                (podcast_id,),
+            )
+            self.connection.execute("DELETE FROM pending_episodes WHERE podcast_id = ?", (podcast_id,))
+            if temp_path is not None:
+                self.connection.execute("INSERT OR REPLACE INTO pending_renames VALUES (?, ?)", (temp_path, file_path))
+        if temp_path is not None:
+            os.replace(temp_path, file_path)
+            with self.connection:
+                self.connection.execute("DELETE FROM pending_renames WHERE temp_path = ?", (temp_path,))
+
+    def discard_pending(self):
+        """Drop the episodes of podcasts that were not committed (retried next run)."""
+        self.connection.execute("DELETE FROM pending_episodes")
+        self.connection.commit()
+
+    def podcast_episode_counts(self):
+        """
+        Return the number of counted episodes per podcast.
+
+        Returns:
+            dict: podcast_id -> number of episodes.
+        """
+        return dict(self.connection.execute(
+            "SELECT podcast_id, COUNT(*) FROM seen_episodes GROUP BY podcast_id"
+        ))
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,251 @@
+import os
+import re
+import json
+import time
+import hashlib
+import argparse
+import contractions
+import nltk
+from nltk.corpus import stopwords, wordnet, words
+from nltk.tokenize import sent_tokenize, word_tokenize
+from clean_description import FULL_WORDNET_LEMMAS, PodcastDescriptionCleaner, ensure_nltk_data
+from sample_corpus import load_descriptions
+
+# Expected clean tokens of sampled episode descriptions, built with legacy_candidate_tokens
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden_tokens.jsonl")
+
+# Least size of each full NLTK corpus: (description, minimum). The published
+# packages have ~147k WordNet lemma names, ~236k words, 179+ English
+# stopwords and tens of thousands of punkt orthographic-context entries;
+# partial installs are far below these.
+FULL_CORPUS_SIZES = {
+    "wordnet": ("WordNet lemma names", FULL_WORDNET_LEMMAS),
+    "words": ("entries in the words corpus", 200000),
+    "stopwords": ("English stopwords", 150),
+    "punkt_tab": ("punkt_tab English orthographic-context entries", 1000),
+}
+
+def legacy_candidate_tokens(cleaner, text):
+    """
+    Previous multi-pass version of PodcastDescriptionCleaner._candidate_tokens.
+
+    Each sentence is word-tokenized three times and the kept text once more.
+
+    Args:
+        cleaner (PodcastDescriptionCleaner): Cleaner whose resources are used.
+        text (str): Raw description text.
+
+    Returns:
+        list: Raw tokens, before validation.
+    """
+    # Expand contractions
+    expanded_text = contractions.fix(text)
+
+    # Normalize text
+    normalized_text = cleaner._normalize_text(expanded_text)
+
+    # Tokenize sentences
+    sentences = sent_tokenize(normalized_text)
+
+    # Advanced sentence filtering
+    cleaned_sentences = [
+        sentence for sentence in sentences
+        if (
+            # Remove sentences with URLs
+            not re.search(r'https?://\S+|www\.\S+', sentence) and
+            # Remove sentences with high promotional density
+            cleaner._detect_promotional_density(sentence) < 40 and
+            # Remove sentences dominated by promotional keywords
+            cleaner.promo_matcher.count([
+                word.lower() for word in word_tokenize(sentence)
+            ]) < len(word_tokenize(sentence)) * 0.5
+        )
+    ]
+
+    # Rejoin cleaned sentences
+    cleaned_text = ' '.join(cleaned_sentences)
+
+    # Remove special characters except basic punctuation
+    cleaned_text = re.sub(r'[^\w\s.,!?]', '', cleaned_text)
+
+    # Tokenize
+    return word_tokenize(cleaned_text)
+
+def incomplete_nltk_corpora():
+    """
+    List the cleaner's NLTK corpora that are not the full published packages.
+
+    A golden corpus built or checked with partial data keeps a handful of
+    words and cannot tell two tokenizations apart.
+
+    Returns:
+        list: One message per incomplete corpus, empty when all are complete.
+    """
+    with open(nltk.data.find("tokenizers/punkt_tab/english/ortho_context.tab"), encoding="utf-8") as file:
+        ortho_context = sum(1 for _ in file)
+    sizes = {
+        "wordnet": sum(1 for _ in wordnet.all_lemma_names()),
+        "words": len(words.words()),
+        "stopwords": len(stopwords.words("english")),
+        "punkt_tab": ortho_context,
+    }
+    return [
+        f"{name}: {sizes[name]} {description}, expected at least {minimum}"
+        for name, (description, minimum) in FULL_CORPUS_SIZES.items()
+        if sizes[name] < minimum
+    ]
+
+def nltk_data_fingerprint():
+    """
+    Identify the NLTK release and data the clean tokens depend on.
+
+    Returns:
+        str: Hex digest over the NLTK version and every file of the cleaner's data packages.
+    """
+    hasher = hashlib.sha256(nltk.__version__.encode("utf-8"))
+    for resource in ("tokenizers/punkt_tab/english", "corpora/stopwords/english", "corpora/words", "corpora/wordnet"):
+        root = str(nltk.data.find(resource))
+        if not os.path.exists(root):
+            # Data read straight from a zip archive
+            hasher.update(root.encode("utf-8"))
+            continue
+        paths = [root] if os.path.isfile(root) else sorted(
+            os.path.join(folder, name) for folder, _, names in os.walk(root) for name in names
+        )
+        for path in paths:
+            hasher.update(os.path.relpath(path, root).encode("utf-8"))
+            with open(path, "rb") as file:
+                hasher.update(file.read())
+    return hasher.hexdigest()
+
+def build_golden(texts, cleaner):
+    """
+    Clean descriptions with the previous multi-pass tokenization.
+
+    Args:
+        texts (list): Description strings.
+        cleaner (PodcastDescriptionCleaner): Cleaner whose resources are used.
+
+    Returns:
+        list: One list of clean tokens per description.
+    """
+    return [
+        [token for token in legacy_candidate_tokens(cleaner, text) if cleaner._is_valid_token(token)]
+        for text in texts
+    ]
+
+def load_golden(golden_path):
+    """
+    Read a golden corpus written by save_golden.
+
+    Args:
+        golden_path (str): Path to the JSON Lines golden file.
+
+    Returns:
+        tuple: (texts, expected tokens, NLTK data fingerprint or None).
+    """
+    texts, expected, fingerprint = [], [], None
+    with open(golden_path, "r", encoding="utf-8") as file:
+        for line in file:
+            record = json.loads(line)
+            if "nltk_data" in record:
+                fingerprint = record["nltk_data"]
+                continue
+            texts.append(record["description"])
+            expected.append(record["tokens"])
+    return texts, expected, fingerprint
+
+def save_golden(golden_path, texts, expected):
+    """
+    Write descriptions and their expected tokens as JSON Lines.
+
+    The first line records the NLTK data fingerprint the tokens were built
+    with, since the sentence splitter, stopwords, word list and lemmatizer
+    all decide which tokens are kept.
+
+    Args:
+        golden_path (str): Output path.
+        texts (list): Description strings.
+        expected (list): One list of clean tokens per description.
+    """
+    with open(golden_path, "w", encoding="utf-8") as file:
+        file.write(json.dumps({"nltk_data": nltk_data_fingerprint()}) + "\n")
+        for text, tokens in zip(texts, expected):
+            file.write(json.dumps({"description": text, "tokens": tokens}) + "\n")
+
+def check_against_golden(texts, expected, cleaner):
+    """
+    Compare the current cleaner with the expected tokens.
+
+    Args:
+        texts (list): Description strings.
+        expected (list): One list of clean tokens per description.
+        cleaner (PodcastDescriptionCleaner): The cleaner under test.
+
+    Returns:
+        int: Number of descriptions whose tokens differ.
+    """
+    start = time.time()
+    actual = cleaner.clean_many(texts)
+    elapsed = time.time() - start
+
+    mismatches = 0
+    for index, (text, want, got) in enumerate(zip(texts, expected, actual)):
+        if want != got:
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"Mismatch in description {index}: {text[:80]!r}")
+                print(f"  expected: {want}")
+                print(f"  got:      {got}")
+
+    print(f"Cleaned {len(texts)} descriptions in {elapsed:.2f} seconds")
+    print(f"{len(texts) - mismatches} identical, {mismatches} different")
+    return mismatches
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the description cleaner against a golden corpus.")
+    parser.add_argument("--input-csv", default="combined_episodes.csv", help="Episode CSV with an episode_description column.")
+    parser.add_argument("--sample-size", type=int, default=5000, help="Number of descriptions to sample.")
+    parser.add_argument("--golden", default=GOLDEN_PATH,
+                        help="JSON Lines golden file. Written from the previous tokenization if missing, "
+                             "otherwise used as the expected output (default: golden_tokens.jsonl).")
+    parser.add_argument("--write-golden", action="store_true",
+                        help="Rebuild the golden file from --input-csv with the previous tokenization.")
+    args = parser.parse_args()
+
+    ensure_nltk_data()
+    incomplete = incomplete_nltk_corpora()
+    if incomplete:
+        raise SystemExit("The golden check needs the full NLTK corpora; found partial data:\n  "
+                         + "\n  ".join(incomplete))
+    cleaner = PodcastDescriptionCleaner()
+
+    golden = None
+    if os.path.exists(args.golden) and not args.write_golden:
+        golden = load_golden(args.golden)
+        if golden[2] != nltk_data_fingerprint():
+            # Other NLTK data keep other tokens; compare with the previous tokenization directly
+            print(f"{args.golden} was built with different NLTK data; checking {len(golden[0])} of its "
+                  f"descriptions against the previous tokenization instead")
+            golden = (golden[0], None, None)
+
+    if golden is not None and golden[1] is not None:
+        texts, expected, _ = golden
+        print(f"Loaded {len(texts)} golden descriptions from {args.golden}")
+    else:
+        if golden is not None:
+            texts = golden[0]
+        elif os.path.exists(args.input_csv):
+            texts = load_descriptions(args.input_csv, sample_size=args.sample_size)
+        else:
+            # Podcast descriptions are not what the cleaner runs on in the pipeline
+            raise SystemExit(f"{args.input_csv} not found; the golden corpus is built from episode descriptions")
+        start = time.time()
+        expected = build_golden(texts, cleaner)
+        print(f"Previous tokenization: {len(texts)} descriptions in {time.time() - start:.2f} seconds")
+        if golden is None:
+            save_golden(args.golden, texts, expected)
+            print(f"Wrote golden corpus to {args.golden}")
+
+    if check_against_golden(texts, expected, cleaner):
+        raise SystemExit(1)
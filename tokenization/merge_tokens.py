@@ -1,32 +1,34 @@
-
 import os
+import sys
+import argparse
 import pandas as pd
 
 # Define the parent directory and the podcast_tokens directory
 parent_directory = os.path.dirname(os.path.abspath(__file__))
 podcast_tokens_directory = os.path.join(parent_directory, "../podcast_tokens/")
+token_store_directory = os.path.join(parent_directory, "../podcast_token_store")
 
-# Initialize an empty list to store DataFrames
-dfs = []
+# The token store lives with the models that read it
+sys.path.append(os.path.join(parent_directory, "../models"))
+from token_store import build_token_store
 
-# Iterate through each file in the podcast_tokens directory
-for filename in os.listdir(podcast_tokens_directory):
-    if filename.endswith(".csv"):
-        file_path = os.path.join(podcast_tokens_directory, filename)
-        # Extract the podcast_id from the filename
-        podcast_id = filename.replace(".csv", "")
-        # Read the CSV file
-        df = pd.read_csv(file_path)
-        # Add a new column for podcast_id
-        df['podcast_id'] = podcast_id
-        # Append the DataFrame to the list
-        dfs.append(df)
+parser = argparse.ArgumentParser(description="Merge per-podcast token counts into the dictionary-encoded token store.")
+parser.add_argument("--csv", action="store_true", help="Also write merged_podcast_tokens.csv (Word, Count, podcast_id).")
+args = parser.parse_args()
 
-# Concatenate all DataFrames
-merged_df = pd.concat(dfs, ignore_index=True)
+# Encode every podcast's Word,Count file into one vocabulary plus int32 columns
+store = build_token_store(podcast_tokens_directory, token_store_directory)
+print(f"Stored {len(store.count)} rows for {len(store)} podcasts and {len(store.vocab)} words in {os.path.normpath(token_store_directory)}")
 
-# Save the merged DataFrame to a new CSV file
-output_file = os.path.join(parent_directory, "merged_podcast_tokens.csv")
-merged_df.to_csv(output_file, index=False)
+if args.csv:
+    # Flat CSV with the words and podcast IDs repeated on every row
+    merged_df = pd.DataFrame({
+        "Word": store.vocab[store.token_idx],
+        "Count": store.count,
+        "podcast_id": store.podcast_ids[store.podcast_idx],
+    })
 
-print(f"Merged file saved to: {output_file}")
+    # Save the merged DataFrame to a new CSV file
+    output_file = os.path.join(parent_directory, "merged_podcast_tokens.csv")
+    merged_df.to_csv(output_file, index=False)
+    print(f"Saved {output_file}")
@@ -0,0 +1,80 @@
+import os
+import argparse
+import pandas as pd
+
+# Podcast-level descriptions shipped with the repo, used when the episode CSV is absent
+TOKENIZATION_DIR = os.path.dirname(os.path.abspath(__file__))
+FALLBACK_CSV = os.path.normpath(os.path.join(TOKENIZATION_DIR, "..", "data", "podcast_details_english.csv"))
+
+def load_descriptions(input_csv="combined_episodes.csv", sample_size=None, seed=0,
+                      desc_column="episode_description"):
+    """
+    Load a reproducible sample of descriptions for benchmarks and checks.
+
+    Reads episode descriptions from the combined episode CSV. When that file
+    does not exist, falls back to the podcast descriptions in
+    data/podcast_details_english.csv.
+
+    Args:
+        input_csv (str): Path to the combined episode CSV.
+        sample_size (int, optional): Number of descriptions to sample. Defaults to all.
+        seed (int): Random seed of the sample.
+        desc_column (str): Column name for description in input_csv.
+
+    Returns:
+        list: Description strings.
+    """
+    if os.path.exists(input_csv):
+        source, column = input_csv, desc_column
+    else:
+        source, column = FALLBACK_CSV, "podcast_description"
+        print(f"{input_csv} not found, sampling podcast descriptions from {source}")
+
+    descriptions = pd.read_csv(source, usecols=[column])[column]
+    descriptions = descriptions[descriptions.map(lambda desc: isinstance(desc, str))]
+    if sample_size is not None and sample_size < len(descriptions):
+        descriptions = descriptions.sample(sample_size, random_state=seed)
+    return descriptions.tolist()
+
+def write_sample_corpus(output_csv, input_csv="combined_episodes.csv", sample_size=5000, seed=0):
+    """
+    Write a benchmark corpus of sampled episodes in the combined episode CSV layout.
+
+    The output has podcast_id, episode_id and episode_description columns, so
+    it can be passed to consolidate_words.py --input-csv (e.g. with --profile).
+    Without the episode CSV, each podcast description becomes one episode
+    whose episode_id is the podcast ID.
+
+    Args:
+        output_csv (str): Path of the corpus to write.
+        input_csv (str): Path to the combined episode CSV.
+        sample_size (int): Number of episodes to sample.
+        seed (int): Random seed of the sample.
+
+    Returns:
+        int: Number of episodes written.
+    """
+    if os.path.exists(input_csv):
+        corpus = pd.read_csv(input_csv, usecols=["podcast_id", "episode_id", "episode_description"], dtype=object)
+    else:
+        print(f"{input_csv} not found, sampling podcast descriptions from {FALLBACK_CSV}")
+        corpus = pd.read_csv(FALLBACK_CSV, usecols=["podcast_id", "podcast_description"], dtype=object)
+        corpus = corpus.rename(columns={"podcast_description": "episode_description"})
+        corpus["episode_id"] = corpus["podcast_id"]
+
+    corpus = corpus.dropna()
+    if sample_size < len(corpus):
+        corpus = corpus.sample(sample_size, random_state=seed)
+    corpus[["podcast_id", "episode_id", "episode_description"]].to_csv(output_csv, index=False)
+    return len(corpus)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a benchmark corpus of sampled episode descriptions.")
+    parser.add_argument("--input-csv", default="combined_episodes.csv", help="Combined episode CSV to sample from.")
+    parser.add_argument("--output-csv", default="benchmark_episodes.csv", help="Path of the corpus to write.")
+    parser.add_argument("--sample-size", type=int, default=5000, help="Number of episodes to sample.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed of the sample.")
+    args = parser.parse_args()
+
+    written = write_sample_corpus(args.output_csv, args.input_csv, sample_size=args.sample_size, seed=args.seed)
+    print(f"Wrote {written} episodes to {args.output_csv}")
@@ -0,0 +1,84 @@
+import time
+from contextlib import contextmanager, nullcontext
+from collections import defaultdict, Counter
+
+# Shared no-op context used when profiling is off
+_NO_STAGE = nullcontext()
+
+class StageProfiler:
+    """
+    Cumulative wall time and call counts per named stage.
+
+    Each worker process keeps its own profiler; snapshots are plain dicts, so
+    they can be returned from Pool tasks and merged into one profiler in the
+    parent for the final report.
+    """
+
+    def __init__(self):
+        self.seconds = defaultdict(float)
+        self.calls = Counter()
+
+    @contextmanager
+    def stage(self, name):
+        """Time the enclosed block as one call of stage `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] += time.perf_counter() - start
+            self.calls[name] += 1
+
+    def snapshot(self, reset=False):
+        """
+        Return {stage: (seconds, calls)}, optionally clearing the totals.
+
+        :param reset: Start counting from zero again (for per-task deltas)
+        :return: Picklable dict of the totals
+        """
+        totals = {name: (self.seconds[name], self.calls[name]) for name in self.seconds}
+        if reset:
+            self.seconds.clear()
+            self.calls.clear()
+        return totals
+
+    def merge(self, totals):
+        """
+        Add a snapshot, e.g. one returned by a worker.
+
+        :param totals: {stage: (seconds, calls)}
+        """
+        for name, (seconds, calls) in totals.items():
+            self.seconds[name] += seconds
+            self.calls[name] += calls
+
+    def report(self, title="Stage profile"):
+        """
+        Format the totals as a table, slowest stage first.
+
+        :param title: First line of the report
+        :return: Report text
+        """
+        total = sum(self.seconds.values())
+        lines = [title, f"{'stage':<16}{'seconds':>10}{'share':>8}{'calls':>12}{'us/call':>10}"]
+        for name, seconds in sorted(self.seconds.items(), key=lambda item: -item[1]):
+            calls = self.calls[name]
+            lines.append(
+                f"{name:<16}{seconds:>10.2f}{seconds / total if total else 0:>8.1%}"
+                f"{calls:>12}{seconds / calls * 1e6 if calls else 0:>10.1f}"
+            )
+        lines.append(f"{'total':<16}{total:>10.2f}")
+        return "\n".join(lines)
+
+def stage_timer(profiler):
+    """
+    Return a function mapping a stage name to a context manager.
+
+    With no profiler the same no-op context is returned every time, so
+    un-profiled runs pay almost nothing for the instrumentation.
+
+    :param profiler: StageProfiler or None
+    :return: Callable taking a stage name
+    """
+    if profiler is None:
+        return lambda name: _NO_STAGE
+    return profiler.stage
@@ -0,0 +1,98 @@
+import re
+import time
+import argparse
+import unicodedata
+
+# Patterns used by the description cleaner, compiled once per process
+URL_PATTERN = re.compile(r'https?://\S+|www\.\S+')
+SPECIAL_CHARACTERS = re.compile(r'[^\w\s.,!?]')
+VALID_TOKEN = re.compile(r'^[a-zA-Z0-9]+$')
+
+class _MarkStripper(dict):
+    """
+    str.translate table that deletes nonspacing marks (category 'Mn').
+
+    Code points are classified on first sight and remembered, so translate
+    runs in C for every character seen before.
+    """
+
+    def __missing__(self, code_point):
+        value = None if unicodedata.category(chr(code_point)) == 'Mn' else code_point
+        self[code_point] = value
+        return value
+
+_STRIP_MARKS = _MarkStripper()
+
+def strip_accents(text: str) -> str:
+    """
+    Remove accents by decomposing to NFKD and dropping nonspacing marks.
+
+    Plain ASCII text is already decomposed and has no marks, so it is
+    returned as is.
+
+    :param text: Input text
+    :return: Text without accents
+    """
+    if text.isascii():
+        return text
+    return unicodedata.normalize('NFKD', text).translate(_STRIP_MARKS)
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text by removing accents, converting to lowercase,
+    and standardizing whitespace.
+
+    :param text: Input text
+    :return: Normalized text
+    """
+    # str.split() splits on exactly the characters re's \s matches and drops
+    # leading/trailing whitespace, so this equals re.sub(r'\s+', ' ', text.strip())
+    return ' '.join(strip_accents(text).lower().split())
+
+def _legacy_normalize_text(text: str) -> str:
+    """Previous PodcastDescriptionCleaner._normalize_text, kept for the benchmark."""
+    text = ''.join(
+        char for char in unicodedata.normalize('NFKD', text)
+        if unicodedata.category(char) != 'Mn'
+    )
+    return re.sub(r'\s+', ' ', text.lower().strip())
+
+def benchmark_normalization(texts, repeat=3):
+    """
+    Time normalize_text against the previous implementation.
+
+    :param texts: Sample descriptions
+    :param repeat: Passes over the sample; the fastest one is reported
+    :return: Dict with seconds per pass for both and the share of ASCII texts
+    """
+    expected = [_legacy_normalize_text(text) for text in texts]
+    if [normalize_text(text) for text in texts] != expected:
+        raise AssertionError("normalize_text disagrees with the previous implementation.")
+
+    timings = {}
+    for name, function in (("previous", _legacy_normalize_text), ("normalize_text", normalize_text)):
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for text in texts:
+                function(text)
+            best = min(best, time.perf_counter() - start)
+        timings[name] = best
+
+    ascii_share = sum(text.isascii() for text in texts) / len(texts) if texts else 0.0
+    characters = sum(len(text) for text in texts)
+    print(f"{len(texts)} descriptions, {characters} characters, {ascii_share:.0%} plain ASCII; outputs identical")
+    for name, seconds in timings.items():
+        print(f"{name:>15}: {seconds * 1000:.1f} ms ({seconds / max(characters, 1) * 1e9:.1f} ns/char)")
+    print(f"{'speedup':>15}: {timings['previous'] / timings['normalize_text']:.1f}x")
+    return {**timings, 'ascii_share': ascii_share}
+
+if __name__ == "__main__":
+    from sample_corpus import load_descriptions
+
+    parser = argparse.ArgumentParser(description="Benchmark description normalization on sample descriptions.")
+    parser.add_argument("--input-csv", default="combined_episodes.csv", help="Episode CSV with an episode_description column.")
+    parser.add_argument("--sample-size", type=int, default=20000, help="Number of descriptions to sample.")
+    args = parser.parse_args()
+
+    benchmark_normalization(load_descriptions(args.input_csv, sample_size=args.sample_size))
@@ -0,0 +1,96 @@
+import json
+import sqlite3
+import hashlib
+from collections import Counter
+
+def description_key(text):
+    """
+    Content hash of a description with its whitespace normalized.
+
+    Descriptions that differ only in spacing or line breaks clean to the same
+    tokens, so they share a key.
+
+    Args:
+        text (str): Raw description.
+
+    Returns:
+        str: 32-character hex digest.
+    """
+    normalized = " ".join(text.split())
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+
+class TokenCountCache:
+    """
+    Persistent SQLite cache of cleaned token counts keyed by description hash.
+
+    Entries are stored per cleaner version, so changing the cleaning rules
+    (and bumping CLEANER_VERSION) never serves stale counts. Use ":memory:" as
+    the path for a cache that only lives for one run.
+    """
+
+    def __init__(self, path, cleaner_version, batch_size=500):
+        self.path = path
+        self.cleaner_version = cleaner_version
+        self.batch_size = batch_size
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS token_counts ("
+            " digest TEXT NOT NULL,"
+            " cleaner_version TEXT NOT NULL,"
+            " counts TEXT NOT NULL,"
+            " PRIMARY KEY (digest, cleaner_version)"
+            ") WITHOUT ROWID"
+        )
+        self.connection.commit()
+
+    def _select(self, columns, keys):
+        keys = list(keys)
+        for start in range(0, len(keys), self.batch_size):
+            chunk = keys[start:start + self.batch_size]
+            placeholders = ",".join("?" * len(chunk))
+            yield from self.connection.execute(
+                f"SELECT {columns} FROM token_counts "
+                f"WHERE cleaner_version = ? AND digest IN ({placeholders})",
+                [self.cleaner_version, *chunk],
+            )
+
+    def contains(self, keys):
+        """
+        Return the subset of keys that are already cached.
+
+        Args:
+            keys (iterable): Description keys.
+
+        Returns:
+            set: Cached keys.
+        """
+        return {digest for (digest,) in self._select("digest", keys)}
+
+    def get_many(self, keys):
+        """
+        Yield the cached token counts of the given keys.
+
+        Args:
+            keys (iterable): Description keys. Keys that are not cached are skipped.
+
+        Yields:
+            tuple: (key, Counter of tokens)
+        """
+        for digest, counts in self._select("digest, counts", keys):
+            yield digest, Counter(json.loads(counts))
+
+    def put_many(self, items):
+        """
+        Store token counts, replacing existing entries.
+
+        Args:
+            items (iterable): (key, Counter or dict of tokens) pairs.
+        """
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO token_counts (digest, cleaner_version, counts) VALUES (?, ?, ?)",
+            [(key, self.cleaner_version, json.dumps(counts)) for key, counts in items],
+        )
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()